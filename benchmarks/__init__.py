@@ -0,0 +1 @@
+"""Benchmarks for the KYC Document Processing API."""
@@ -0,0 +1,76 @@
+"""
+Drive the admission controller with a burst above the quota.
+
+Fires calls at a stub Document AI server through the app faster than the
+configured requests-per-minute, then reports how many were admitted
+immediately, queued or shed with 429, the Retry-After hints and the
+achieved call rate.
+
+Usage:
+    python -m benchmarks.bench_admission [--rpm 600] [--burst 5] [--requests 60]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+from loguru import logger
+
+from src.api.main import create_app
+from src.core.config import DocumentAIConfig, settings
+from src.services.document_ai_client import DocumentAIClient
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+PDF_BYTES = b"%PDF-1.4\n%stub\n"
+
+
+async def main(rpm: float, burst: float, max_wait: float, requests: int) -> None:
+    logger.remove()
+    settings.enable_cache = False
+    settings.enable_page_selection = False
+    process, address = start_fake_server(FakeServerConfig(latency=LatencyDistribution.fixed(0.05)))
+    try:
+        config = DocumentAIConfig(
+            api_endpoint=address,
+            insecure_channel=True,
+            quota_requests_per_minute=rpm,
+            quota_burst=burst,
+            admission_max_wait_seconds=max_wait,
+        )
+        app = create_app(DocumentAIClient(config=config))
+        async with app.router.lifespan_context(app), httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+        ) as http:
+
+            async def call(i: int) -> httpx.Response:
+                return await http.post(
+                    "/api/v1/documents/process",
+                    files={"file": (f"doc{i}.pdf", PDF_BYTES + str(i).encode(), "application/pdf")},
+                )
+
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(call(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+            metrics = (await http.get("/metrics")).text
+
+        statuses = Counter(r.status_code for r in responses)
+        retry_after = sorted({r.headers["retry-after"] for r in responses if r.status_code == 429})
+        admitted = statuses.get(200, 0)
+        print(f"quota {rpm:g}/min, burst {burst:g}, max wait {max_wait:g}s, {requests} concurrent calls")
+        print(f"status codes: {dict(statuses)}; Retry-After values: {retry_after}")
+        print(f"admitted {admitted} in {elapsed:.2f}s -> {admitted / elapsed * 60:.0f}/min achieved")
+        print("\n".join(line for line in metrics.splitlines() if line.startswith("kyc_admission")))
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rpm", type=float, default=600)
+    parser.add_argument("--burst", type=float, default=5)
+    parser.add_argument("--max-wait", type=float, default=2)
+    parser.add_argument("--requests", type=int, default=60)
+    args = parser.parse_args()
+    asyncio.run(main(args.rpm, args.burst, args.max_wait, args.requests))
@@ -0,0 +1,100 @@
+"""
+Behaviour of Document AI calls during a simulated regional outage.
+
+The primary stub server stalls every call past the deadline, as a region
+in trouble would; a second stub stands in for the alternate location. The
+same load runs with the circuit breaker off, on without an alternate (fail
+fast), and on with failover, reporting how long calls took and how they
+ended.
+
+Usage:
+    python -m benchmarks.bench_circuit_breaker [--calls 200] [--timeout 1]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+from loguru import logger
+
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import CallReport, DocumentAIClient
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+PDF_BYTES = b"%PDF-1.4\n%stub\n"
+CONCURRENCY = 8
+
+
+async def _run(config: DocumentAIConfig, calls: int) -> tuple[list[float], Counter, DocumentAIClient]:
+    client = DocumentAIClient(config=config)
+    client.initialize()
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call() -> None:
+        async with semaphore:
+            report = CallReport()
+            start = time.perf_counter()
+            try:
+                await client.extract_kyc_information(PDF_BYTES, report=report)
+                outcomes["failed over" if report.failed_over else "ok"] += 1
+            except Exception as e:
+                outcomes[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(call() for _ in range(calls)))
+    finally:
+        await client.aclose()
+    return latencies, outcomes, client
+
+
+async def main(args: argparse.Namespace) -> None:
+    logger.remove()
+    # Start both stubs before the parent process touches gRPC
+    outage, outage_address = start_fake_server(
+        FakeServerConfig(latency=LatencyDistribution.fixed(0.02), stall_probability=1.0, stall_seconds=60)
+    )
+    healthy, healthy_address = start_fake_server(FakeServerConfig(latency=LatencyDistribution.fixed(0.02)))
+    base = {
+        "api_endpoint": outage_address,
+        "insecure_channel": True,
+        "transport": "async",
+        "quota_requests_per_minute": 0,
+        "timeout_seconds": args.timeout,
+        "retry_max_attempts": 1,
+        "circuit_open_seconds": 60,
+    }
+    scenarios = {
+        "breaker off": DocumentAIConfig(**base, circuit_breaker_enabled=False),
+        "fail fast": DocumentAIConfig(**base),
+        "failover": DocumentAIConfig(
+            **base,
+            alternate_location="eu",
+            alternate_processor_id="alternate",
+            alternate_api_endpoint=healthy_address,
+        ),
+    }
+    try:
+        for name, config in scenarios.items():
+            start = time.perf_counter()
+            latencies, outcomes, _client = await _run(config, args.calls)
+            wall = time.perf_counter() - start
+            cuts = statistics.quantiles(latencies, n=100)
+            print(
+                f"{name:<11} | wall {wall:6.2f} s | p50 {cuts[49] * 1000:7.1f} ms | "
+                f"p99 {cuts[98] * 1000:7.1f} ms | {dict(outcomes)}"
+            )
+    finally:
+        outage.terminate()
+        healthy.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Measure the effect of the response field mask on Document AI responses.
+
+For the default mask (entities only) and the full document, reports the
+response size on the wire, the time to deserialize it, and the growth of
+peak RSS while processing requests against a local stub server. Each mode
+runs in a fresh process so peak RSS is not shared between them.
+
+Usage:
+    python -m benchmarks.bench_field_mask [--requests 50]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import resource
+import time
+
+from loguru import logger
+
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+
+def _measure(address: str, full_document: bool, requests: int, results) -> None:
+    from google.cloud.documentai_v1.types import ProcessResponse
+
+    from src.core.config import DocumentAIConfig
+    from src.services.document_ai_client import DocumentAIClient
+
+    logger.remove()
+    config = DocumentAIConfig(
+        api_endpoint=address,
+        insecure_channel=True,
+        full_document=full_document,
+        quota_requests_per_minute=0,
+    )
+    client = DocumentAIClient(config=config)
+    client.initialize()
+
+    async def run() -> tuple[int, float]:
+        baseline_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        response_bytes = 0
+        for _ in range(requests):
+            document = await client.extract_kyc_information(b"%PDF-1.4\n")
+            client.parse_extracted_fields(document)
+            response_bytes = ProcessResponse.serialize(ProcessResponse(document=document))
+        rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss_kb
+        return response_bytes, rss_growth_kb
+
+    wire, rss_growth_kb = asyncio.run(run())
+    client.cleanup()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        ProcessResponse.deserialize(wire)
+    deserialize_ms = (time.perf_counter() - start) / requests * 1000
+
+    results.put((len(wire), deserialize_ms, rss_growth_kb / 1024))
+
+
+def main(requests: int) -> None:
+    logger.remove()
+    process, address = start_fake_server(FakeServerConfig(latency=LatencyDistribution.fixed(0.0)))
+    context = multiprocessing.get_context("spawn")
+    try:
+        print(f"{requests} requests per mode")
+        print(f"{'mode':>14} | {'response bytes':>14} | {'deserialize (ms)':>16} | {'peak RSS growth (MB)':>20}")
+        for label, full_document in (("full document", True), ("entities mask", False)):
+            results = context.Queue()
+            worker = context.Process(target=_measure, args=(address, full_document, requests, results))
+            worker.start()
+            size, deserialize_ms, rss_growth_mb = results.get()
+            worker.join()
+            print(f"{label:>14} | {size:>14,} | {deserialize_ms:>16.3f} | {rss_growth_mb:>20.1f}")
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    main(args.requests)
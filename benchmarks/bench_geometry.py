@@ -0,0 +1,128 @@
+"""
+Compare the bounding-box geometry stage with a vectorized NumPy variant.
+
+Checks that ``parse_extracted_fields`` matches the proto-plus reference
+parser with and without pixel conversion, and that the NumPy variant
+computes the same boxes. Then it times both on dense documents with
+several regions per entity. Packing the vertices into arrays costs more
+than the reduction saves, so the service keeps the Python loop; NumPy is
+only needed to run this comparison.
+
+Usage:
+    python -m benchmarks.bench_geometry [--seconds 1.0]
+"""
+
+import argparse
+import time
+from functools import partial
+
+import numpy as np
+from google.cloud.documentai_v1.types import Document
+from loguru import logger
+
+from benchmarks.documents import synthetic_document
+from benchmarks.reference_parser import parse_extracted_fields_proto_plus
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+from src.services.geometry import EntityGeometry, entity_geometry, page_dimensions
+
+# (entities, regions per entity)
+CASES = ((31, 1), (100, 4), (1000, 1), (1000, 4), (5000, 4))
+
+
+def _time_per_call(fn, document, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        fn(document)
+        calls += 1
+    return elapsed / calls
+
+
+def _box(row):
+    return {"x": row[0], "y": row[1], "width": row[2], "height": row[3]}
+
+
+def numpy_geometry(entities, dimensions=None):
+    """All boxes from one ``minimum``/``maximum.reduceat`` pass over packed vertices."""
+    refs = [
+        (entity_index, ref_index, page_ref.page, page_ref.bounding_poly.normalized_vertices)
+        for entity_index, entity in enumerate(entities)
+        for ref_index, page_ref in enumerate(entity.page_anchor.page_refs)
+    ]
+    refs = [ref for ref in refs if len(ref[3])]
+    geometry = [EntityGeometry() for _ in entities]
+    if not refs:
+        return geometry
+
+    vertices = np.array(
+        [(vertex.x, vertex.y) for ref in refs for vertex in ref[3]], dtype=np.float64
+    )
+    x, y = vertices[:, 0], vertices[:, 1]
+    counts = np.array([len(ref[3]) for ref in refs], dtype=np.intp)
+    offsets = np.concatenate(([0], np.cumsum(counts[:-1])))
+    min_x = np.minimum.reduceat(x, offsets)
+    min_y = np.minimum.reduceat(y, offsets)
+    boxes = np.column_stack(
+        (min_x, min_y, np.maximum.reduceat(x, offsets) - min_x, np.maximum.reduceat(y, offsets) - min_y)
+    )
+
+    pixel_rows = [None] * len(refs)
+    if dimensions:
+        scales = np.array(dimensions, dtype=np.float64).reshape(-1, 2)
+        page_index = np.array([ref[2] for ref in refs], dtype=np.intp)
+        in_range = (page_index >= 0) & (page_index < len(scales))
+        scale = scales[np.where(in_range, page_index, 0)]
+        known = in_range & (scale > 0).all(axis=1)
+        pixel_boxes = (boxes * np.tile(scale, 2)).tolist()
+        pixel_rows = [row if ok else None for row, ok in zip(pixel_boxes, known.tolist(), strict=True)]
+
+    for (owner, ref_index, page, _), row, pixel_row in zip(refs, boxes.tolist(), pixel_rows, strict=True):
+        entry = geometry[owner]
+        if ref_index == 0:
+            entry.bounding_box = _box(row)
+        entry.regions.append(
+            {"page": page, **_box(row), "pixels": _box(pixel_row) if pixel_row is not None else None}
+        )
+    return geometry
+
+
+def main(seconds: float) -> None:
+    logger.remove()
+    print(
+        f"{'entities':>8} | {'regions':>7} | {'pixels':>6} | "
+        f"{'python loop (ms)':>16} | {'numpy (ms)':>10}"
+    )
+    for pixel_bounding_boxes in (False, True):
+        client = DocumentAIClient(
+            config=DocumentAIConfig(
+                api_endpoint="127.0.0.1:9",
+                insecure_channel=True,
+                pixel_bounding_boxes=pixel_bounding_boxes,
+            )
+        )
+        for entity_count, regions in CASES:
+            document = synthetic_document(
+                entity_count, seed=entity_count, regions_per_entity=regions, with_dimensions=True
+            )
+            reference = parse_extracted_fields_proto_plus(document, pixel_bounding_boxes)
+            if client.parse_extracted_fields(document) != reference:
+                raise SystemExit(f"Geometry differs for {entity_count} entities x {regions} regions")
+
+            document_pb = Document.pb(document)
+            entities = list(document_pb.entities)
+            dimensions = page_dimensions(document_pb) if pixel_bounding_boxes else None
+            if numpy_geometry(entities, dimensions) != entity_geometry(entities, dimensions):
+                raise SystemExit(f"NumPy boxes differ for {entity_count} entities x {regions} regions")
+            python_s = _time_per_call(partial(entity_geometry, dimensions=dimensions), entities, seconds)
+            numpy_s = _time_per_call(partial(numpy_geometry, dimensions=dimensions), entities, seconds)
+            print(
+                f"{entity_count:>8} | {regions:>7} | {pixel_bounding_boxes!s:>6} | "
+                f"{python_s * 1000:>16.3f} | {numpy_s * 1000:>10.3f}"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time budget per measurement")
+    args = parser.parse_args()
+    main(args.seconds)
@@ -0,0 +1,89 @@
+"""
+Tail latency of Document AI calls with and without hedging.
+
+A stub server answers most calls in ``--latency`` seconds but stalls a
+``--stall-probability`` fraction of them for ``--stall`` seconds. The same
+load is run with hedging off and on, reporting p50/p95/p99 latency, the
+hedge rate and the hedge win rate.
+
+Usage:
+    python -m benchmarks.bench_hedging [--calls 400] [--budget 0.05]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from loguru import logger
+
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+PDF_BYTES = b"%PDF-1.4\n%stub\n"
+CONCURRENCY = 8
+
+
+async def _run(address: str, hedge: bool, calls: int, budget: float) -> tuple[list[float], DocumentAIClient]:
+    config = DocumentAIConfig(
+        api_endpoint=address,
+        insecure_channel=True,
+        transport="async",
+        quota_requests_per_minute=0,
+        hedge_enabled=hedge,
+        hedge_percentile=95,
+        hedge_budget_ratio=budget,
+    )
+    client = DocumentAIClient(config=config)
+    client.initialize()
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def call() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await client.extract_kyc_information(PDF_BYTES)
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*(call() for _ in range(calls)))
+    finally:
+        await client.aclose()
+    return latencies, client
+
+
+def _percentiles(latencies: list[float]) -> str:
+    cuts = statistics.quantiles(latencies, n=100)
+    return f"p50 {cuts[49] * 1000:7.1f} ms | p95 {cuts[94] * 1000:7.1f} ms | p99 {cuts[98] * 1000:7.1f} ms"
+
+
+async def main(args: argparse.Namespace) -> None:
+    logger.remove()
+    process, address = start_fake_server(
+        FakeServerConfig(
+            latency=LatencyDistribution.fixed(args.latency),
+            stall_probability=args.stall_probability,
+            stall_seconds=args.stall,
+        )
+    )
+    try:
+        for hedge in (False, True):
+            latencies, client = await _run(address, hedge, args.calls, args.budget)
+            line = f"hedging {'on ' if hedge else 'off'} | {_percentiles(latencies)}"
+            if client.hedger is not None:
+                stats = client.hedger.stats
+                line += f" | hedge rate {stats.hedge_rate:.1%} | win rate {stats.win_rate:.1%}"
+            print(line)
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--stall", type=float, default=0.5)
+    parser.add_argument("--stall-probability", type=float, default=0.03)
+    parser.add_argument("--budget", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
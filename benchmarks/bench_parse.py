@@ -0,0 +1,41 @@
+"""
+Micro-benchmark of ``DocumentAIClient.parse_extracted_fields``.
+
+Usage:
+    python -m benchmarks.bench_parse [--iterations 2000]
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from benchmarks.documents import synthetic_document
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+
+CASES = (
+    ("31 KYC entities", 31, 0.0),
+    ("31 KYC + 31 unknown", 62, 0.5),
+)
+
+
+def main(iterations: int) -> None:
+    logger.remove()
+    client = DocumentAIClient(config=DocumentAIConfig(api_endpoint="127.0.0.1:9", insecure_channel=True))
+    print(f"{'document':>20} | {'parse (us/doc)':>14}")
+    for label, entity_count, unknown_ratio in CASES:
+        document = synthetic_document(entity_count, unknown_ratio)
+        client.parse_extracted_fields(document)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.parse_extracted_fields(document)
+        per_doc_us = (time.perf_counter() - start) / iterations * 1e6
+        print(f"{label:>20} | {per_doc_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.iterations)
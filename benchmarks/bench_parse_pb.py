@@ -0,0 +1,56 @@
+"""
+Compare the raw-protobuf parser with the proto-plus reference parser.
+
+Checks that both produce identical output, then times them on synthetic
+documents of 10, 100 and 1,000 entities.
+
+Usage:
+    python -m benchmarks.bench_parse_pb [--seconds 1.0]
+"""
+
+import argparse
+import time
+
+from loguru import logger
+
+from benchmarks.documents import synthetic_document
+from benchmarks.reference_parser import parse_extracted_fields_proto_plus
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+
+ENTITY_COUNTS = (10, 100, 1000)
+
+
+def _time_per_call(fn, document, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < seconds:
+        fn(document)
+        calls += 1
+    return elapsed / calls
+
+
+def main(seconds: float) -> None:
+    logger.remove()
+    client = DocumentAIClient(config=DocumentAIConfig(api_endpoint="127.0.0.1:9", insecure_channel=True))
+    print(f"{'entities':>8} | {'proto-plus (ms)':>15} | {'raw protobuf (ms)':>17} | {'speedup':>7}")
+    for entity_count in ENTITY_COUNTS:
+        document = synthetic_document(entity_count, unknown_ratio=0.2, seed=entity_count)
+        reference = parse_extracted_fields_proto_plus(document)
+        fast = client.parse_extracted_fields(document)
+        if fast != reference:
+            raise SystemExit(f"Parser outputs differ for {entity_count} entities")
+
+        slow_s = _time_per_call(parse_extracted_fields_proto_plus, document, seconds)
+        fast_s = _time_per_call(client.parse_extracted_fields, document, seconds)
+        print(
+            f"{entity_count:>8} | {slow_s * 1000:>15.3f} | {fast_s * 1000:>17.3f} | "
+            f"{slow_s / fast_s:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time budget per measurement")
+    args = parser.parse_args()
+    main(args.seconds)
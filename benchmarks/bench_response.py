@@ -0,0 +1,144 @@
+"""
+Per-request CPU time of building and serializing a ProcessResponse.
+
+Compares the generic path (a model per field, then FastAPI's response
+validation and JSON encoding) with the direct path the routes use now
+(one validation pass, serialized by ``PydanticJSONResponse``). Runs on
+parsed results with 1 and 31 extracted fields.
+
+Usage:
+    python -m benchmarks.bench_response [--seconds 1.0]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from loguru import logger
+
+from benchmarks.documents import synthetic_document
+from src.api.responses import PydanticJSONResponse
+from src.api.routes.process import build_process_response
+from src.core.config import DocumentAIConfig
+from src.core.schema import NCB_KYC_FORM
+from src.models.response import (
+    PAGE_MODELS,
+    ExtractedField,
+    ExtractedInformation,
+    ProcessingSummary,
+    ProcessResponse,
+)
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionResult
+
+FIELD_COUNTS = (1, 31)
+RESPONSE_FIELD = create_model_field(name="Response_process", type_=ProcessResponse, mode="serialization")
+
+
+def generic_build(result: ExtractionResult, start_time: float) -> ProcessResponse:
+    """The response construction the route used before, one model per field."""
+    extracted_data = result.fields
+    pages = NCB_KYC_FORM.pages
+
+    def create_field(field_data):
+        if not field_data or not field_data.get("value"):
+            return None
+        return ExtractedField(
+            value=field_data["value"],
+            confidence=field_data.get("confidence", 0.0),
+            page=field_data.get("page", 0),
+            bounding_box=field_data.get("bounding_box"),
+            regions=field_data.get("regions") or [],
+        )
+
+    extracted_information = ExtractedInformation(
+        **{
+            page.key: PAGE_MODELS[page.key](
+                **{name: create_field(extracted_data[page.key].get(name)) for name in page.field_names}
+            )
+            for page in pages
+        }
+    )
+    confidences = [
+        data["confidence"]
+        for page in pages
+        for data in extracted_data[page.key].values()
+        if data and data.get("confidence")
+    ]
+    successful_pages = sum(1 for page in pages if any(extracted_data[page.key].values()))
+    summary = ProcessingSummary(
+        total_pages=len(pages),
+        successful_pages=successful_pages,
+        failed_pages=len(pages) - successful_pages,
+        average_confidence=sum(confidences) / len(confidences) if confidences else 0.0,
+        processing_time_seconds=time.time() - start_time,
+        extractor_used=NCB_KYC_FORM.extractor,
+        served_from_cache=result.served_from_cache,
+        pages_in_file=result.pages_in_file,
+        pages_submitted=result.pages_submitted,
+        retries=result.retries,
+        retry_seconds=result.retry_seconds,
+    )
+    return ProcessResponse(
+        request_id="request-id",
+        filename="document.pdf",
+        processing_mode="custom",
+        extracted_information=extracted_information,
+        summary=summary,
+    )
+
+
+async def generic_path(result: ExtractionResult) -> bytes:
+    response = generic_build(result, time.time())
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=response)
+    return JSONResponse(content).body
+
+
+async def direct_path(result: ExtractionResult) -> bytes:
+    response = build_process_response("request-id", "document.pdf", "custom", result, time.time())
+    return PydanticJSONResponse(response).body
+
+
+async def _cpu_per_call(path, result: ExtractionResult, seconds: float) -> float:
+    calls = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    while time.perf_counter() - wall_start < seconds:
+        await path(result)
+        calls += 1
+    return (time.process_time() - cpu_start) / calls
+
+
+async def main(seconds: float) -> None:
+    logger.remove()
+    client = DocumentAIClient(config=DocumentAIConfig(api_endpoint="127.0.0.1:9", insecure_channel=True))
+    print(f"{'fields':>6} | {'generic (us)':>12} | {'direct (us)':>11} | {'speedup':>7} | {'bytes':>6}")
+    for field_count in FIELD_COUNTS:
+        fields = client.parse_extracted_fields(synthetic_document(field_count, seed=field_count))
+        result = ExtractionResult(fields=fields, served_from_cache=False, coalesced=False)
+
+        generic_body = json.loads(await generic_path(result))
+        direct_body = json.loads(await direct_path(result))
+        for body in (generic_body, direct_body):
+            body.pop("timestamp")
+            body["summary"].pop("processing_time_seconds")
+        if generic_body != direct_body:
+            raise SystemExit(f"Response bodies differ for {field_count} fields")
+
+        generic_s = await _cpu_per_call(generic_path, result, seconds)
+        direct_s = await _cpu_per_call(direct_path, result, seconds)
+        print(
+            f"{field_count:>6} | {generic_s * 1e6:>12.1f} | {direct_s * 1e6:>11.1f} | "
+            f"{generic_s / direct_s:>6.1f}x | {len(await direct_path(result)):>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time budget per measurement")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds))
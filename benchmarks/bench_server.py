@@ -0,0 +1,158 @@
+"""
+Startup time and request throughput of the server modes.
+
+Starts the API as a real server process in each mode, against the fake
+Document AI server, and drives it over TCP:
+
+- ``dev``: the previous entry point, one process with ``reload=True``
+- ``asyncio+h11``: workers on the default asyncio loop and h11
+- ``production``: ``python -m src.api.server``, workers on uvloop and httptools
+
+Modes are compared at equal worker counts: ``dev`` against one-worker
+``production``, and ``asyncio+h11`` against ``production`` at N workers.
+The job queue is off in every mode, as the production server turns it off
+for several workers anyway. For each mode it reports the time from launch to the first answered
+request, then throughput on ``/health/live`` (server overhead only) and on
+``/process`` (every request a cache miss), with /process latency
+percentiles. Workers only add throughput when there are spare CPUs for
+them and for this load generator.
+
+Usage:
+    python -m benchmarks.bench_server [--workers N] [--requests 2000] [--concurrency 32]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+from src.api.server import cpu_count
+from src.services.fake_document_ai import (
+    FakeServerConfig,
+    LatencyDistribution,
+    free_port,
+    start_fake_server,
+)
+
+LIVE = "/api/v1/health/live"
+PROCESS = "/api/v1/documents/process"
+PDF_BYTES = b"%PDF-1.4\n%bench\n"
+# (mode, workers): N stands for --workers
+RUNS = (("dev", 1), ("production", 1), ("asyncio+h11", "N"), ("production", "N"))
+
+
+def _command(mode: str, port: int, workers: int) -> list[str]:
+    python = sys.executable
+    return {
+        "dev": [
+            python, "-c",
+            f"import uvicorn; uvicorn.run('src.api.main:app', host='127.0.0.1', port={port}, reload=True)",
+        ],
+        "asyncio+h11": [
+            python, "-m", "uvicorn", "src.api.main:app", "--port", str(port),
+            "--workers", str(workers), "--loop", "asyncio", "--http", "h11",
+        ],
+        "production": [python, "-m", "src.api.server", "--port", str(port), "--workers", str(workers)],
+    }[mode]
+
+
+async def _wait_until_serving(base_url: str, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as http:
+        while time.perf_counter() < deadline:
+            try:
+                if (await http.get(LIVE)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.02)
+    raise TimeoutError(f"Server at {base_url} did not start within {timeout}s")
+
+
+async def _load(base_url: str, path: str, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    """Requests per second and sorted latencies of ``requests`` calls at ``concurrency``."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: list[float] = []
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as http:
+
+        async def worker() -> None:
+            for i in counter:
+                start = time.perf_counter()
+                if path == PROCESS:
+                    # Unique content, so no request is a cache hit or coalesced
+                    content = PDF_BYTES + str(i).encode()
+                    response = await http.post(path, files={"file": ("bench.pdf", content, "application/pdf")})
+                else:
+                    response = await http.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(latencies) / elapsed, latencies
+
+
+async def _run_mode(command: list[str], port: int, env: dict, args: argparse.Namespace) -> str:
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        await _wait_until_serving(base_url)
+        startup = time.perf_counter() - start
+        # Warm every worker and route before measuring
+        await _load(base_url, LIVE, 200, args.concurrency)
+        await _load(base_url, PROCESS, 200, args.concurrency)
+        live_rps, _ = await _load(base_url, LIVE, args.requests, args.concurrency)
+        process_rps, latencies = await _load(base_url, PROCESS, args.requests, args.concurrency)
+    finally:
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    return (
+        f"{startup:>11.2f} | {live_rps:>13.0f} | {process_rps:>16.0f} | {p50:>8.1f} | {p99:>8.1f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake, address = start_fake_server(FakeServerConfig(latency=LatencyDistribution.fixed(0.005)))
+    env = {
+        **os.environ,
+        "API_ENDPOINT": address,
+        "INSECURE_CHANNEL": "true",
+        "QUOTA_REQUESTS_PER_MINUTE": "0",
+        "ENABLE_PAGE_SELECTION": "false",
+        "LOG_LEVEL": "WARNING",
+        "JOB_QUEUE_ENABLED": "false",
+    }
+    try:
+        print(f"{cpu_count()} CPU(s), N={args.workers} worker(s), concurrency {args.concurrency}")
+        print(f"{'mode':>12} | {'workers':>7} | {'startup (s)':>11} | {'live (req/s)':>13} | "
+              f"{'process (req/s)':>16} | {'p50 (ms)':>8} | {'p99 (ms)':>8}")
+        for mode, workers in RUNS:
+            workers = args.workers if workers == "N" else workers
+            port = free_port()
+            row = await _run_mode(_command(mode, port, workers), port, env, args)
+            print(f"{mode:>12} | {workers:>7} | {row}")
+    finally:
+        fake.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+"""
+Compare upload throughput of the thread-pool and asyncio Document AI transports.
+
+Runs the FastAPI app in-process against a local stub ProcessDocument server
+with a fixed per-call latency and reports requests per second at several
+concurrency levels. Every upload is distinct and the result cache is off, so
+each request reaches the stub server.
+
+Usage:
+    python -m benchmarks.bench_transports [--latency 0.1] [--requests-per-level 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from loguru import logger
+
+from src.api.main import create_app
+from src.core.config import DocumentAIConfig, settings
+from src.services.document_ai_client import DocumentAIClient
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+CONCURRENCY_LEVELS = (4, 32, 256)
+PDF_BYTES = b"%PDF-1.4\n%stub\n"
+
+
+async def _run_level(address: str, transport: str, concurrency: int, rounds: int) -> float:
+    config = DocumentAIConfig(
+        transport=transport,
+        api_endpoint=address,
+        insecure_channel=True,
+        max_in_flight=concurrency,
+        # Measure the transports, not the quota bucket
+        quota_requests_per_minute=0,
+    )
+    app = create_app(DocumentAIClient(config=config))
+    total = concurrency * rounds
+
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+    ) as http:
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for i in range(total):
+            queue.put_nowait(i)
+
+        async def worker() -> None:
+            while not queue.empty():
+                i = queue.get_nowait()
+                # Unique content, so no request is a cache hit or coalesced
+                content = PDF_BYTES + f"{transport}-{concurrency}-{i}".encode()
+                response = await http.post(
+                    "/api/v1/documents/process",
+                    files={"file": (f"doc{i}.pdf", content, "application/pdf")},
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return total / elapsed
+
+
+async def main(latency: float, rounds: int) -> None:
+    logger.remove()
+    settings.enable_cache = False
+    settings.enable_page_selection = False
+    process, address = start_fake_server(FakeServerConfig(latency=LatencyDistribution.fixed(latency)))
+    try:
+        print(f"stub latency {latency * 1000:.0f} ms, {rounds} requests per concurrent slot")
+        print(f"{'concurrency':>11} | {'thread (req/s)':>14} | {'async (req/s)':>13}")
+        for concurrency in CONCURRENCY_LEVELS:
+            thread_rps = await _run_level(address, "thread", concurrency, rounds)
+            async_rps = await _run_level(address, "async", concurrency, rounds)
+            print(f"{concurrency:>11} | {thread_rps:>14.1f} | {async_rps:>13.1f}")
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub latency in seconds")
+    parser.add_argument("--requests-per-level", type=int, default=4, dest="rounds")
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.rounds))
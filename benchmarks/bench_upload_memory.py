@@ -0,0 +1,148 @@
+"""
+Measure peak memory of upload ingestion with and without streaming limits.
+
+Two scenarios are measured with tracemalloc:
+
+1. Reading an UploadFile: ``await file.read()`` (the previous route
+   behaviour) against ``read_upload`` for a file within the limit and for
+   one far over it.
+2. Sending a whole oversized multipart request through the ASGI app, with
+   and without ``RequestSizeLimitMiddleware``, counting how much of the
+   body was consumed before the response.
+
+Usage:
+    python -m benchmarks.bench_upload_memory [--oversized-mb 200]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import tracemalloc
+
+from fastapi import HTTPException, UploadFile
+from loguru import logger
+
+from src.api.main import create_app
+from src.api.middleware import RequestSizeLimitMiddleware
+from src.core.config import DocumentAIConfig, settings
+from src.core.validation import read_upload
+from src.services.document_ai_client import DocumentAIClient
+
+MB = 1024 * 1024
+CHUNK = b"x" * (64 * 1024)
+
+
+def _spooled_upload(size_bytes: int) -> UploadFile:
+    # Starlette spools multipart files to disk past 1 MB
+    spool = tempfile.SpooledTemporaryFile(max_size=MB)  # noqa: SIM115 - the UploadFile owns it
+    for _ in range(size_bytes // len(CHUNK)):
+        spool.write(CHUNK)
+    spool.seek(0)
+    return UploadFile(file=spool, filename="bench.pdf", size=size_bytes)
+
+
+async def _peak(coro) -> tuple[float, str]:
+    tracemalloc.start()
+    try:
+        await coro
+        outcome = "ok"
+    except HTTPException as e:
+        outcome = str(e.status_code)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / MB, outcome
+
+
+async def _read_whole(file: UploadFile) -> None:
+    content = await file.read()
+    if len(content) > settings.max_file_size_mb * MB:
+        raise HTTPException(status_code=413)
+
+
+async def _bench_read(size_mb: int) -> None:
+    old_peak, old_outcome = await _peak(_read_whole(_spooled_upload(size_mb * MB)))
+    new_peak, new_outcome = await _peak(read_upload(_spooled_upload(size_mb * MB)))
+    print(
+        f"{size_mb:>6} MB file | file.read(): {old_peak:8.1f} MB peak ({old_outcome}) | "
+        f"read_upload: {new_peak:8.1f} MB peak ({new_outcome})"
+    )
+
+
+async def _bench_request(size_mb: int, with_limit: bool, declare_length: bool) -> None:
+    # The backend is never reached: every request here is rejected as too large
+    config = DocumentAIConfig(api_endpoint="127.0.0.1:9", insecure_channel=True)
+    app = create_app(DocumentAIClient(config=config))
+    if not with_limit:
+        app.user_middleware = [m for m in app.user_middleware if m.cls is not RequestSizeLimitMiddleware]
+
+    head = (
+        b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.pdf\"\r\n"
+        b"Content-Type: application/pdf\r\n\r\n"
+    )
+    tail = b"\r\n--b--\r\n"
+    chunks = size_mb * MB // len(CHUNK)
+    consumed = 0
+    status = None
+
+    async def receive():
+        nonlocal consumed
+        if consumed == 0:
+            consumed += 1
+            return {"type": "http.request", "body": head, "more_body": True}
+        if consumed <= chunks:
+            consumed += 1
+            return {"type": "http.request", "body": CHUNK, "more_body": True}
+        return {"type": "http.request", "body": tail, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/documents/process",
+        "raw_path": b"/api/v1/documents/process",
+        "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+    if declare_length:
+        length = len(head) + chunks * len(CHUNK) + len(tail)
+        scope["headers"].append((b"content-length", str(length).encode()))
+
+    async with app.router.lifespan_context(app) as state:
+        scope["state"] = dict(state or {})
+        tracemalloc.start()
+        await app(scope, receive, send)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    label = "with limit" if with_limit else "no limit"
+    label += ", Content-Length" if declare_length else ", streamed"
+    print(
+        f"{size_mb:>6} MB request ({label:>26}) | status {status} | "
+        f"body consumed {max(consumed - 1, 0) * len(CHUNK) / MB:7.1f} MB | peak {peak / MB:6.1f} MB"
+    )
+
+
+async def main(oversized_mb: int) -> None:
+    logger.remove()
+    print(f"max_file_size_mb={settings.max_file_size_mb}, max_request_size_mb={settings.max_request_size_mb}")
+    await _bench_read(settings.max_file_size_mb // 2)
+    await _bench_read(oversized_mb)
+    for declare_length in (False, True):
+        await _bench_request(oversized_mb, with_limit=False, declare_length=declare_length)
+        await _bench_request(oversized_mb, with_limit=True, declare_length=declare_length)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--oversized-mb", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.oversized_mb))
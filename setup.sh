@@ -38,7 +38,7 @@ echo "✅ Setup complete!"
 echo ""
 echo "🔧 Next steps:"
 echo "1. Edit .env file with your Google Cloud credentials"
-echo "2. Run backend: python -m src.api.main"
+echo "2. Run backend: python -m src.api.server --reload"
 echo "3. Run frontend: cd frontend && npm run dev"
 echo ""
 echo "📚 For deployment instructions, see DEPLOYMENT.md"
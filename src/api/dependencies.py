@@ -0,0 +1,53 @@
+"""
+FastAPI dependencies for the KYC Document Processing API.
+"""
+
+from fastapi import HTTPException, Request
+
+from src.api.responses import PrecomputedJSON
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionService
+from src.services.instrumentation import PipelineMetrics
+from src.services.job_queue import JobQueue
+from src.services.readiness import ReadinessMonitor
+
+
+def get_document_ai_client(request: Request) -> DocumentAIClient:
+    """Return the application-wide Document AI client created at startup."""
+    return request.app.state.document_ai_client
+
+
+def get_extraction_service(request: Request) -> ExtractionService:
+    """Return the application-wide cache-aware extraction service."""
+    return request.app.state.extraction_service
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Return the background job queue, or fail with 503 when it is disabled."""
+    job_queue = request.app.state.job_queue
+    if job_queue is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": {
+                    "code": "JOBS_DISABLED",
+                    "message": "The job queue is disabled on this server; use /documents/process",
+                }
+            },
+        )
+    return job_queue
+
+
+def get_api_info_document(request: Request) -> PrecomputedJSON:
+    """Return the /info document encoded at startup."""
+    return request.app.state.api_info
+
+
+def get_readiness_monitor(request: Request) -> ReadinessMonitor:
+    """Return the background dependency prober."""
+    return request.app.state.readiness
+
+
+def get_pipeline_metrics(request: Request) -> PipelineMetrics:
+    """Return the per-stage latency and outcome metrics."""
+    return request.app.state.pipeline_metrics
@@ -1,16 +1,120 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.core.config import settings
+from src.services.admission import AdmissionRejectedError
+from src.services.circuit_breaker import CircuitOpenError
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionService
+from src.services.job_queue import JobQueue
+from src.services.metrics import create_metrics_registry
+from src.services.readiness import ProbeCheck, ReadinessMonitor
+from src.services.result_cache import create_result_cache
+from src.services.tracing import create_tracer
+
+from .middleware import InFlightMiddleware, RequestSizeLimitMiddleware, TracingMiddleware
+from .responses import PrecomputedJSON
+from .routes.diagnostics import router as diagnostics_router
+from .routes.health import router as health_router
+from .routes.jobs import router as jobs_router
+from .routes.jobs import run_extraction_job
+from .routes.metrics import router as metrics_router
+from .routes.process import build_api_info
 from .routes.process import router as process_router
 
 
-def create_app() -> FastAPI:
+def create_app(document_ai_client: DocumentAIClient | None = None) -> FastAPI:
+    tracer = create_tracer(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        tracer.exporter.start()
+        # One client, channel and executor for the whole process
+        client = document_ai_client or DocumentAIClient()
+        client.initialize()
+        app.state.document_ai_client = client
+        app.state.pipeline_metrics = client.metrics
+        cache = create_result_cache(settings)
+        app.state.result_cache = cache
+        extraction_service = ExtractionService(
+            client, cache, select_pages=settings.enable_page_selection
+        )
+        app.state.extraction_service = extraction_service
+        app.state.metrics_registry = create_metrics_registry(client, extraction_service)
+        job_queue = None
+        if settings.job_queue_enabled:
+            job_queue = JobQueue(
+                handler=partial(run_extraction_job, extraction_service, tracer),
+                max_depth=settings.job_queue_max_depth,
+                max_bytes=settings.job_queue_max_bytes,
+                workers=settings.job_workers,
+                max_job_age_seconds=settings.job_max_age_seconds,
+                # Capacity rejections are what the queue is there to wait out
+                retry_on=(AdmissionRejectedError, CircuitOpenError),
+                retry_initial_backoff_seconds=settings.job_retry_initial_backoff_seconds,
+                retry_max_backoff_seconds=settings.job_retry_max_backoff_seconds,
+            )
+            job_queue.start()
+        app.state.job_queue = job_queue
+
+        # Static payloads are encoded once instead of on every poll
+        app.state.api_info = PrecomputedJSON(
+            build_api_info(client),
+            cache_control=f"public, max-age={settings.info_cache_max_age_seconds}",
+        )
+
+        # Dependencies are probed in the background; /ready reports the last result
+        timeout = settings.readiness_probe_timeout_seconds
+        checks = [ProbeCheck("document_ai", partial(client.check_ready, timeout))]
+        if cache is not None:
+            # A broken cache degrades to misses, so it does not gate readiness
+            checks.append(ProbeCheck(f"cache_{cache.backend}", cache.ping, required=False))
+        readiness = ReadinessMonitor(
+            checks,
+            interval_seconds=settings.readiness_probe_interval_seconds,
+            timeout_seconds=timeout,
+        )
+        app.state.readiness = readiness
+        readiness.start()
+        try:
+            yield
+        finally:
+            await readiness.stop()
+            if job_queue is not None:
+                await job_queue.stop()
+            # Wait for in-flight extractions to finish without blocking the loop
+            await client.aclose()
+            if cache is not None:
+                await cache.aclose()
+            await tracer.exporter.stop()
+
     app = FastAPI(
-        title="NCB KYC Document Processing API", 
+        title="NCB KYC Document Processing API",
         version="2.0.0",
-        description="API for extracting information from NCB Bank KYC forms using custom Document AI extractor"
+        description="API for extracting information from NCB Bank KYC forms using custom Document AI extractor",
+        lifespan=lifespan,
     )
 
+    # Refuse oversized bodies before they are buffered or spooled to disk
+    app.add_middleware(
+        RequestSizeLimitMiddleware,
+        max_body_bytes=settings.max_request_size_mb * 1024 * 1024,
+    )
+
+    # Outside the size limit, so refused uploads still count as in flight
+    app.add_middleware(InFlightMiddleware)
+
+    # Outermost but for CORS, so the trace covers the other middleware too
+    app.state.tracer = tracer
+    if settings.tracing_enabled:
+        app.add_middleware(
+            TracingMiddleware, tracer=tracer, server_timing=settings.server_timing_enabled
+        )
+
     # CORS for Vite dev server and local use
     app.add_middleware(
         CORSMiddleware,
@@ -21,6 +125,10 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(process_router, prefix="/api/v1/documents", tags=["documents"])
+    app.include_router(jobs_router, prefix="/api/v1/jobs", tags=["jobs"])
+    app.include_router(health_router, prefix="/api/v1/health", tags=["health"])
+    app.include_router(diagnostics_router, prefix="/api/v1/diagnostics", tags=["diagnostics"])
+    app.include_router(metrics_router)
     return app
 
 
@@ -28,10 +136,11 @@ app = create_app()
 
 
 def main():  # pragma: no cover
-    import uvicorn
+    # Kept for `python -m src.api.main`; the server lives in src.api.server
+    from .server import main as serve
 
-    uvicorn.run("src.api.main:app", host="0.0.0.0", port=8080, reload=True)
+    serve()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,169 @@
+"""
+ASGI middleware for the KYC Document Processing API.
+"""
+
+import json
+
+from fastapi import HTTPException
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.tracing import Tracer, parse_traceparent
+
+
+def _too_large_detail(max_body_bytes: int) -> dict:
+    return {
+        "error": {
+            "code": "REQUEST_TOO_LARGE",
+            "message": "Request body exceeds maximum allowed size",
+            "max_size_bytes": max_body_bytes,
+        }
+    }
+
+
+class RequestSizeLimitMiddleware:
+    """Reject request bodies larger than ``max_body_bytes`` while they stream in.
+
+    A declared ``Content-Length`` over the limit is refused before any of the
+    body is read. Otherwise bytes are counted as the server receives them and
+    a 413 is raised as soon as the limit is crossed, so oversized uploads are
+    never fully buffered or spooled to disk.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_bytes:
+                    await self._send_too_large(send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    raise HTTPException(
+                        status_code=413, detail=_too_large_detail(self.max_body_bytes)
+                    )
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            # Raised outside a route's exception handling, e.g. by a raw endpoint
+            if e.status_code != 413 or response_started:
+                raise
+            await self._send_too_large(send)
+
+    async def _send_too_large(self, send: Send) -> None:
+        body = json.dumps({"detail": _too_large_detail(self.max_body_bytes)}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class InFlightMiddleware:
+    """Track HTTP requests in flight on the app's ``PipelineMetrics`` gauge."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Set up in the lifespan, so absent until startup has run
+        metrics = getattr(scope["app"].state, "pipeline_metrics", None)
+        if metrics is None or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            metrics.in_flight.dec()
+
+
+def _route_template(scope: Scope) -> str:
+    """The request path with path parameters put back as ``{name}``, to keep span names few."""
+    path = scope["path"]
+    for name, value in scope.get("path_params", {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}")
+    return path
+
+
+class TracingMiddleware:
+    """Run each HTTP request as the root span of a trace.
+
+    The trace continues an incoming W3C ``traceparent`` when there is one.
+    Responses carry the trace's request ID in ``X-Request-ID`` and, with
+    ``server_timing``, a ``Server-Timing`` header with the time spent in
+    each stage so it shows up in browser devtools.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer, server_timing: bool = True):
+        self.app = app
+        self.tracer = tracer
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        trace_id, parent_span_id = parse_traceparent(traceparent)
+        method = scope["method"]
+
+        with self.tracer.trace(
+            f"{method} {scope['path']}",
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            **{"http.method": method, "http.target": scope["path"]},
+        ) as trace:
+
+            async def traced_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    trace.root.name = f"{method} {_route_template(scope)}"
+                    trace.root.set_attribute("http.status_code", message["status"])
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-Request-ID", trace.request_id)
+                    if self.server_timing:
+                        headers.append("Server-Timing", trace.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
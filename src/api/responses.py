@@ -0,0 +1,51 @@
+"""
+Response classes for the API.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON response that serializes Pydantic models with their compiled serializer.
+
+    Routes return an instance directly with an already-validated model, so
+    FastAPI neither validates the response again nor walks it through
+    ``jsonable_encoder``; the model is dumped to JSON bytes in one call.
+    Other content falls back to ``JSONResponse`` rendering.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+class PrecomputedJSON:
+    """A static JSON document encoded once, served with an ETag.
+
+    ``response()`` answers a matching ``If-None-Match`` with an empty 304.
+    """
+
+    def __init__(self, content: Any, cache_control: str | None = None):
+        self.body = json.dumps(content, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {"ETag": self.etag}
+        if cache_control:
+            self.headers["Cache-Control"] = cache_control
+
+    def response(self, request: Request | None = None) -> Response:
+        if request is not None and self._matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+    def _matches(self, if_none_match: str | None) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from src.api.dependencies import get_document_ai_client
+from src.services.document_ai_client import DocumentAIClient
+
+router = APIRouter()
+
+
+@router.get("/circuit-breakers")
+async def circuit_breakers(client: DocumentAIClient = Depends(get_document_ai_client)):
+    """
+    Circuit breaker state per processor and location.
+
+    Lists the primary location's breakers and, when one is configured, the
+    alternate location calls fail over to while a primary circuit is open.
+    """
+    content: dict[str, Any] = {
+        "enabled": client.breakers is not None,
+        "failover": client.alternate is not None and client.config.circuit_failover,
+        "breakers": {},
+    }
+    for location_client in (client, client.alternate):
+        if location_client is not None and location_client.breakers is not None:
+            content["breakers"].update(location_client.breakers.snapshot())
+    return JSONResponse(content=content, headers={"Cache-Control": "no-store"})
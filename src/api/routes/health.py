@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from src.api.dependencies import get_readiness_monitor
+from src.api.responses import PrecomputedJSON
+from src.services.readiness import ReadinessMonitor
+
+router = APIRouter()
+
+LIVE_RESPONSE = PrecomputedJSON({"status": "alive"}, cache_control="no-store")
+
+
+@router.get("/live")
+async def liveness():
+    """Liveness probe: the process is up and serving; no dependencies are called."""
+    return LIVE_RESPONSE.response()
+
+
+@router.get("/ready")
+async def readiness(monitor: ReadinessMonitor = Depends(get_readiness_monitor)):
+    """
+    Readiness probe.
+
+    Reports the cached result of the last background dependency probe:
+    200 when every required dependency passed, 503 otherwise.
+    """
+    return JSONResponse(
+        status_code=200 if monitor.ready else 503,
+        content=monitor.snapshot(),
+        headers={"Cache-Control": "no-store"},
+    )
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+
+from src.api.dependencies import get_job_queue
+from src.api.responses import PydanticJSONResponse
+from src.api.routes.process import build_process_response, error_outcome, validate_pdf_upload
+from src.core.validation import read_upload
+from src.models.response import (
+    ErrorDetail,
+    JobStatusResponse,
+    JobSubmitResponse,
+    ProcessResponse,
+)
+from src.services.extraction import ExtractionService
+from src.services.job_queue import Job, JobQueue, JobStatus, QueueFullError
+from src.services.tracing import Tracer
+
+router = APIRouter()
+
+
+async def run_extraction_job(
+    extraction: ExtractionService, tracer: Tracer, job: Job
+) -> ProcessResponse:
+    """Job handler: extract a queued document and build its response."""
+    metrics = extraction.metrics
+    start_time = job.started_at
+    # The job ID is the job's request_id in responses and logs
+    with tracer.trace("job", request_id=job.job_id, **{"job.id": job.job_id}):
+        try:
+            result = await extraction.extract(job.content, job.content_sha256)
+        except Exception as e:
+            metrics.record_outcome(error_outcome(e), e)
+            raise
+        with metrics.stage("response_build"):
+            response = build_process_response(
+                job.job_id, job.filename, job.extractor_mode, result, start_time
+            )
+    metrics.record_outcome("cache_hit" if result.served_from_cache else "success")
+    return response
+
+
+def _timestamp(value: float | None) -> datetime | None:
+    return datetime.fromtimestamp(value, tz=UTC) if value is not None else None
+
+
+def _job_status(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        filename=job.filename,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+        error=ErrorDetail(**job.error) if job.error else None,
+    )
+
+
+def _get_job_or_404(job_queue: JobQueue, job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": {"code": "JOB_NOT_FOUND", "message": f"Unknown or expired job: {job_id}"}},
+        )
+    return job
+
+
+@router.post("", status_code=202)
+async def submit_job(
+    request: Request,
+    file: UploadFile = File(...),
+    extractor_mode: str = Form("custom"),
+    job_queue: JobQueue = Depends(get_job_queue),
+) -> JobSubmitResponse:
+    """
+    Queue an NCB KYC document for background processing.
+
+    Args:
+        file: The uploaded PDF file
+        extractor_mode: Processing mode (currently only supports 'custom')
+
+    Returns:
+        JobSubmitResponse: Job ID and the URLs to poll for status and result
+    """
+    validate_pdf_upload(file)
+    content, content_sha256 = await read_upload(file)
+
+    try:
+        job = job_queue.submit(file.filename, extractor_mode, content, content_sha256)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": {
+                    "code": "QUEUE_FULL",
+                    "message": str(e),
+                    "max_depth": job_queue.max_depth,
+                    "max_bytes": job_queue.max_bytes,
+                }
+            },
+        ) from e
+
+    return JobSubmitResponse(
+        job_id=job.job_id,
+        status=job.status.value,
+        status_url=str(request.url_for("get_job", job_id=job.job_id)),
+        result_url=str(request.url_for("get_job_result", job_id=job.job_id)),
+    )
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, job_queue: JobQueue = Depends(get_job_queue)) -> JobStatusResponse:
+    """Get the status of a processing job."""
+    return _job_status(_get_job_or_404(job_queue, job_id))
+
+
+@router.get("/{job_id}/result", response_model=ProcessResponse, response_class=PydanticJSONResponse)
+async def get_job_result(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """
+    Get the result of a processing job.
+
+    Returns the ProcessResponse once the job has succeeded, 202 with the job
+    status while it is still queued or running, and 500 with the error
+    details if it failed.
+    """
+    job = _get_job_or_404(job_queue, job_id)
+
+    if job.status == JobStatus.SUCCEEDED:
+        return PydanticJSONResponse(job.result)
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail={"error": job.error, "request_id": job.job_id})
+
+    return PydanticJSONResponse(_job_status(job), status_code=202)
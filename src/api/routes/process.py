@@ -1,182 +1,231 @@
 from __future__ import annotations
 
-import io
+import asyncio
+import math
 import time
 import uuid
-from typing import Any, Dict
+from typing import Any
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from loguru import logger
 
-from src.models.request import ProcessingOptions
+from src.api.dependencies import (
+    get_api_info_document,
+    get_extraction_service,
+    get_pipeline_metrics,
+)
+from src.api.responses import PrecomputedJSON, PydanticJSONResponse
+from src.core.config import settings
+from src.core.schema import NCB_KYC_FORM
+from src.core.validation import read_upload
 from src.models.response import (
+    BatchItemResult,
+    BatchProcessResponse,
     ErrorDetail,
     ErrorResponse,
-    ExtractedField,
-    ExtractedInformation,
-    PageOneFields,
-    PageTwoFields,
     ProcessResponse,
-    ProcessingSummary,
 )
+from src.services.admission import AdmissionRejectedError
+from src.services.circuit_breaker import CircuitOpenError
 from src.services.document_ai_client import DocumentAIClient
-
+from src.services.extraction import ExtractionResult, ExtractionService
+from src.services.instrumentation import PipelineMetrics
+from src.services.tracing import current_request_id, record_since_trace_start, span
 
 router = APIRouter()
 
 
-def _create_extracted_field(field_data: Dict[str, Any]) -> ExtractedField | None:
-    """Create an ExtractedField from field data."""
+# Page keys and their field names, resolved once from the form schema
+_PAGE_FIELDS = tuple((page.key, page.field_names) for page in NCB_KYC_FORM.pages)
+
+
+def _extracted_field_data(field_data: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Shape parsed field data as an ExtractedField payload, or None if empty."""
     if not field_data or not field_data.get("value"):
         return None
-    
-    return ExtractedField(
-        value=field_data["value"],
-        confidence=field_data.get("confidence", 0.0),
-        page=field_data.get("page", 0),
-        bounding_box=field_data.get("bounding_box")
-    )
 
+    return {
+        "value": field_data["value"],
+        "confidence": field_data.get("confidence", 0.0),
+        "page": field_data.get("page", 0),
+        "bounding_box": field_data.get("bounding_box"),
+        "regions": field_data.get("regions") or [],
+    }
 
-def _create_page_one_fields(page_one_data: Dict[str, Any]) -> PageOneFields:
-    """Create PageOneFields from extracted data."""
-    return PageOneFields(
-        Date=_create_extracted_field(page_one_data.get("Date")),
-        CIF=_create_extracted_field(page_one_data.get("CIF")),
-        FirstName=_create_extracted_field(page_one_data.get("FirstName")),
-        MiddleName=_create_extracted_field(page_one_data.get("MiddleName")),
-        LastName=_create_extracted_field(page_one_data.get("LastName")),
-        DateOfBirth=_create_extracted_field(page_one_data.get("DateOfBirth")),
-        CityOfBirth=_create_extracted_field(page_one_data.get("CityOfBirth")),
-        MaritalStatus=_create_extracted_field(page_one_data.get("MaritalStatus")),
-        Gender=_create_extracted_field(page_one_data.get("Gender")),
-        PassportNumber=_create_extracted_field(page_one_data.get("PassportNumber")),
-        EmiratesIDNumber=_create_extracted_field(page_one_data.get("EmiratesIDNumber")),
-        Residency=_create_extracted_field(page_one_data.get("Residency")),
-        NumberOfYears=_create_extracted_field(page_one_data.get("NumberOfYears")),
-        CountryOfResidence=_create_extracted_field(page_one_data.get("CountryOfResidence")),
-        StreetName=_create_extracted_field(page_one_data.get("StreetName")),
-        Area=_create_extracted_field(page_one_data.get("Area")),
-        MakaniNumber=_create_extracted_field(page_one_data.get("MakaniNumber")),
-        BuildingNumber=_create_extracted_field(page_one_data.get("BuildingNumber")),
-        FlatVillaNumber=_create_extracted_field(page_one_data.get("FlatVillaNumber")),
-        CityEmirate=_create_extracted_field(page_one_data.get("CityEmirate")),
-        POBox=_create_extracted_field(page_one_data.get("POBox")),
-        Country=_create_extracted_field(page_one_data.get("Country")),
-        MobileNumber=_create_extracted_field(page_one_data.get("MobileNumber")),
-        AlternativeNumber=_create_extracted_field(page_one_data.get("AlternativeNumber")),
-        EmailAddress=_create_extracted_field(page_one_data.get("EmailAddress")),
+
+def rate_limited_error(error: AdmissionRejectedError, request_id: str) -> HTTPException:
+    """Turn an admission rejection into a 429 with a Retry-After header."""
+    error_response = ErrorResponse(
+        error=ErrorDetail(
+            code="RATE_LIMITED",
+            message="Document AI quota is exhausted, retry later",
+            details={"retry_after_seconds": int(error.retry_after_header)},
+        ),
+        request_id=request_id,
+    )
+    return HTTPException(
+        status_code=429,
+        detail=error_response.model_dump(mode="json"),
+        headers={"Retry-After": error.retry_after_header},
     )
 
 
-def _create_page_two_fields(page_two_data: Dict[str, Any]) -> PageTwoFields:
-    """Create PageTwoFields from extracted data."""
-    return PageTwoFields(
-        Employer=_create_extracted_field(page_two_data.get("Employer")),
-        Department=_create_extracted_field(page_two_data.get("Department")),
-        Designation=_create_extracted_field(page_two_data.get("Designation")),
-        GrossMonthlyIncome=_create_extracted_field(page_two_data.get("GrossMonthlyIncome")),
-        NatureOfBusiness=_create_extracted_field(page_two_data.get("NatureOfBusiness")),
-        PercentageOfOwnership=_create_extracted_field(page_two_data.get("PercentageOfOwnership")),
+def backend_unavailable_error(error: CircuitOpenError, request_id: str) -> HTTPException:
+    """Turn an open circuit into a fast 503 with a Retry-After header."""
+    retry_after = str(max(1, math.ceil(error.retry_after_seconds)))
+    error_response = ErrorResponse(
+        error=ErrorDetail(
+            code="BACKEND_UNAVAILABLE",
+            message="Document AI is failing, retry later",
+            details={"circuit": error.breaker, "retry_after_seconds": int(retry_after)},
+        ),
+        request_id=request_id,
     )
+    return HTTPException(
+        status_code=503,
+        detail=error_response.model_dump(mode="json"),
+        headers={"Retry-After": retry_after},
+    )
+
+
+def _batch_item_error(error: HTTPException) -> ErrorDetail:
+    """The error a batch item reports for what a single request would answer with ``error``."""
+    if isinstance(error.detail, dict) and "error" in error.detail:
+        return ErrorDetail.model_validate(error.detail["error"])
+    return ErrorDetail(code="INVALID_FILE", message=str(error.detail))
+
+
+def error_outcome(error: Exception) -> str:
+    """Outcome label of a document that failed with ``error``."""
+    if isinstance(error, AdmissionRejectedError):
+        return "rate_limited"
+    if isinstance(error, CircuitOpenError):
+        return "backend_unavailable"
+    if isinstance(error, HTTPException) and error.status_code < 500:
+        return "invalid"
+    return "error"
+
+
+def validate_pdf_upload(file: UploadFile) -> None:
+    """Reject uploads without a filename or that are not PDFs."""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+
+def build_process_response(
+    request_id: str,
+    filename: str,
+    extractor_mode: str,
+    result: ExtractionResult,
+    start_time: float,
+) -> ProcessResponse:
+    """
+    Create the API response for one processed document.
+
+    The payload is assembled as plain data and validated once, instead of
+    building and re-validating every nested field model.
+    """
+    extracted_data = result.fields
+    extracted_information = {}
+    confidences = []
+    successful_pages = 0
+
+    for page_key, field_names in _PAGE_FIELDS:
+        page_data = extracted_data[page_key]
+        extracted_information[page_key] = {
+            name: _extracted_field_data(page_data.get(name)) for name in field_names
+        }
+
+        # Pages with at least one extracted field count as successful
+        if any(page_data.values()):
+            successful_pages += 1
+        for field_data in page_data.values():
+            if field_data and field_data.get("confidence"):
+                confidences.append(field_data["confidence"])
+
+    average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    total_pages = len(_PAGE_FIELDS)
+
+    return ProcessResponse.model_validate({
+        "request_id": request_id,
+        "filename": filename,
+        "processing_mode": extractor_mode,
+        "extracted_information": extracted_information,
+        "summary": {
+            "total_pages": total_pages,
+            "successful_pages": successful_pages,
+            "failed_pages": total_pages - successful_pages,
+            "average_confidence": average_confidence,
+            "processing_time_seconds": time.time() - start_time,
+            "extractor_used": NCB_KYC_FORM.extractor,
+            "served_from_cache": result.served_from_cache,
+            "pages_in_file": result.pages_in_file,
+            "pages_submitted": result.pages_submitted,
+            "retries": result.retries,
+            "retry_seconds": result.retry_seconds,
+        },
+    })
 
 
-@router.post("/process")
+@router.post("/process", response_model=ProcessResponse, response_class=PydanticJSONResponse)
 async def process_document(
     file: UploadFile = File(...),
     extractor_mode: str = Form("custom"),
-) -> ProcessResponse:
+    extraction: ExtractionService = Depends(get_extraction_service),
+    metrics: PipelineMetrics = Depends(get_pipeline_metrics),
+) -> PydanticJSONResponse:
     """
     Process NCB KYC document using custom extractor.
-    
+
     Args:
         file: The uploaded PDF file
         extractor_mode: Processing mode (currently only supports 'custom')
-    
+
     Returns:
         ProcessResponse: Extracted information and processing summary
     """
-    request_id = str(uuid.uuid4())
+    # Receiving and parsing the multipart body happens before the handler runs
+    record_since_trace_start("request_parse")
+    request_id = current_request_id()
     start_time = time.time()
-    
+
     try:
         # Validate file
-        if not file.filename:
-            raise HTTPException(status_code=400, detail="No filename provided")
-        
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are supported")
-        
-        # Read file content
-        content = await file.read()
-        
-        # Initialize Document AI client
-        client = DocumentAIClient()
-        DocumentAIClient.initialize()
-        
-        try:
-            # Extract KYC information
-            document = await client.extract_kyc_information(content)
-            
-            # Parse extracted fields
-            extracted_data = client.parse_extracted_fields(document)
-            
-            # Create response objects
-            page_one_fields = _create_page_one_fields(extracted_data["page_one"])
-            page_two_fields = _create_page_two_fields(extracted_data["page_two"])
-            
-            extracted_information = ExtractedInformation(
-                page_one=page_one_fields,
-                page_two=page_two_fields
-            )
-            
-            # Calculate processing summary
-            processing_time = time.time() - start_time
-            
-            # Calculate average confidence
-            all_fields = []
-            for field_data in extracted_data["page_one"].values():
-                if field_data and field_data.get("confidence"):
-                    all_fields.append(field_data["confidence"])
-            for field_data in extracted_data["page_two"].values():
-                if field_data and field_data.get("confidence"):
-                    all_fields.append(field_data["confidence"])
-            
-            average_confidence = sum(all_fields) / len(all_fields) if all_fields else 0.0
-            
-            # Count successful pages (pages with at least one extracted field)
-            successful_pages = 0
-            if any(extracted_data["page_one"].values()):
-                successful_pages += 1
-            if any(extracted_data["page_two"].values()):
-                successful_pages += 1
-            
-            summary = ProcessingSummary(
-                total_pages=2,  # NCB KYC forms are typically 2 pages
-                successful_pages=successful_pages,
-                failed_pages=2 - successful_pages,
-                average_confidence=average_confidence,
-                processing_time_seconds=processing_time,
-                extractor_used="custom-ncb-extractor"
-            )
-            
-            return ProcessResponse(
-                request_id=request_id,
-                filename=file.filename,
-                processing_mode=extractor_mode,
-                extracted_information=extracted_information,
-                summary=summary
+        with metrics.stage("validation"):
+            validate_pdf_upload(file)
+
+        # Read file content, enforcing the size limit as it streams in
+        with metrics.stage("upload_read"):
+            content, content_sha256 = await read_upload(file)
+
+        # Extract and parse KYC information, reusing cached or in-flight results
+        result = await extraction.extract(content, content_sha256)
+
+        with metrics.stage("response_build"):
+            response = build_process_response(
+                request_id, file.filename, extractor_mode, result, start_time
             )
-            
-        finally:
-            DocumentAIClient.cleanup()
-            
-    except HTTPException:
+        with metrics.stage("serialization"):
+            rendered = PydanticJSONResponse(response)
+        metrics.record_outcome("cache_hit" if result.served_from_cache else "success")
+        return rendered
+
+    except HTTPException as e:
+        metrics.record_outcome(error_outcome(e), e)
         raise
+    except AdmissionRejectedError as e:
+        metrics.record_outcome(error_outcome(e), e)
+        raise rate_limited_error(e, request_id) from e
+    except CircuitOpenError as e:
+        metrics.record_outcome(error_outcome(e), e)
+        raise backend_unavailable_error(e, request_id) from e
     except Exception as e:
         logger.exception("Processing failed")
-        
+        metrics.record_outcome(error_outcome(e), e)
+
         error_response = ErrorResponse(
             error=ErrorDetail(
                 code="PROCESSING_ERROR",
@@ -185,42 +234,145 @@ async def process_document(
             ),
             request_id=request_id
         )
-        
-        raise HTTPException(status_code=500, detail=error_response.dict())
+
+        raise HTTPException(status_code=500, detail=error_response.model_dump(mode="json")) from e
+
+
+async def _process_batch_item(
+    file: UploadFile,
+    extractor_mode: str,
+    extraction: ExtractionService,
+    metrics: PipelineMetrics,
+    semaphore: asyncio.Semaphore,
+) -> BatchItemResult:
+    """Process one file of a batch, turning failures into a per-file error."""
+    async with semaphore:
+        with span("batch_item"):
+            request_id = str(uuid.uuid4())
+            start_time = time.time()
+            try:
+                with metrics.stage("validation"):
+                    validate_pdf_upload(file)
+                with metrics.stage("upload_read"):
+                    content, content_sha256 = await read_upload(file)
+                result = await extraction.extract(content, content_sha256)
+                with metrics.stage("response_build"):
+                    response = build_process_response(
+                        request_id, file.filename, extractor_mode, result, start_time
+                    )
+                metrics.record_outcome("cache_hit" if result.served_from_cache else "success")
+                return BatchItemResult(
+                    filename=file.filename,
+                    success=True,
+                    result=response,
+                    processing_time_seconds=response.summary.processing_time_seconds,
+                )
+            except HTTPException as e:
+                metrics.record_outcome(error_outcome(e), e)
+                error = _batch_item_error(e)
+            except AdmissionRejectedError as e:
+                metrics.record_outcome(error_outcome(e), e)
+                error = _batch_item_error(rate_limited_error(e, request_id))
+            except CircuitOpenError as e:
+                metrics.record_outcome(error_outcome(e), e)
+                error = _batch_item_error(backend_unavailable_error(e, request_id))
+            except Exception as e:
+                logger.exception(f"Processing failed for batch file {file.filename}")
+                metrics.record_outcome(error_outcome(e), e)
+                error = ErrorDetail(
+                    code="PROCESSING_ERROR",
+                    message="Failed to process document",
+                    details={"error_type": type(e).__name__, "error_message": str(e)}
+                )
+
+            return BatchItemResult(
+                filename=file.filename or "",
+                success=False,
+                error=error,
+                processing_time_seconds=time.time() - start_time,
+            )
+
+
+@router.post("/process/batch", response_model=BatchProcessResponse, response_class=PydanticJSONResponse)
+async def process_documents_batch(
+    files: list[UploadFile] = File(...),
+    extractor_mode: str = Form("custom"),
+    extraction: ExtractionService = Depends(get_extraction_service),
+    metrics: PipelineMetrics = Depends(get_pipeline_metrics),
+) -> PydanticJSONResponse:
+    """
+    Process several NCB KYC documents concurrently.
+
+    Files are extracted in parallel, at most ``batch_max_concurrency`` at a
+    time. A file that fails produces an error entry without failing the
+    rest of the batch.
+
+    Args:
+        files: The uploaded PDF files
+        extractor_mode: Processing mode (currently only supports 'custom')
+
+    Returns:
+        BatchProcessResponse: Per-file results and batch timing
+    """
+    record_since_trace_start("request_parse")
+    if len(files) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": {
+                    "code": "TOO_MANY_FILES",
+                    "message": f"Too many files in batch: {len(files)}",
+                    "max_files": settings.batch_max_files,
+                }
+            },
+        )
+
+    request_id = current_request_id()
+    start_time = time.time()
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    results = await asyncio.gather(
+        *(_process_batch_item(file, extractor_mode, extraction, metrics, semaphore) for file in files)
+    )
+
+    wall_clock_seconds = time.time() - start_time
+    summed_seconds = sum(item.processing_time_seconds for item in results)
+    succeeded = sum(1 for item in results if item.success)
+
+    return PydanticJSONResponse(BatchProcessResponse(
+        request_id=request_id,
+        total_files=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        wall_clock_seconds=wall_clock_seconds,
+        summed_processing_seconds=summed_seconds,
+        parallel_speedup=summed_seconds / wall_clock_seconds if wall_clock_seconds > 0 else 1.0,
+        results=results,
+    ))
+
+
+# Liveness answer, encoded once; it never touches Document AI
+HEALTH_RESPONSE = PrecomputedJSON({"status": "healthy", "version": "2.0.0"}, cache_control="no-store")
+
+
+def build_api_info(client: DocumentAIClient) -> dict[str, Any]:
+    """API information and supported fields, computed once at startup."""
+    return {
+        "api_name": "NCB Bank KYC Document Processing API",
+        "version": "2.0.0",
+        "description": "API for extracting information from NCB Bank KYC forms using custom Document AI extractor",
+        "processor_info": client.get_processor_info(),
+        "supported_fields": NCB_KYC_FORM.supported_fields(),
+    }
 
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": "2.0.0"}
+    return HEALTH_RESPONSE.response()
 
 
 @router.get("/info")
-async def get_api_info():
+async def get_api_info(request: Request, api_info: PrecomputedJSON = Depends(get_api_info_document)):
     """Get API information and supported fields."""
-    try:
-        client = DocumentAIClient()
-        processor_info = client.get_processor_info()
-        
-        return {
-            "api_name": "NCB Bank KYC Document Processing API",
-            "version": "2.0.0",
-            "description": "API for extracting information from NCB Bank KYC forms using custom Document AI extractor",
-            "processor_info": processor_info,
-            "supported_fields": {
-                "page_one": [
-                    "Date", "CIF", "FirstName", "MiddleName", "LastName", "DateOfBirth",
-                    "CityOfBirth", "MaritalStatus", "Gender", "PassportNumber", "EmiratesIDNumber",
-                    "Residency", "NumberOfYears", "CountryOfResidence", "StreetName", "Area",
-                    "MakaniNumber", "BuildingNumber", "FlatVillaNumber", "CityEmirate", "POBox",
-                    "Country", "MobileNumber", "AlternativeNumber", "EmailAddress"
-                ],
-                "page_two": [
-                    "Employer", "Department", "Designation", "GrossMonthlyIncome",
-                    "NatureOfBusiness", "PercentageOfOwnership"
-                ]
-            }
-        }
-    except Exception as e:
-        logger.exception("Error in info endpoint")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    return api_info.response(request)
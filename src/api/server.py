@@ -0,0 +1,126 @@
+"""
+Production server entry point.
+
+Runs the API in N uvicorn worker processes, one per CPU by default, on
+uvloop and httptools. The workers run under uvicorn's process supervisor,
+which replaces a worker that dies. On SIGHUP it reloads gracefully: it
+replaces the workers one at a time, and each old worker stops only after
+its replacement is serving, then gets ``graceful_shutdown_seconds`` to
+finish its requests. ``--reload`` runs the single-process, file-watching
+development server instead.
+
+Jobs are kept in the memory of the worker that accepted them, so a poll
+answered by another worker would not find its job. With more than one
+worker the job queue is therefore turned off, and explicitly enabling it
+(``JOB_QUEUE_ENABLED=true``) is refused; run ``WORKERS=1`` to keep it.
+
+Usage:
+    python -m src.api.server [--host 0.0.0.0] [--port 8080] [--workers 4]
+    kill -HUP <server pid>    # graceful reload
+    python -m src.api.server --reload
+"""
+
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import Multiprocess
+
+from src.core.config import Settings, settings
+
+APP = "src.api.main:app"
+
+
+def cpu_count() -> int:
+    """CPUs this process may run on, which in a container can be fewer than the host has."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_config(
+    settings: Settings,
+    host: str | None = None,
+    port: int | None = None,
+    workers: int | None = None,
+) -> uvicorn.Config:
+    """
+    The uvicorn configuration for ``settings``, with command-line overrides.
+
+    Raises:
+        ValueError: If several workers are requested with the job queue
+            explicitly enabled
+    """
+    workers = workers or settings.workers or cpu_count()
+    explicit_job_queue = "job_queue_enabled" in settings.model_fields_set
+    if workers > 1 and settings.job_queue_enabled and explicit_job_queue:
+        # No shared job store exists: a job is only found by the worker that accepted it
+        raise ValueError(
+            f"{workers} workers requested with JOB_QUEUE_ENABLED=true, but jobs are kept in "
+            "the memory of one worker; use WORKERS=1 to keep the job queue"
+        )
+    return uvicorn.Config(
+        APP,
+        host=host or settings.host,
+        port=port or settings.port,
+        workers=workers,
+        # Both come with uvicorn[standard], except uvloop on Windows
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.keep_alive_seconds,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
+        log_level=settings.log_level.lower(),
+    )
+
+
+def serve(config: uvicorn.Config) -> None:
+    """Serve ``config.workers`` worker processes until SIGINT or SIGTERM."""
+    # Workers inherit the environment: each admits its share of the Document
+    # AI quota, unless the share is set for replicas on several hosts too
+    os.environ.setdefault("QUOTA_WORKER_PROCESSES", str(config.workers))
+    if config.workers > 1:
+        os.environ["JOB_QUEUE_ENABLED"] = "false"
+        logger.warning(
+            "Job queue disabled: jobs would only be found by the worker that accepted them. "
+            "/metrics and the in-memory result cache are per worker; set REDIS_URL to share results"
+        )
+    logger.info(
+        f"Serving {APP} on {config.host}:{config.port} with {config.workers} worker(s), "
+        f"loop={config.loop}, http={config.http}"
+    )
+    # The supervisor also serves a single worker, so SIGHUP reloads work the same
+    sock = config.bind_socket()
+    Multiprocess(config, sockets=[sock]).run()
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Run the KYC Document Processing API")
+    parser.add_argument("--host", help=f"bind address (default HOST, {settings.host})")
+    parser.add_argument("--port", type=int, help=f"bind port (default PORT, {settings.port})")
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default WORKERS, else one per CPU)"
+    )
+    parser.add_argument("--reload", action="store_true", help="single-process development server")
+    args = parser.parse_args(argv)
+
+    if args.reload:
+        uvicorn.run(
+            APP, host=args.host or settings.host, port=args.port or settings.port, reload=True
+        )
+        return
+    try:
+        config = server_config(settings, host=args.host, port=args.port, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    serve(config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Benchmark suite of the /process pipeline with stored baselines."""
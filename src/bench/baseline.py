@@ -0,0 +1,93 @@
+"""
+Benchmark results, JSON baselines and regression checks.
+"""
+
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Literal
+
+DEFAULT_BASELINE = Path("benchmarks/baselines/baseline.json")
+
+
+@dataclass
+class Metric:
+    """One measured value and which direction is an improvement.
+
+    ``tolerance`` replaces the run's regression threshold for metrics that
+    are noisier than the rest.
+    """
+
+    value: float
+    unit: str
+    better: Literal["lower", "higher"] = "lower"
+    tolerance: float | None = None
+
+
+@dataclass
+class Comparison:
+    """A metric against its baseline value."""
+
+    name: str
+    current: Metric
+    baseline: Metric | None
+    threshold: float
+
+    @property
+    def change(self) -> float | None:
+        """Relative change from the baseline, positive when the value went up."""
+        if self.baseline is None or self.baseline.value == 0:
+            return None
+        return self.current.value / self.baseline.value - 1
+
+    @property
+    def regressed(self) -> bool:
+        change = self.change
+        if change is None:
+            return False
+        threshold = self.current.tolerance or self.threshold
+        if self.current.better == "lower":
+            return change > threshold
+        return change < -threshold
+
+
+def environment() -> dict[str, object]:
+    """Where the results were measured; baselines only compare on like machines."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(path: Path, metrics: dict[str, Metric]) -> None:
+    """Write ``metrics`` to ``path`` as a baseline file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "metrics": {name: asdict(metric) for name, metric in sorted(metrics.items())},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def load_baseline(path: Path) -> dict[str, Metric] | None:
+    """Metrics stored at ``path``, or None when there is no baseline yet."""
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text())
+    return {name: Metric(**metric) for name, metric in payload["metrics"].items()}
+
+
+def compare(
+    metrics: dict[str, Metric], baseline: dict[str, Metric], threshold: float
+) -> list[Comparison]:
+    """Compare every current metric with its baseline, in name order."""
+    return [
+        Comparison(name, metric, baseline.get(name), threshold)
+        for name, metric in sorted(metrics.items())
+    ]
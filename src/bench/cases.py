@@ -0,0 +1,232 @@
+"""
+Benchmark cases of the /process pipeline.
+
+Each case returns named ``Metric`` values. The CPU-bound cases time a
+batch of calls several times and keep the fastest round, the one least
+disturbed by other load on the machine. The ``process`` case drives the
+ASGI app in-process against the fake Document AI server and reports
+throughput and latency percentiles.
+"""
+
+import asyncio
+import functools
+import io
+import itertools
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+from fastapi import UploadFile
+from pypdf import PdfWriter
+
+from src.bench.baseline import Metric
+from src.core.config import DocumentAIConfig, settings
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionResult
+from src.services.fake_document_ai import apply_field_mask, build_document
+
+MB = 1024 * 1024
+
+
+@dataclass
+class BenchOptions:
+    """Sizes of the benchmark runs."""
+
+    rounds: int = 5
+    iterations: int = 500
+    upload_mb: int = 5
+    requests: int = 800
+    concurrency: int = 16
+    # Fixed Document AI latency of the fake server in the ``process`` case
+    backend_latency_seconds: float = 0.005
+    # Address of a running fake server, required by the ``process`` case
+    backend_address: str | None = None
+
+
+def offline_client() -> DocumentAIClient:
+    # Never initialized, so nothing connects to this endpoint
+    return DocumentAIClient(config=DocumentAIConfig(api_endpoint="127.0.0.1:9", insecure_channel=True))
+
+
+def _entities_document(entity_count: int):
+    """The Document a call with the default ``entities`` field mask returns."""
+    document = build_document(entity_count, tokens_per_page=0, image_bytes=0)
+    return apply_field_mask(document, ["entities"])
+
+
+def fastest_per_call(call: Callable[[], object], iterations: int, rounds: int) -> float:
+    call()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        timings.append((time.perf_counter() - start) / iterations)
+    return min(timings)
+
+
+async def fastest_per_await(call: Callable[[], Awaitable[object]], iterations: int, rounds: int) -> float:
+    await call()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        timings.append((time.perf_counter() - start) / iterations)
+    return min(timings)
+
+
+async def bench_parse(options: BenchOptions) -> dict[str, Metric]:
+    """``parse_extracted_fields`` on a filled-in form and on one with ten times the entities."""
+    client = offline_client()
+    metrics = {}
+    for entity_count in (31, 310):
+        document = _entities_document(entity_count)
+        parse = functools.partial(client.parse_extracted_fields, document)
+        seconds = fastest_per_call(parse, options.iterations, options.rounds)
+        metrics[f"parse.entities_{entity_count}.us_per_doc"] = Metric(seconds * 1e6, "us")
+    return metrics
+
+
+async def bench_response(options: BenchOptions) -> dict[str, Metric]:
+    """Building and serializing the /process response for a filled-in form."""
+    # Imported here so the API is only loaded by the cases that use it
+    from src.api.responses import PydanticJSONResponse
+    from src.api.routes.process import build_process_response
+
+    fields = offline_client().parse_extracted_fields(_entities_document(31))
+    result = ExtractionResult(fields=fields)
+
+    def build() -> bytes:
+        response = build_process_response("request-id", "form.pdf", "custom", result, time.time())
+        return PydanticJSONResponse(response).body
+
+    seconds = fastest_per_call(build, options.iterations, options.rounds)
+    return {"response.fields_31.us_per_response": Metric(seconds * 1e6, "us")}
+
+
+async def bench_upload(options: BenchOptions) -> dict[str, Metric]:
+    """``read_upload`` of a spooled multipart file: time and peak memory."""
+    from src.core.validation import read_upload
+
+    size = options.upload_mb * MB
+    # Starlette spools multipart files to disk past 1 MB
+    spool = tempfile.SpooledTemporaryFile(max_size=MB)  # noqa: SIM115 - the UploadFile owns it
+    spool.write(b"x" * size)
+    upload = UploadFile(file=spool, filename="form.pdf", size=size)
+
+    async def read() -> None:
+        await upload.seek(0)
+        await read_upload(upload)
+
+    try:
+        seconds = await fastest_per_await(read, max(1, options.iterations // 50), options.rounds)
+        tracemalloc.start()
+        await read()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        await upload.close()
+    label = f"upload.mb_{options.upload_mb}"
+    return {
+        f"{label}.ms_per_upload": Metric(seconds * 1e3, "ms"),
+        f"{label}.peak_mb": Metric(peak / MB, "MB"),
+    }
+
+
+def _two_page_pdf() -> bytes:
+    writer = PdfWriter()
+    for _ in range(2):
+        writer.add_blank_page(width=595, height=842)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def bench_process(options: BenchOptions) -> dict[str, Metric]:
+    """Full /process requests through the ASGI app, every one a cache miss."""
+    from src.api.main import create_app
+
+    if options.backend_address is None:
+        raise ValueError("The process case needs a running fake Document AI server")
+
+    config = DocumentAIConfig(
+        api_endpoint=options.backend_address,
+        insecure_channel=True,
+        max_in_flight=options.concurrency,
+        # Measure the pipeline, not the quota bucket
+        quota_requests_per_minute=0,
+    )
+    pdf = _two_page_pdf()
+    enable_cache = settings.enable_cache
+    settings.enable_cache = False
+    try:
+        app = create_app(DocumentAIClient(config=config))
+        async with app.router.lifespan_context(app), httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None
+        ) as http:
+            counter = itertools.count()
+            latencies: list[float] = []
+
+            async def worker(requests: int, record: bool) -> None:
+                for _ in range(requests):
+                    # A unique trailing comment per request, so none is coalesced
+                    content = pdf + b"%" + str(next(counter)).encode() + b"\n"
+                    start = time.perf_counter()
+                    response = await http.post(
+                        "/api/v1/documents/process",
+                        files={"file": ("form.pdf", content, "application/pdf")},
+                    )
+                    response.raise_for_status()
+                    if record:
+                        latencies.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(worker(2, False) for _ in range(options.concurrency)))
+            per_worker = max(1, options.requests // options.concurrency)
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(per_worker, True) for _ in range(options.concurrency)))
+            elapsed = time.perf_counter() - start
+    finally:
+        settings.enable_cache = enable_cache
+
+    latencies.sort()
+    return {
+        "process.requests_per_second": Metric(len(latencies) / elapsed, "req/s", better="higher"),
+        "process.p50_ms": Metric(_percentile(latencies, 0.50) * 1e3, "ms"),
+        # Tails rest on a few requests each and move more from run to run
+        "process.p95_ms": Metric(_percentile(latencies, 0.95) * 1e3, "ms", tolerance=0.5),
+        "process.p99_ms": Metric(_percentile(latencies, 0.99) * 1e3, "ms", tolerance=0.5),
+    }
+
+
+async def bench_replay(options: BenchOptions) -> dict[str, Metric]:
+    """Parse and response-build time averaged over the recorded responses."""
+    from src.bench.replay import DEFAULT_RECORDINGS, time_recordings
+
+    timings = time_recordings(DEFAULT_RECORDINGS, options.iterations, options.rounds)
+    if not timings:
+        return {}
+    return {
+        "replay.parse.us_per_doc": Metric(
+            sum(timing.parse_seconds for timing in timings) / len(timings) * 1e6, "us"
+        ),
+        "replay.build.us_per_response": Metric(
+            sum(timing.build_seconds for timing in timings) / len(timings) * 1e6, "us"
+        ),
+    }
+
+
+CASES: dict[str, Callable[[BenchOptions], Awaitable[dict[str, Metric]]]] = {
+    "parse": bench_parse,
+    "response": bench_response,
+    "upload": bench_upload,
+    "process": bench_process,
+    "replay": bench_replay,
+}
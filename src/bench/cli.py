@@ -0,0 +1,111 @@
+"""
+``kyc-bench``: run the benchmark suite and check it against a baseline.
+
+Usage:
+    kyc-bench [parse response upload process] [--baseline PATH] [--threshold 0.2]
+    kyc-bench --update            # record the current results as the baseline
+
+Exits with status 1 when a metric is worse than its baseline by more than
+the threshold. Baselines are only meaningful on the machine that recorded
+them; record one per CI runner type.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from src.bench.baseline import DEFAULT_BASELINE, Metric, compare, load_baseline, save_results
+from src.bench.cases import CASES, BenchOptions
+from src.services.fake_document_ai import FakeServerConfig, LatencyDistribution, start_fake_server
+
+
+async def run_suite(names: list[str], options: BenchOptions) -> dict[str, Metric]:
+    """Run the named cases in order and merge their metrics."""
+    metrics: dict[str, Metric] = {}
+    for name in names:
+        print(f"running {name} ...", file=sys.stderr)
+        metrics.update(await CASES[name](options))
+    return metrics
+
+
+def _format_change(change: float | None) -> str:
+    return "new" if change is None else f"{change:+.1%}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="kyc-bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("cases", nargs="*", metavar="case",
+                        help=f"cases to run (default all): {', '.join(CASES)}")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change counted as a regression (default 0.2)")
+    parser.add_argument("--update", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    parser.add_argument("--rounds", type=int, default=BenchOptions.rounds)
+    parser.add_argument("--iterations", type=int, default=BenchOptions.iterations)
+    parser.add_argument("--requests", type=int, default=BenchOptions.requests)
+    parser.add_argument("--concurrency", type=int, default=BenchOptions.concurrency)
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.cases) - set(CASES))
+    if unknown:
+        parser.error(f"unknown case(s) {', '.join(unknown)}; choose from {', '.join(CASES)}")
+
+    logger.remove()
+    names = args.cases or list(CASES)
+    options = BenchOptions(
+        rounds=args.rounds,
+        iterations=args.iterations,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+
+    server = None
+    if "process" in names:
+        # Started before this process uses gRPC, which a forked child cannot inherit
+        server, options.backend_address = start_fake_server(
+            FakeServerConfig(latency=LatencyDistribution.fixed(options.backend_latency_seconds))
+        )
+    try:
+        metrics = asyncio.run(run_suite(names, options))
+    finally:
+        if server is not None:
+            server.terminate()
+
+    if args.output is not None:
+        save_results(args.output, metrics)
+
+    baseline = load_baseline(args.baseline)
+    if args.update:
+        # Cases not run keep their stored values
+        save_results(args.baseline, {**(baseline or {}), **metrics})
+        print(f"Baseline written to {args.baseline}")
+    comparisons = compare(metrics, baseline or {}, args.threshold)
+
+    print(f"{'metric':<36} | {'value':>14} | {'baseline':>14} | {'change':>7} |")
+    for comparison in comparisons:
+        current, stored = comparison.current, comparison.baseline
+        print(
+            f"{comparison.name:<36} | {current.value:>8.1f} {current.unit:<5} | "
+            f"{'-' if stored is None else f'{stored.value:8.1f} {stored.unit:<5}':>14} | "
+            f"{_format_change(comparison.change):>7} | {'REGRESSED' if comparison.regressed else ''}"
+        )
+
+    if args.update:
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; record one with --update")
+        return 0
+    regressions = [comparison.name for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
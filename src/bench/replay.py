@@ -0,0 +1,156 @@
+"""
+Offline replay of recorded Document AI responses.
+
+Feeds every recording in a directory through ``parse_extracted_fields`` and
+the /process response construction, and reports the time per document.
+Given the input files the recordings were made from, it also posts them to
+/process through the ASGI app with the client in replay mode, so the whole
+route runs without network access.
+
+Usage:
+    python -m src.bench.replay [--recordings DIR] [--inputs test.pdf ...]
+"""
+
+import argparse
+import asyncio
+import functools
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+from loguru import logger
+
+from src.bench.cases import fastest_per_call, offline_client
+from src.core.config import DocumentAIConfig, settings
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionResult
+from src.services.recording import ResponseRecorder
+from src.services.result_cache import hash_document
+
+DEFAULT_RECORDINGS = Path("benchmarks/fixtures/recordings")
+
+
+@dataclass
+class ReplayTiming:
+    """Per-document timings of one recording."""
+
+    content_sha256: str
+    source: str
+    entities: int
+    recording_bytes: int
+    parse_seconds: float
+    build_seconds: float
+    # End-to-end /process latency, when the input file was available
+    route_seconds: float | None = None
+
+
+def time_recordings(directory: Path, iterations: int = 200, rounds: int = 5) -> list[ReplayTiming]:
+    """Parse and response-build time of every recording in ``directory``."""
+    from src.api.responses import PydanticJSONResponse
+    from src.api.routes.process import build_process_response
+
+    recorder = ResponseRecorder(directory)
+    client = offline_client()
+    timings = []
+    for content_sha256 in recorder.recordings():
+        document = recorder.load(content_sha256)
+        result = ExtractionResult(fields=client.parse_extracted_fields(document))
+
+        def build(result: ExtractionResult = result) -> bytes:
+            response = build_process_response("request-id", "form.pdf", "custom", result, time.time())
+            return PydanticJSONResponse(response).body
+
+        timings.append(
+            ReplayTiming(
+                content_sha256=content_sha256,
+                source=recorder.metadata(content_sha256).get("source", "unknown"),
+                entities=len(document.entities),
+                recording_bytes=recorder.path(content_sha256).stat().st_size,
+                parse_seconds=fastest_per_call(
+                    functools.partial(client.parse_extracted_fields, document), iterations, rounds
+                ),
+                build_seconds=fastest_per_call(build, iterations, rounds),
+            )
+        )
+    return timings
+
+
+async def time_route(directory: Path, inputs: dict[str, Path], requests: int = 20) -> dict[str, float]:
+    """Median /process latency per input, answered from the recordings in ``directory``."""
+    from src.api.main import create_app
+
+    config = DocumentAIConfig(replay_responses_dir=str(directory), quota_requests_per_minute=0)
+    enable_cache = settings.enable_cache
+    # Every request goes through the client instead of the result cache
+    settings.enable_cache = False
+    try:
+        app = create_app(DocumentAIClient(config=config))
+        async with app.router.lifespan_context(app), httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://replay", timeout=None
+        ) as http:
+            latencies = {}
+            for content_sha256, path in inputs.items():
+                files = {"file": (path.name, path.read_bytes(), "application/pdf")}
+                samples = []
+                for _ in range(requests + 1):
+                    start = time.perf_counter()
+                    response = await http.post("/api/v1/documents/process", files=files)
+                    response.raise_for_status()
+                    samples.append(time.perf_counter() - start)
+                # The first request warms up the app
+                latencies[content_sha256] = statistics.median(samples[1:])
+    finally:
+        settings.enable_cache = enable_cache
+    return latencies
+
+
+async def replay(
+    directory: Path, input_paths: list[Path], iterations: int = 200, rounds: int = 5
+) -> list[ReplayTiming]:
+    """Time every recording, and the route for those whose input file is given."""
+    timings = time_recordings(directory, iterations, rounds)
+    recorded = {timing.content_sha256 for timing in timings}
+    inputs = {}
+    for path in input_paths:
+        content_sha256 = hash_document(path.read_bytes())
+        if content_sha256 in recorded:
+            inputs[content_sha256] = path
+        else:
+            print(f"{path}: no recording for this file, skipped")
+    if inputs:
+        route = await time_route(directory, inputs)
+        for timing in timings:
+            timing.route_seconds = route.get(timing.content_sha256)
+    return timings
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recordings", type=Path, default=DEFAULT_RECORDINGS)
+    parser.add_argument("--inputs", type=Path, nargs="*", default=[],
+                        help="input files of the recordings, to also replay /process end to end")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    timings = asyncio.run(replay(args.recordings, args.inputs, args.iterations, args.rounds))
+    if not timings:
+        print(f"No recordings in {args.recordings}")
+        return
+
+    print(f"{'recording':<16} | {'source':<11} | {'entities':>8} | {'bytes':>7} | "
+          f"{'parse (us)':>10} | {'build (us)':>10} | {'route (ms)':>10}")
+    for timing in timings:
+        route = "-" if timing.route_seconds is None else f"{timing.route_seconds * 1e3:.2f}"
+        print(
+            f"{timing.content_sha256[:16]:<16} | {timing.source:<11} | {timing.entities:>8} | "
+            f"{timing.recording_bytes:>7} | {timing.parse_seconds * 1e6:>10.1f} | "
+            f"{timing.build_seconds * 1e6:>10.1f} | {route:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ Configuration settings for the KYC Document Processing API.
 """
 
 
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from .schema import FORM_SCHEMAS
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support."""
@@ -19,6 +22,15 @@ class Settings(BaseSettings):
     # Server settings - restrictive by default for security
     host: str = "127.0.0.1"  # Only local access by default, use 0.0.0.0 for container deployment
     port: int = 8080
+    # Production server (python -m src.api.server): worker processes, 0 for one per CPU
+    workers: int = 0
+    # Seconds an idle keep-alive connection is held open; behind a load
+    # balancer, keep this above the balancer's idle timeout
+    keep_alive_seconds: int = 5
+    # Connections the listening socket queues before refusing new ones
+    backlog: int = 2048
+    # Time in-flight requests get to finish when a worker stops or is reloaded
+    graceful_shutdown_seconds: int = 30
 
     # Google Cloud settings
     project_id: str = Field(default="test-project", env="PROJECT_ID", description="Google Cloud Project ID")
@@ -31,8 +43,43 @@ class Settings(BaseSettings):
 
     # File processing limits
     max_file_size_mb: int = 20
+    # Cap on a whole request body, enforced while it streams in (batches hold many files)
+    max_request_size_mb: int = 100
     max_pages: int = 10
-    timeout_seconds: int = 300
+    # Send only the KYC form pages of longer PDFs to Document AI
+    enable_page_selection: bool = True
+
+    # Batch processing
+    batch_max_files: int = 100
+    batch_max_concurrency: int = 8
+
+    # Asynchronous job queue. Jobs live in one process's memory, so the
+    # production server turns the queue off when it runs several workers
+    job_queue_enabled: bool = True
+    job_workers: int = 4
+    job_queue_max_depth: int = 100
+    # Uploads held by queued jobs, which are kept in memory until they run
+    job_queue_max_bytes: int = 256 * 1024 * 1024
+    job_max_age_seconds: int = 3600
+    # Jobs refused by admission control or an open circuit go back in the
+    # queue after a jittered exponential backoff between these bounds
+    job_retry_initial_backoff_seconds: float = 1.0
+    job_retry_max_backoff_seconds: float = 60.0
+
+    # Health and info endpoints
+    info_cache_max_age_seconds: int = 300
+    readiness_probe_interval_seconds: float = 15
+    readiness_probe_timeout_seconds: float = 5
+
+    # Request tracing: a trace per request, tagged with the response's
+    # request_id, exported to the console or an OTLP/HTTP collector
+    tracing_enabled: bool = True
+    trace_exporter: Literal["none", "console", "otlp"] = "none"
+    otlp_traces_endpoint: str = "http://localhost:4318/v1/traces"
+    trace_service_name: str = "kyc-api"
+    trace_export_interval_seconds: float = 5
+    # Per-stage breakdown in a Server-Timing response header
+    server_timing_enabled: bool = True
 
     # Logging
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -42,9 +89,16 @@ class Settings(BaseSettings):
     enable_auth: bool = False
 
     # Optional features
-    enable_cache: bool = False
+    enable_cache: bool = True
     redis_url: str | None = Field(default=None, description="Redis URL for caching")
 
+    # Extraction result cache, keyed by document hash and processor version.
+    # Results are shared through Redis when redis_url is set, else kept in memory.
+    cache_ttl_seconds: int = 3600
+    cache_namespace: str = "kyc:result:v2"
+    cache_max_entries: int = 1024
+    cache_max_bytes: int = 64 * 1024 * 1024
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -61,45 +115,126 @@ class DocumentAIConfig(BaseSettings):
     custom_extractor_id: str = Field(default="577a3e74c6c1cd44", env="CUSTOM_EXTRACTOR_ID")
     custom_extractor_version_id: str | None = Field(env="CUSTOM_EXTRACTOR_VERSION_ID", default="pretrained-foundation-model-v1.5-pro-2025-06-20")
 
+    # Transport used for ProcessDocument calls: "thread" runs the blocking
+    # client in a thread pool, "async" uses the native asyncio client
+    transport: Literal["thread", "async"] = "thread"
+    # Thread pool shared by all requests for blocking Document AI calls
+    executor_max_workers: int = 4
+    # Upper bound on concurrent ProcessDocument calls with the async transport
+    max_in_flight: int = 64
+
+    # Overall deadline per ProcessDocument call, retries included; each attempt's
+    # RPC timeout is the time left
+    timeout_seconds: float = 120
+    # Retries of UNAVAILABLE, DEADLINE_EXCEEDED and RESOURCE_EXHAUSTED, with
+    # exponential backoff and full jitter
+    retry_max_attempts: int = 4
+    retry_initial_backoff_seconds: float = 1.0
+    retry_max_backoff_seconds: float = 30.0
+
+    # Alternate deployment of the extractor in another location, used as a
+    # hedging target and for failover while the primary circuit is open
+    # (processor IDs are regional, so it has its own)
+    alternate_location: str | None = None
+    alternate_processor_id: str | None = None
+    alternate_processor_version_id: str | None = None
+    alternate_api_endpoint: str | None = None
+
+    # Hedged requests: fire a backup call once the first has run for the given
+    # percentile of recent latency, to the same processor or the alternate.
+    # Needs the async transport, where the losing call's RPC is cancelled
+    hedge_enabled: bool = False
+    hedge_percentile: float = 95
+    hedge_target: Literal["same", "alternate"] = "same"
+    # At most this fraction of calls get a backup call
+    hedge_budget_ratio: float = 0.05
+    hedge_min_samples: int = 20
+    hedge_min_delay_seconds: float = 0.05
+
+    # Circuit breaker per processor and location: opens when the failure rate or
+    # the rate of calls slower than circuit_slow_call_seconds crosses its
+    # threshold over the last circuit_window_size calls, then fails fast (or
+    # fails over to the alternate) for circuit_open_seconds before probing
+    circuit_breaker_enabled: bool = True
+    circuit_failure_rate_threshold: float = 0.5
+    circuit_slow_call_seconds: float = 30
+    circuit_slow_call_rate_threshold: float = 0.8
+    circuit_window_size: int = 20
+    circuit_min_calls: int = 10
+    circuit_open_seconds: float = 30
+    circuit_half_open_max_calls: int = 1
+    circuit_failover: bool = True
+
+    # Admission control matched to the Document AI per-processor quota: a token
+    # bucket per processor version; 0 requests per minute disables it
+    quota_requests_per_minute: float = 120
+    quota_burst: float = 10
+    # Server processes sharing that quota, each admitting its share; set by
+    # the production entry point for the workers it starts
+    quota_worker_processes: int = 1
+    # Calls wait this long for a token at most; beyond that they get a 429
+    admission_max_wait_seconds: float = 10
+
+    # Document fields returned by ProcessDocument. The API only accepts top-level
+    # Document fields or pages.<field>; the parser only reads entities.
+    response_field_mask: str = "entities"
+    # Opt in to the full Document (text, pages, tokens, layout, images)
+    full_document: bool = False
+    # Also return entity boxes in pixels; adds pages.dimension to the field mask
+    pixel_bounding_boxes: bool = False
+
+    # Override the regional endpoint, e.g. "localhost:50051" for a local stub
+    api_endpoint: str | None = None
+    # Talk plaintext gRPC without credentials (local stub servers only)
+    insecure_channel: bool = False
+
+    # Save every response, PII-scrubbed and gzip-compressed, in this directory
+    # under the SHA-256 of the input document
+    record_responses_dir: str | None = None
+    # Answer from recordings in this directory instead of calling Document AI
+    replay_responses_dir: str | None = None
+
     class Config:
         env_file = ".env"
         case_sensitive = False
         extra = "ignore"
 
     @property
-    def PROJECT_ID(self) -> str:
+    def PROJECT_ID(self) -> str:  # noqa: N802
         return self.project_id
 
     @property
-    def LOCATION(self) -> str:
+    def LOCATION(self) -> str:  # noqa: N802
         return self.location
 
     @property
-    def CUSTOM_EXTRACTOR_ID(self) -> str:
+    def CUSTOM_EXTRACTOR_ID(self) -> str:  # noqa: N802
         return self.custom_extractor_id
 
     @property
-    def CUSTOM_EXTRACTOR_VERSION_ID(self) -> str | None:
+    def CUSTOM_EXTRACTOR_VERSION_ID(self) -> str | None:  # noqa: N802
         return self.custom_extractor_version_id
 
-    # Document type metadata for NCB KYC
+    @property
+    def RESPONSE_FIELD_MASK(self) -> str | None:  # noqa: N802
+        if self.full_document:
+            return None
+        mask = self.response_field_mask
+        if self.pixel_bounding_boxes and not {"pages", "pages.dimension"} & set(mask.split(",")):
+            mask = f"{mask},pages.dimension"
+        return mask
+
+    # Document type metadata, generated from the form schema registry
     DOCUMENT_TYPES: ClassVar[dict[str, dict[str, Any]]] = {
-        "ncb-kyc-form": {
-            "description": "NCB Bank KYC Form",
+        schema.name: {
+            "description": schema.description,
             "category": "kyc-document",
-            "extractor": "custom-ncb-extractor",
-            "alias": "ncb-kyc",
-            "supported_entities": [
-                "Date", "CIF", "FirstName", "MiddleName", "LastName", "DateOfBirth",
-                "CityOfBirth", "MaritalStatus", "Gender", "PassportNumber", "EmiratesIDNumber",
-                "Residency", "NumberOfYears", "CountryOfResidence", "StreetName", "Area",
-                "MakaniNumber", "BuildingNumber", "FlatVillaNumber", "CityEmirate", "POBox",
-                "Country", "MobileNumber", "AlternativeNumber", "EmailAddress", "Employer",
-                "Department", "Designation", "GrossMonthlyIncome", "NatureOfBusiness",
-                "PercentageOfOwnership"
-            ],
+            "extractor": schema.extractor,
+            "alias": schema.alias,
+            "supported_entities": list(schema.field_names),
             "average_confidence": 0.90,
         }
+        for schema in FORM_SCHEMAS.values()
     }
 
     # Confidence thresholds
@@ -111,4 +246,4 @@ class DocumentAIConfig(BaseSettings):
 
 # Global settings instances
 settings = Settings()
-document_ai_config = DocumentAIConfig()
\ No newline at end of file
+document_ai_config = DocumentAIConfig()
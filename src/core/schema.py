@@ -0,0 +1,136 @@
+"""
+Field schema registry for the KYC forms handled by the API.
+
+Each form is described once here. The parser, the Pydantic page models, the
+``/info`` payload and the Document AI document type metadata are all
+generated from these definitions, so a new field or form type only needs an
+entry in ``FORM_SCHEMAS``.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """A field extracted by the custom extractor."""
+
+    name: str
+    description: str
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """A page of a form and the fields printed on it."""
+
+    key: str
+    index: int
+    model_name: str
+    title: str
+    fields: tuple[FieldSpec, ...]
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return tuple(spec.name for spec in self.fields)
+
+
+@dataclass(frozen=True)
+class FieldSlot:
+    """Where a parsed entity goes: its page index and page key."""
+
+    page: int
+    page_key: str
+
+
+@dataclass(frozen=True)
+class FormSchema:
+    """A form type with its pages and a precompiled entity-type lookup."""
+
+    name: str
+    description: str
+    extractor: str
+    alias: str
+    pages: tuple[PageSpec, ...]
+    lookup: Mapping[str, FieldSlot] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        lookup = {}
+        for page in self.pages:
+            for spec in page.fields:
+                if spec.name in lookup:
+                    raise ValueError(f"Field {spec.name} defined twice in {self.name}")
+                lookup[spec.name] = FieldSlot(page=page.index, page_key=page.key)
+        object.__setattr__(self, "lookup", MappingProxyType(lookup))
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return tuple(self.lookup)
+
+    @property
+    def page_keys(self) -> tuple[str, ...]:
+        return tuple(page.key for page in self.pages)
+
+    def supported_fields(self) -> dict[str, list[str]]:
+        """Field names grouped by page key, as reported by ``/info``."""
+        return {page.key: list(page.field_names) for page in self.pages}
+
+
+NCB_KYC_FORM = FormSchema(
+    name="ncb-kyc-form",
+    description="NCB Bank KYC Form",
+    extractor="custom-ncb-extractor",
+    alias="ncb-kyc",
+    pages=(
+        PageSpec(
+            key="page_one",
+            index=0,
+            model_name="PageOneFields",
+            title="page 1",
+            fields=(
+                FieldSpec("Date", "Date field"),
+                FieldSpec("CIF", "CIF number"),
+                FieldSpec("FirstName", "First name"),
+                FieldSpec("MiddleName", "Middle name"),
+                FieldSpec("LastName", "Last name"),
+                FieldSpec("DateOfBirth", "Date of birth"),
+                FieldSpec("CityOfBirth", "City of birth"),
+                FieldSpec("MaritalStatus", "Marital status"),
+                FieldSpec("Gender", "Gender"),
+                FieldSpec("PassportNumber", "Passport number"),
+                FieldSpec("EmiratesIDNumber", "Emirates ID number"),
+                FieldSpec("Residency", "Residency status"),
+                FieldSpec("NumberOfYears", "Number of years"),
+                FieldSpec("CountryOfResidence", "Country of residence"),
+                FieldSpec("StreetName", "Street name"),
+                FieldSpec("Area", "Area"),
+                FieldSpec("MakaniNumber", "Makani number"),
+                FieldSpec("BuildingNumber", "Building number"),
+                FieldSpec("FlatVillaNumber", "Flat/Villa number"),
+                FieldSpec("CityEmirate", "City/Emirate"),
+                FieldSpec("POBox", "PO Box"),
+                FieldSpec("Country", "Country"),
+                FieldSpec("MobileNumber", "Mobile number"),
+                FieldSpec("AlternativeNumber", "Alternative number"),
+                FieldSpec("EmailAddress", "Email address"),
+            ),
+        ),
+        PageSpec(
+            key="page_two",
+            index=1,
+            model_name="PageTwoFields",
+            title="page 2",
+            fields=(
+                FieldSpec("Employer", "Employer name"),
+                FieldSpec("Department", "Department"),
+                FieldSpec("Designation", "Designation"),
+                FieldSpec("GrossMonthlyIncome", "Gross monthly income"),
+                FieldSpec("NatureOfBusiness", "Nature of business"),
+                FieldSpec("PercentageOfOwnership", "Percentage of ownership"),
+            ),
+        ),
+    ),
+)
+
+# All known form types, keyed by document type name
+FORM_SCHEMAS: Mapping[str, FormSchema] = MappingProxyType({NCB_KYC_FORM.name: NCB_KYC_FORM})
@@ -2,6 +2,7 @@
 Input validation utilities for the KYC Document Processing API.
 """
 
+import hashlib
 
 from fastapi import HTTPException, UploadFile
 
@@ -17,6 +18,9 @@ SUPPORTED_MIME_TYPES = {
     "image/tif",
 }
 
+# Uploads are hashed and size-checked this many bytes at a time
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # File extensions mapping
 EXTENSION_TO_MIME = {
     ".pdf": "application/pdf",
@@ -120,25 +124,38 @@ def validate_file_size(file_size: int) -> None:
         )
 
 
-async def validate_upload_file(file: UploadFile) -> bytes:
+async def read_upload(
+    file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> tuple[bytes, str]:
     """
-    Validate an uploaded file and return its content.
+    Read an uploaded file, enforcing the size limit while streaming it.
+
+    A first pass reads the upload chunk by chunk, hashing it and raising as
+    soon as the size limit is crossed, so an oversized file is never held in
+    memory. Only a file within the limit is then read in full.
 
     Args:
         file: FastAPI UploadFile object
+        chunk_size: Number of bytes to read per chunk
 
     Returns:
-        File content as bytes
+        File content and its SHA-256 hex digest
 
     Raises:
-        HTTPException: If validation fails
+        HTTPException: If the file is too large or cannot be read
     """
-    # Validate file type
-    validate_file_type(file.content_type, file.filename)
-
-    # Read file content
+    digest = hashlib.sha256()
+    size = 0
     try:
+        while chunk := await file.read(chunk_size):
+            size += len(chunk)
+            validate_file_size(size)
+            digest.update(chunk)
+
+        await file.seek(0)
         content = await file.read()
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -148,10 +165,29 @@ async def validate_upload_file(file: UploadFile) -> bytes:
                     "message": f"Failed to read file: {e!s}",
                 }
             },
-        )
+        ) from e
+
+    return content, digest.hexdigest()
+
+
+async def validate_upload_file(file: UploadFile) -> tuple[bytes, str]:
+    """
+    Validate an uploaded file and return its content.
+
+    Args:
+        file: FastAPI UploadFile object
+
+    Returns:
+        File content as bytes and its SHA-256 hex digest
+
+    Raises:
+        HTTPException: If validation fails
+    """
+    # Validate file type
+    validate_file_type(file.content_type, file.filename)
 
-    # Validate file size
-    validate_file_size(len(content))
+    # Read file content, enforcing the size limit as it streams in
+    content, content_sha256 = await read_upload(file)
 
     # Basic file content validation
     if len(content) == 0:
@@ -160,7 +196,7 @@ async def validate_upload_file(file: UploadFile) -> bytes:
             detail={"error": {"code": "EMPTY_FILE", "message": "File is empty"}},
         )
 
-    return content
+    return content, content_sha256
 
 
 def validate_pages(pages: list[int] | None, total_pages: int) -> list[int]:
@@ -220,4 +256,4 @@ def validate_pages(pages: list[int] | None, total_pages: int) -> list[int]:
             },
         )
 
-    return sorted(list(set(pages)))  # Remove duplicates and sort
+    return sorted(set(pages))  # Remove duplicates and sort
@@ -1,7 +1,7 @@
 """Request models for NCB Bank KYC Document Processing API."""
 
-from typing import Optional
-from pydantic import BaseModel, Field
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ProcessingOptions(BaseModel):
@@ -11,15 +11,15 @@ class ProcessingOptions(BaseModel):
         default="custom",
         description="Processing mode: 'custom' for custom NCB extractor"
     )
-    confidence_threshold_override: Optional[float] = Field(
+    confidence_threshold_override: float | None = Field(
         default=None,
         ge=0.0,
         le=1.0,
         description="Override default confidence threshold (0.0-1.0)"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "extractor_mode": "custom",
@@ -30,4 +30,5 @@ class ProcessingOptions(BaseModel):
                     "confidence_threshold_override": 0.8
                 }
             ]
-        }
\ No newline at end of file
+        }
+    )
@@ -1,8 +1,10 @@
 """Response models for NCB Bank KYC Document Processing API."""
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from src.core.schema import NCB_KYC_FORM, PageSpec
 
 
 class ErrorDetail(BaseModel):
@@ -10,10 +12,10 @@ class ErrorDetail(BaseModel):
 
     code: str = Field(..., description="Error code identifier")
     message: str = Field(..., description="Human-readable error message")
-    details: Optional[dict] = Field(default=None, description="Additional error details")
+    details: dict | None = Field(default=None, description="Additional error details")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "code": "VALIDATION_ERROR",
@@ -30,13 +32,14 @@ class ErrorDetail(BaseModel):
                 }
             ]
         }
+    )
 
 
 class ErrorResponse(BaseModel):
     """Model for error responses."""
 
     error: ErrorDetail = Field(..., description="Error details")
-    request_id: Optional[str] = Field(default=None, description="Request identifier for tracking")
+    request_id: str | None = Field(default=None, description="Request identifier for tracking")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
 
 
@@ -47,8 +50,8 @@ class HealthResponse(BaseModel):
     version: str = Field(..., description="API version")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "status": "healthy",
@@ -57,6 +60,20 @@ class HealthResponse(BaseModel):
                 }
             ]
         }
+    )
+
+
+class BoundingRegion(BaseModel):
+    """Model for one region of a field on a page of the submitted document."""
+
+    page: int = Field(..., ge=0, description="Index of the page in the submitted document")
+    x: float = Field(..., description="Left edge, normalized to the page width")
+    y: float = Field(..., description="Top edge, normalized to the page height")
+    width: float = Field(..., description="Width, normalized to the page width")
+    height: float = Field(..., description="Height, normalized to the page height")
+    pixels: dict | None = Field(
+        default=None, description="The same box in pixels, when pixel boxes are enabled"
+    )
 
 
 class ExtractedField(BaseModel):
@@ -65,67 +82,57 @@ class ExtractedField(BaseModel):
     value: str = Field(..., description="Extracted value")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
     page: int = Field(..., ge=0, description="Page number where field was found")
-    bounding_box: Optional[dict] = Field(default=None, description="Bounding box coordinates")
+    bounding_box: dict | None = Field(default=None, description="Bounding box coordinates")
+    regions: list[BoundingRegion] = Field(
+        default_factory=list, description="Boxes of every region the field was found in"
+    )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "value": "John",
                     "confidence": 0.95,
                     "page": 0,
-                    "bounding_box": {"x": 0.1, "y": 0.2, "width": 0.1, "height": 0.05}
+                    "bounding_box": {"x": 0.1, "y": 0.2, "width": 0.1, "height": 0.05},
+                    "regions": [
+                        {"page": 0, "x": 0.1, "y": 0.2, "width": 0.1, "height": 0.05, "pixels": None}
+                    ]
                 }
             ]
         }
+    )
+
 
+def _create_page_model(page: PageSpec) -> type[BaseModel]:
+    """Generate the model holding the fields of one form page."""
+    return create_model(
+        page.model_name,
+        __doc__=f"Model for fields extracted from {page.title}.",
+        __module__=__name__,
+        **{
+            spec.name: (ExtractedField | None, Field(default=None, description=spec.description))
+            for spec in page.fields
+        },
+    )
 
-class PageOneFields(BaseModel):
-    """Model for fields extracted from page 1."""
-    
-    Date: Optional[ExtractedField] = Field(default=None, description="Date field")
-    CIF: Optional[ExtractedField] = Field(default=None, description="CIF number")
-    FirstName: Optional[ExtractedField] = Field(default=None, description="First name")
-    MiddleName: Optional[ExtractedField] = Field(default=None, description="Middle name")
-    LastName: Optional[ExtractedField] = Field(default=None, description="Last name")
-    DateOfBirth: Optional[ExtractedField] = Field(default=None, description="Date of birth")
-    CityOfBirth: Optional[ExtractedField] = Field(default=None, description="City of birth")
-    MaritalStatus: Optional[ExtractedField] = Field(default=None, description="Marital status")
-    Gender: Optional[ExtractedField] = Field(default=None, description="Gender")
-    PassportNumber: Optional[ExtractedField] = Field(default=None, description="Passport number")
-    EmiratesIDNumber: Optional[ExtractedField] = Field(default=None, description="Emirates ID number")
-    Residency: Optional[ExtractedField] = Field(default=None, description="Residency status")
-    NumberOfYears: Optional[ExtractedField] = Field(default=None, description="Number of years")
-    CountryOfResidence: Optional[ExtractedField] = Field(default=None, description="Country of residence")
-    StreetName: Optional[ExtractedField] = Field(default=None, description="Street name")
-    Area: Optional[ExtractedField] = Field(default=None, description="Area")
-    MakaniNumber: Optional[ExtractedField] = Field(default=None, description="Makani number")
-    BuildingNumber: Optional[ExtractedField] = Field(default=None, description="Building number")
-    FlatVillaNumber: Optional[ExtractedField] = Field(default=None, description="Flat/Villa number")
-    CityEmirate: Optional[ExtractedField] = Field(default=None, description="City/Emirate")
-    POBox: Optional[ExtractedField] = Field(default=None, description="PO Box")
-    Country: Optional[ExtractedField] = Field(default=None, description="Country")
-    MobileNumber: Optional[ExtractedField] = Field(default=None, description="Mobile number")
-    AlternativeNumber: Optional[ExtractedField] = Field(default=None, description="Alternative number")
-    EmailAddress: Optional[ExtractedField] = Field(default=None, description="Email address")
-
-
-class PageTwoFields(BaseModel):
-    """Model for fields extracted from page 2."""
-    
-    Employer: Optional[ExtractedField] = Field(default=None, description="Employer name")
-    Department: Optional[ExtractedField] = Field(default=None, description="Department")
-    Designation: Optional[ExtractedField] = Field(default=None, description="Designation")
-    GrossMonthlyIncome: Optional[ExtractedField] = Field(default=None, description="Gross monthly income")
-    NatureOfBusiness: Optional[ExtractedField] = Field(default=None, description="Nature of business")
-    PercentageOfOwnership: Optional[ExtractedField] = Field(default=None, description="Percentage of ownership")
-
-
-class ExtractedInformation(BaseModel):
-    """Model for all extracted information."""
-    
-    page_one: PageOneFields = Field(..., description="Fields from page 1")
-    page_two: PageTwoFields = Field(..., description="Fields from page 2")
+
+# Page models generated from the form schema, keyed by page key
+PAGE_MODELS: dict[str, type[BaseModel]] = {
+    page.key: _create_page_model(page) for page in NCB_KYC_FORM.pages
+}
+PageOneFields = PAGE_MODELS["page_one"]
+PageTwoFields = PAGE_MODELS["page_two"]
+
+ExtractedInformation = create_model(
+    "ExtractedInformation",
+    __doc__="Model for all extracted information.",
+    __module__=__name__,
+    **{
+        page.key: (PAGE_MODELS[page.key], Field(..., description=f"Fields from {page.title}"))
+        for page in NCB_KYC_FORM.pages
+    },
+)
 
 
 class ProcessingSummary(BaseModel):
@@ -137,9 +144,14 @@ class ProcessingSummary(BaseModel):
     average_confidence: float = Field(..., ge=0.0, le=1.0, description="Average confidence across all extractions")
     processing_time_seconds: float = Field(..., ge=0.0, description="Total processing time in seconds")
     extractor_used: str = Field(..., description="Extractor that was used")
+    served_from_cache: bool = Field(default=False, description="Whether the extraction was served from the result cache")
+    pages_in_file: int | None = Field(default=None, ge=0, description="Number of pages in the uploaded file, when known")
+    pages_submitted: int | None = Field(default=None, ge=0, description="Number of pages sent to Document AI, when known")
+    retries: int = Field(default=0, ge=0, description="Document AI calls retried after transient errors")
+    retry_seconds: float = Field(default=0.0, ge=0.0, description="Time spent on failed attempts and backoff before the final attempt")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "total_pages": 2,
@@ -147,10 +159,16 @@ class ProcessingSummary(BaseModel):
                     "failed_pages": 0,
                     "average_confidence": 0.91,
                     "processing_time_seconds": 8.5,
-                    "extractor_used": "custom-ncb-extractor"
+                    "extractor_used": "custom-ncb-extractor",
+                    "served_from_cache": False,
+                    "pages_in_file": 12,
+                    "pages_submitted": 2,
+                    "retries": 0,
+                    "retry_seconds": 0.0
                 }
             ]
         }
+    )
 
 
 class ProcessResponse(BaseModel):
@@ -163,8 +181,8 @@ class ProcessResponse(BaseModel):
     summary: ProcessingSummary = Field(..., description="Processing summary")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Processing timestamp")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "examples": [
                 {
                     "request_id": "09c771f6-ca28-4285-ad61-095701366967",
@@ -202,4 +220,50 @@ class ProcessResponse(BaseModel):
                     "timestamp": "2024-10-03T15:49:47Z"
                 }
             ]
-        }
\ No newline at end of file
+        }
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Model for the outcome of one file in a batch."""
+
+    filename: str = Field(..., description="Original filename")
+    success: bool = Field(..., description="Whether the file was processed successfully")
+    result: ProcessResponse | None = Field(default=None, description="Processing result when successful")
+    error: ErrorDetail | None = Field(default=None, description="Error details when processing failed")
+    processing_time_seconds: float = Field(..., ge=0.0, description="Time spent processing this file")
+
+
+class BatchProcessResponse(BaseModel):
+    """Model for batch document processing response."""
+
+    request_id: str = Field(..., description="Unique batch request identifier")
+    total_files: int = Field(..., ge=0, description="Number of files in the batch")
+    succeeded: int = Field(..., ge=0, description="Number of files processed successfully")
+    failed: int = Field(..., ge=0, description="Number of files that failed")
+    wall_clock_seconds: float = Field(..., ge=0.0, description="Elapsed time for the whole batch")
+    summed_processing_seconds: float = Field(..., ge=0.0, description="Sum of per-file processing times")
+    parallel_speedup: float = Field(..., ge=0.0, description="Summed per-file time divided by wall-clock time")
+    results: list[BatchItemResult] = Field(..., description="Per-file results in upload order")
+    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Processing timestamp")
+
+
+class JobSubmitResponse(BaseModel):
+    """Model for the acknowledgement of a submitted job."""
+
+    job_id: str = Field(..., description="Identifier to poll the job with")
+    status: str = Field(..., description="Job status at submission time")
+    status_url: str = Field(..., description="URL of the job status resource")
+    result_url: str = Field(..., description="URL of the job result resource")
+
+
+class JobStatusResponse(BaseModel):
+    """Model for the status of an asynchronous processing job."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="One of queued, running, succeeded, failed")
+    filename: str = Field(..., description="Original filename")
+    created_at: datetime = Field(..., description="Submission time")
+    started_at: datetime | None = Field(default=None, description="Time a worker picked up the job")
+    finished_at: datetime | None = Field(default=None, description="Completion time")
+    error: ErrorDetail | None = Field(default=None, description="Error details when the job failed")
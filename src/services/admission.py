@@ -0,0 +1,170 @@
+"""
+Admission control for Document AI calls.
+
+Document AI enforces requests-per-minute quotas per processor. A token
+bucket per processor version keeps our call rate under the quota: calls
+that find the bucket empty wait their turn for a bounded time, and calls
+that would wait longer are rejected straight away with a retry hint.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from loguru import logger
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a call would wait longer than the admission limit allows."""
+
+    def __init__(self, bucket: str, retry_after_seconds: float):
+        super().__init__(
+            f"Document AI quota for {bucket} exhausted, retry in {retry_after_seconds:.1f}s"
+        )
+        self.bucket = bucket
+        self.retry_after_seconds = retry_after_seconds
+
+    @property
+    def retry_after_header(self) -> str:
+        """Whole seconds, rounded up, for a ``Retry-After`` header."""
+        return str(max(1, math.ceil(self.retry_after_seconds)))
+
+
+@dataclass
+class AdmissionStats:
+    """Counters for one bucket."""
+
+    admitted: int = 0
+    queued: int = 0
+    rejected: int = 0
+    wait_seconds_total: float = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return asdict(self)
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations in FIFO order.
+
+    Tokens may go negative: each waiting call reserves the next token and
+    sleeps until it is due, so ``-tokens`` is the backlog of reservations.
+    """
+
+    def __init__(self, rate_per_second: float, burst: float, clock: Callable[[], float]):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated_at = clock()
+        self.waiting = 0
+        self.stats = AdmissionStats()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available now; negative while calls are queued."""
+        self._refill()
+        return self._tokens
+
+    def reserve(self, max_wait_seconds: float) -> float | None:
+        """
+        Reserve one token.
+
+        Returns:
+            Seconds to wait before the token is due, or None if that wait
+            would exceed ``max_wait_seconds`` (nothing is reserved then)
+        """
+        self._refill()
+        wait = max(0.0, (1 - self._tokens) / self.rate_per_second)
+        if wait > max_wait_seconds:
+            return None
+        self._tokens -= 1
+        return wait
+
+    def time_until_available(self) -> float:
+        """Seconds until a new reservation would be due immediately."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate_per_second)
+
+    def release(self) -> None:
+        """Give back a reservation whose call never ran."""
+        self._tokens = min(self.burst, self._tokens + 1)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+
+class AdmissionController:
+    """Token buckets keyed by processor version, shared by all calls.
+
+    A call takes a token immediately when one is available, otherwise it
+    queues for at most ``max_wait_seconds``. When the queue ahead of it is
+    already longer than that, the call is rejected with
+    ``AdmissionRejectedError`` carrying the time after which a retry would
+    be admitted.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: float = 10,
+        max_wait_seconds: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = requests_per_minute / 60
+        self.burst = max(1.0, burst)
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, name: str) -> TokenBucket:
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            bucket = self.buckets[name] = TokenBucket(self.rate_per_second, self.burst, self._clock)
+        return bucket
+
+    def try_acquire(self, name: str) -> bool:
+        """Take a token only if one is available right now; never queues."""
+        bucket = self.bucket(name)
+        if bucket.reserve(max_wait_seconds=0) is None:
+            bucket.stats.rejected += 1
+            return False
+        bucket.stats.admitted += 1
+        return True
+
+    async def acquire(self, name: str) -> float:
+        """
+        Wait for a token from bucket ``name``.
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            AdmissionRejectedError: If the wait would exceed ``max_wait_seconds``
+        """
+        bucket = self.bucket(name)
+        wait = bucket.reserve(self.max_wait_seconds)
+        if wait is None:
+            bucket.stats.rejected += 1
+            # Once the backlog has drained this far, a retry fits within the wait limit
+            retry_after = bucket.time_until_available() - self.max_wait_seconds
+            logger.warning(f"Admission rejected for {name}: {bucket.waiting} calls queued")
+            raise AdmissionRejectedError(name, retry_after)
+
+        if wait > 0:
+            bucket.stats.queued += 1
+            bucket.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                bucket.release()
+                raise
+            finally:
+                bucket.waiting -= 1
+            bucket.stats.wait_seconds_total += wait
+
+        bucket.stats.admitted += 1
+        return wait
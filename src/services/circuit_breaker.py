@@ -0,0 +1,216 @@
+"""
+Circuit breakers for Document AI calls.
+
+During a regional outage every call would otherwise wait out its full
+deadline before failing. A breaker per processor and location watches the
+outcome and latency of recent calls; once too many fail or run slow it
+opens and calls fail fast until a cool-down has passed. Then a few probe
+calls are let through (half-open) and their outcome closes or reopens it.
+"""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose breaker is open."""
+
+    def __init__(self, breaker: str, retry_after_seconds: float):
+        super().__init__(f"Circuit for {breaker} is open, retry in {retry_after_seconds:.1f}s")
+        self.breaker = breaker
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass
+class BreakerStats:
+    """Counters for one breaker."""
+
+    successes: int = 0
+    failures: int = 0
+    slow_calls: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a window of recent calls.
+
+    The breaker opens when at least ``min_calls`` of the last
+    ``window_size`` calls are known and either the failure rate reaches
+    ``failure_rate_threshold`` or the rate of successful calls slower than
+    ``slow_call_seconds`` reaches ``slow_call_rate_threshold``. After
+    ``open_seconds`` it lets ``half_open_max_calls`` probes through: if they
+    all succeed in time it closes with a clean window, otherwise it opens
+    again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30,
+        slow_call_rate_threshold: float = 0.8,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        # (failed, slow) per recorded call
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # Bumped on every transition, so outcomes of calls permitted in an
+        # earlier state do not count towards the current one
+        self._generation = 0
+        self.stats = BreakerStats()
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker reads half-open once its cool-down is over."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def retry_after_seconds(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+
+    def before_call(self) -> int:
+        """
+        Ask permission for one call.
+
+        Every permitted call must be followed by ``record_success``,
+        ``record_failure`` or ``release`` with the returned permit.
+
+        Returns:
+            A permit identifying the state the call was let through in
+
+        Raises:
+            CircuitOpenError: While open, or half-open with all probes taken
+        """
+        state = self.state
+        if state == HALF_OPEN:
+            if self._state == OPEN:
+                self._transition(HALF_OPEN)
+            if self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return self._generation
+        if state == CLOSED:
+            return self._generation
+        self.stats.rejected += 1
+        raise CircuitOpenError(self.name, max(self.retry_after_seconds(), 1.0))
+
+    def record_success(self, permit: int, seconds: float) -> None:
+        slow = seconds >= self.slow_call_seconds
+        self.stats.successes += 1
+        self.stats.slow_calls += slow
+        if permit != self._generation:
+            return
+        if self._state == HALF_OPEN:
+            self._probes_in_flight -= 1
+            if slow:
+                self._trip(f"slow probe ({seconds:.1f}s)")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition(CLOSED)
+            return
+        self._record((False, slow))
+
+    def record_failure(self, permit: int) -> None:
+        self.stats.failures += 1
+        if permit != self._generation:
+            return
+        if self._state == HALF_OPEN:
+            self._probes_in_flight -= 1
+            self._trip("failed probe")
+            return
+        self._record((True, False))
+
+    def release(self, permit: int) -> None:
+        """Return the permit of a call that never reached the backend."""
+        if permit == self._generation and self._state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        calls = len(self._window)
+        failed = sum(failed for failed, _ in self._window)
+        slow = sum(slow for _, slow in self._window)
+        return {
+            "state": self.state,
+            "window_calls": calls,
+            "failure_rate": failed / calls if calls else 0.0,
+            "slow_call_rate": slow / calls if calls else 0.0,
+            "retry_after_seconds": self.retry_after_seconds(),
+            **self.stats.as_dict(),
+        }
+
+    def _record(self, outcome: tuple[bool, bool]) -> None:
+        self._window.append(outcome)
+        if self._state != CLOSED or len(self._window) < self.min_calls:
+            return
+        calls = len(self._window)
+        failure_rate = sum(failed for failed, _ in self._window) / calls
+        slow_rate = sum(slow for _, slow in self._window) / calls
+        if failure_rate >= self.failure_rate_threshold:
+            self._trip(f"failure rate {failure_rate:.0%}")
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._trip(f"slow call rate {slow_rate:.0%}")
+
+    def _trip(self, reason: str) -> None:
+        self.stats.opened += 1
+        self._opened_at = self._clock()
+        logger.warning(f"Circuit for {self.name} opened: {reason}")
+        self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != OPEN:
+            logger.info(f"Circuit for {self.name} is now {state}")
+        self._state = state
+        self._generation += 1
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CLOSED:
+            self._window.clear()
+
+
+class CircuitBreakers:
+    """Circuit breakers keyed by processor and location, created on first use."""
+
+    def __init__(self, **breaker_options: Any):
+        self._options = breaker_options
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(name, **self._options)
+        return breaker
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
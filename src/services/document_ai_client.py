@@ -3,51 +3,265 @@ Async Document AI client for processing NCB KYC documents.
 """
 
 import asyncio
+import contextvars
+import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any
 
+import grpc
+from google.api_core import exceptions as core_exceptions
 from google.api_core.client_options import ClientOptions
 from google.cloud import documentai
+from google.cloud.documentai_v1.services.document_processor_service.transports import (
+    DocumentProcessorServiceGrpcAsyncIOTransport,
+    DocumentProcessorServiceGrpcTransport,
+)
 from google.cloud.documentai_v1.types import Document
 from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_before_delay,
+    wait_random_exponential,
+)
 
 from src.core.config import DocumentAIConfig
+from src.core.schema import NCB_KYC_FORM
+from src.services import tracing
+from src.services.admission import AdmissionController, AdmissionRejectedError
+from src.services.circuit_breaker import CircuitBreakers, CircuitOpenError
+from src.services.geometry import entity_geometry, page_dimensions
+from src.services.hedging import Hedger
+from src.services.instrumentation import PipelineMetrics
+from src.services.recording import ResponseRecorder
+from src.services.result_cache import hash_document
+
+# Match the unlimited message sizes the generated transports configure
+_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+
+# Transient failures worth another attempt: UNAVAILABLE, DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED
+RETRYABLE_ERRORS = (
+    core_exceptions.ServiceUnavailable,
+    core_exceptions.DeadlineExceeded,
+    core_exceptions.ResourceExhausted,
+)
+
+# Failures that count against a circuit breaker: the backend itself is
+# unhealthy (5xx, including DEADLINE_EXCEEDED) or out of quota
+BREAKER_ERRORS = (core_exceptions.ServerError, core_exceptions.ResourceExhausted)
+
+
+@dataclass
+class CallReport:
+    """How a ProcessDocument call went: attempts made and time lost to retries."""
+
+    attempts: int = 0
+    retry_seconds: float = 0.0
+    # Whether the call went to the alternate location because the primary circuit was open
+    failed_over: bool = False
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    logger.warning(
+        f"Document AI attempt {retry_state.attempt_number} failed with "
+        f"{retry_state.outcome.exception()!r}, retrying in {retry_state.upcoming_sleep:.2f}s"
+    )
 
 
 class DocumentAIClient:
-    """Async wrapper for Google Cloud Document AI operations."""
+    """Async wrapper for Google Cloud Document AI operations.
 
-    _executor: ThreadPoolExecutor | None = None
+    A single instance is meant to be shared for the lifetime of the
+    application: it owns the gRPC channels and the thread pool used to run
+    blocking calls, which are created in ``initialize()`` and released in
+    ``aclose()``.
 
-    def __init__(self, location: str = None):
-        self.config = DocumentAIConfig()
+    With ``DocumentAIConfig.transport == "async"`` calls go through
+    ``DocumentProcessorServiceAsyncClient`` instead of the thread pool and
+    are bounded only by ``max_in_flight``.
+
+    Every call first takes a token from the ``AdmissionController`` bucket
+    of its processor version, keeping the call rate within the quota, and
+    passes the ``CircuitBreaker`` of its processor and location.
+    """
+
+    def __init__(
+        self,
+        location: str | None = None,
+        config: DocumentAIConfig | None = None,
+        metrics: PipelineMetrics | None = None,
+    ):
+        self.config = config or DocumentAIConfig()
+        # Shared with the extraction service and routes for per-stage timings
+        self.metrics = metrics or PipelineMetrics()
         self.location = location or self.config.LOCATION
         self.project_id = self.config.PROJECT_ID
+        self.api_endpoint = self.config.api_endpoint or f"{self.location}-documentai.googleapis.com"
+        self._executor: ThreadPoolExecutor | None = None
+        self.async_client: documentai.DocumentProcessorServiceAsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        # Async-transport calls waiting for an in-flight slot
+        self._slot_waiters = 0
+        self.admission: AdmissionController | None = None
+        if self.config.quota_requests_per_minute > 0:
+            share = max(1, self.config.quota_worker_processes)
+            self.admission = AdmissionController(
+                requests_per_minute=self.config.quota_requests_per_minute / share,
+                burst=self.config.quota_burst / share,
+                max_wait_seconds=self.config.admission_max_wait_seconds,
+            )
+
+        # Offline replay of recorded responses, and recording of live ones
+        self.replay: ResponseRecorder | None = None
+        if self.config.replay_responses_dir:
+            self.replay = ResponseRecorder(self.config.replay_responses_dir)
+            logger.info(f"Replaying recorded responses from {self.config.replay_responses_dir}")
+        self.recorder: ResponseRecorder | None = None
+        if self.config.record_responses_dir:
+            self.recorder = ResponseRecorder(self.config.record_responses_dir)
+
+        if self._plaintext:
+            transport = DocumentProcessorServiceGrpcTransport(
+                channel=grpc.insecure_channel(self.api_endpoint, options=_CHANNEL_OPTIONS)
+            )
+            self.client = documentai.DocumentProcessorServiceClient(transport=transport)
+        else:
+            opts = ClientOptions(api_endpoint=self.api_endpoint)
+            self.client = documentai.DocumentProcessorServiceClient(client_options=opts)
+
+        self.breakers: CircuitBreakers | None = None
+        if self.config.circuit_breaker_enabled:
+            self.breakers = CircuitBreakers(
+                failure_rate_threshold=self.config.circuit_failure_rate_threshold,
+                slow_call_seconds=self.config.circuit_slow_call_seconds,
+                slow_call_rate_threshold=self.config.circuit_slow_call_rate_threshold,
+                window_size=self.config.circuit_window_size,
+                min_calls=self.config.circuit_min_calls,
+                open_seconds=self.config.circuit_open_seconds,
+                half_open_max_calls=self.config.circuit_half_open_max_calls,
+            )
+
+        # The same extractor deployed in another location, for hedging and failover
+        self.alternate: DocumentAIClient | None = None
+        if self.config.alternate_location and self.config.alternate_processor_id:
+            self.alternate = DocumentAIClient(
+                location=self.config.alternate_location,
+                config=self.config.model_copy(
+                    update={
+                        "location": self.config.alternate_location,
+                        "custom_extractor_id": self.config.alternate_processor_id,
+                        "custom_extractor_version_id": self.config.alternate_processor_version_id,
+                        "api_endpoint": self.config.alternate_api_endpoint,
+                        "alternate_location": None,
+                        "alternate_processor_id": None,
+                        "hedge_enabled": False,
+                    }
+                ),
+                metrics=self.metrics,
+            )
 
-        opts = ClientOptions(api_endpoint=f"{self.location}-documentai.googleapis.com")
-        self.client = documentai.DocumentProcessorServiceClient(client_options=opts)
+        self.hedger: Hedger | None = None
+        if self.config.hedge_enabled:
+            if self.config.transport != "async":
+                # A cancelled call on the thread pool still holds its thread until
+                # the RPC returns, so every losing hedge would cost an executor slot
+                raise ValueError("HEDGE_ENABLED requires TRANSPORT=async")
+            self.hedger = Hedger(
+                percentile=self.config.hedge_percentile,
+                budget_ratio=self.config.hedge_budget_ratio,
+                min_samples=self.config.hedge_min_samples,
+                min_delay_seconds=self.config.hedge_min_delay_seconds,
+            )
+            if self.config.hedge_target == "alternate" and self.alternate is None:
+                logger.warning("Hedge target is the alternate location, but none is configured")
 
         logger.info(f"Initialized DocumentAI client for location: {self.location}")
 
-    @classmethod
-    def initialize(cls) -> None:
-        """Initialize the thread pool executor."""
-        if cls._executor is None:
-            cls._executor = ThreadPoolExecutor(
-                max_workers=4, thread_name_prefix="docai"
+    def initialize(self) -> None:
+        """Initialize the thread pool executor or the asyncio client."""
+        if self.alternate is not None:
+            self.alternate.initialize()
+        if self.config.transport == "async":
+            # The asyncio channel binds to the running loop, so it is created here
+            if self.async_client is None:
+                self.async_client = self._create_async_client()
+                self._semaphore = asyncio.Semaphore(self.config.max_in_flight)
+                logger.info(
+                    f"Initialized DocumentAI asyncio client (max_in_flight={self.config.max_in_flight})"
+                )
+        elif self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.executor_max_workers, thread_name_prefix="docai"
             )
             logger.info("Initialized DocumentAI thread pool executor")
 
-    @classmethod
-    def cleanup(cls) -> None:
-        """Cleanup the thread pool executor."""
-        if cls._executor:
-            cls._executor.shutdown(wait=True)
-            cls._executor = None
+    def cleanup(self) -> None:
+        """Drain the thread pool executor and close the gRPC channel."""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
             logger.info("Cleaned up DocumentAI thread pool executor")
+        self.client.transport.close()
+        if self.alternate is not None:
+            self.alternate.cleanup()
+
+    async def aclose(self) -> None:
+        """Close the asyncio channel and drain the executor without blocking the loop."""
+        if self.alternate is not None:
+            await self.alternate.aclose()
+        if self.async_client is not None:
+            await self.async_client.transport.close()
+            self.async_client = None
+            self._semaphore = None
+            logger.info("Closed DocumentAI asyncio client")
+        await asyncio.to_thread(self.cleanup)
+
+    @property
+    def _plaintext(self) -> bool:
+        # Replay never calls Document AI, so it needs no credentials
+        return self.config.insecure_channel or self.replay is not None
+
+    def _create_async_client(self) -> documentai.DocumentProcessorServiceAsyncClient:
+        """Build the asyncio client against the same endpoint as the sync one."""
+        if self._plaintext:
+            transport = DocumentProcessorServiceGrpcAsyncIOTransport(
+                channel=grpc.aio.insecure_channel(self.api_endpoint, options=_CHANNEL_OPTIONS)
+            )
+            return documentai.DocumentProcessorServiceAsyncClient(transport=transport)
+        opts = ClientOptions(api_endpoint=self.api_endpoint)
+        return documentai.DocumentProcessorServiceAsyncClient(client_options=opts)
+
+    async def check_ready(self, timeout: float = 5.0) -> None:
+        """
+        Fetch the configured processor to confirm the endpoint, credentials
+        and processor are usable.
+
+        Raises:
+            Exception: Whatever the GetProcessor call raised
+        """
+        if self.replay is not None:
+            # Replay never calls Document AI
+            return
+        name = self._build_processor_name(self.config.CUSTOM_EXTRACTOR_ID)
+        if self.async_client is not None:
+            await self.async_client.get_processor(name=name, timeout=timeout)
+        else:
+            # Off the request executor so a slow probe never delays extractions
+            await asyncio.to_thread(self.client.get_processor, name=name, timeout=timeout)
 
     def _build_processor_name(
-        self, processor_id: str, version_id: Optional[str] = None
+        self, processor_id: str, version_id: str | None = None
     ) -> str:
         """Build the full processor resource name."""
         if version_id:
@@ -59,29 +273,16 @@ class DocumentAIClient:
                 self.project_id, self.location, processor_id
             )
 
-    def _process_document_sync(
+    def _build_process_request(
         self,
         file_content: bytes,
         processor_id: str,
-        version_id: Optional[str] = None,
+        version_id: str | None = None,
         mime_type: str = "application/pdf",
-        field_mask: Optional[str] = None,
-        pages: Optional[list[int]] = None,
-    ) -> Document:
-        """
-        Synchronous document processing (runs in thread pool).
-
-        Args:
-            file_content: Document content as bytes
-            processor_id: Document AI processor ID
-            version_id: Processor version ID
-            mime_type: MIME type of the document
-            field_mask: Optional field mask for response
-            pages: Optional list of specific pages to process (0-based)
-
-        Returns:
-            Document: Processed document result
-        """
+        field_mask: str | None = None,
+        pages: list[int] | None = None,
+    ) -> documentai.ProcessRequest:
+        """Build the ProcessRequest shared by both transports."""
         processor_name = self._build_processor_name(processor_id, version_id)
 
         raw_document = documentai.RawDocument(content=file_content, mime_type=mime_type)
@@ -96,22 +297,49 @@ class DocumentAIClient:
                 )
             )
 
-        request = documentai.ProcessRequest(
+        return documentai.ProcessRequest(
             name=processor_name,
             raw_document=raw_document,
             field_mask=field_mask,
             process_options=process_options,
         )
 
+    def _process_document_sync(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None = None,
+        mime_type: str = "application/pdf",
+        field_mask: str | None = None,
+        pages: list[int] | None = None,
+        timeout: float | None = None,
+    ) -> Document:
+        """
+        Synchronous document processing (runs in thread pool).
+
+        Args:
+            file_content: Document content as bytes
+            processor_id: Document AI processor ID
+            version_id: Processor version ID
+            mime_type: MIME type of the document
+            field_mask: Optional field mask for response
+            pages: Optional list of specific pages to process (0-based)
+            timeout: RPC timeout in seconds
+
+        Returns:
+            Document: Processed document result
+        """
+        request = self._build_process_request(
+            file_content, processor_id, version_id, mime_type, field_mask, pages
+        )
+
         logger.debug(f"Processing document with processor: {processor_id[:8]}...")
-        
-        # Add timeout to prevent infinite loops
-        import time
         start_time = time.time()
-        timeout_seconds = 300  # 5 minutes timeout
-        
+
         try:
-            result = self.client.process_document(request=request)
+            # Retries are driven by process_document, not the client's default policy
+            with self.metrics.stage("rpc"):
+                result = self.client.process_document(request=request, retry=None, timeout=timeout)
             processing_time = time.time() - start_time
             logger.info(f"Document processing completed in {processing_time:.2f} seconds")
             return result.document
@@ -120,18 +348,82 @@ class DocumentAIClient:
             logger.error(f"Document processing failed after {processing_time:.2f} seconds: {e}")
             raise
 
+    async def _process_document_async(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None = None,
+        mime_type: str = "application/pdf",
+        field_mask: str | None = None,
+        pages: list[int] | None = None,
+        timeout: float | None = None,
+    ) -> Document:
+        """
+        Document processing on the native asyncio transport.
+
+        Args:
+            file_content: Document content as bytes
+            processor_id: Document AI processor ID
+            version_id: Processor version ID
+            mime_type: MIME type of the document
+            field_mask: Optional field mask for response
+            pages: Optional list of specific pages to process (0-based)
+            timeout: RPC timeout in seconds
+
+        Returns:
+            Document: Processed document result
+        """
+        request = self._build_process_request(
+            file_content, processor_id, version_id, mime_type, field_mask, pages
+        )
+
+        logger.debug(f"Processing document with processor: {processor_id[:8]}...")
+        start_time = time.time()
+
+        # Acquired by hand rather than with ``async with`` to count and time the wait
+        queued_at = time.perf_counter()
+        self._slot_waiters += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._slot_waiters -= 1
+        self.metrics.observe("queue_wait", time.perf_counter() - queued_at)
+        try:
+            with self.metrics.stage("rpc"):
+                result = await self.async_client.process_document(
+                    request=request, retry=None, timeout=timeout
+                )
+        except Exception as e:
+            processing_time = time.time() - start_time
+            logger.error(f"Document processing failed after {processing_time:.2f} seconds: {e}")
+            raise
+        finally:
+            self._semaphore.release()
+
+        processing_time = time.time() - start_time
+        logger.info(f"Document processing completed in {processing_time:.2f} seconds")
+        return result.document
+
     async def process_document(
         self,
         file_content: bytes,
         processor_id: str,
-        version_id: Optional[str] = None,
+        version_id: str | None = None,
         mime_type: str = "application/pdf",
-        field_mask: Optional[str] = None,
-        pages: Optional[list[int]] = None,
+        field_mask: str | None = None,
+        pages: list[int] | None = None,
+        report: CallReport | None = None,
     ) -> Document:
         """
         Async document processing.
 
+        Transient errors (``RETRYABLE_ERRORS``) are retried with exponential
+        backoff and full jitter. All attempts share one deadline of
+        ``timeout_seconds``; each RPC gets the time that remains as its
+        timeout, and no retry starts if its backoff would run past it. While
+        the processor's circuit is open, the call fails over to the alternate
+        location when one is configured, within the same deadline.
+
         Args:
             file_content: Document content as bytes
             processor_id: Document AI processor ID
@@ -139,160 +431,394 @@ class DocumentAIClient:
             mime_type: MIME type of the document
             field_mask: Optional field mask for response
             pages: Optional list of specific pages to process (0-based)
+            report: Filled in with the attempts made and time spent retrying
 
         Returns:
             Document: Processed document result
+
+        Raises:
+            AdmissionRejectedError: If the processor's quota bucket is backed up
+                beyond the admission wait limit
+            CircuitOpenError: If the processor's circuit is open and there is
+                no alternate location to fail over to
         """
+        report = report if report is not None else CallReport()
+        start = time.monotonic()
+        with tracing.span("document_ai.process") as span:
+            try:
+                return await self._process_with_retries(
+                    file_content, processor_id, version_id, mime_type, field_mask, pages,
+                    self.config.timeout_seconds, report,
+                )
+            except CircuitOpenError as e:
+                if self.alternate is None or not self.config.circuit_failover:
+                    raise
+                logger.warning(f"{e}; failing over to {self.alternate.location}")
+                report.failed_over = True
+                # The alternate gets whatever is left of the same deadline
+                return await self.alternate._process_with_retries(
+                    file_content,
+                    self.alternate.config.CUSTOM_EXTRACTOR_ID,
+                    self.alternate.config.CUSTOM_EXTRACTOR_VERSION_ID,
+                    mime_type,
+                    field_mask,
+                    pages,
+                    self.config.timeout_seconds - (time.monotonic() - start),
+                    report,
+                )
+            finally:
+                span.set_attribute("docai.attempts", report.attempts)
+                span.set_attribute("docai.failed_over", report.failed_over)
+
+    async def _process_with_retries(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None,
+        mime_type: str,
+        field_mask: str | None,
+        pages: list[int] | None,
+        deadline_seconds: float,
+        report: CallReport,
+    ) -> Document:
+        """Attempts under one deadline, retrying ``RETRYABLE_ERRORS``."""
+        start = time.monotonic()
+        # Attempts already made elsewhere (before a failover) keep counting
+        previous_attempts = report.attempts
+
+        retrying = AsyncRetrying(
+            retry=retry_if_exception_type(RETRYABLE_ERRORS),
+            wait=wait_random_exponential(
+                multiplier=self.config.retry_initial_backoff_seconds,
+                max=self.config.retry_max_backoff_seconds,
+            ),
+            stop=stop_after_attempt(self.config.retry_max_attempts) | stop_before_delay(deadline_seconds),
+            before_sleep=_log_retry,
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                report.attempts = previous_attempts + attempt.retry_state.attempt_number
+                elapsed = time.monotonic() - start
+                if attempt.retry_state.attempt_number > 1:
+                    report.retry_seconds = elapsed
+                remaining = deadline_seconds - elapsed
+                if remaining <= 0:
+                    raise core_exceptions.DeadlineExceeded(
+                        f"Request deadline of {self.config.timeout_seconds}s exceeded"
+                    )
+                with tracing.span("document_ai.attempt", **{"docai.attempt": report.attempts}):
+                    return await self._process_with_hedging(
+                        file_content, processor_id, version_id, mime_type, field_mask, pages, remaining
+                    )
+
+    async def _process_with_hedging(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None,
+        mime_type: str,
+        field_mask: str | None,
+        pages: list[int] | None,
+        timeout: float,
+    ) -> Document:
+        """One attempt, raced against a backup call when hedging is enabled."""
+        if self.hedger is None:
+            return await self._process_document_once(
+                file_content, processor_id, version_id, mime_type, field_mask, pages, timeout
+            )
+
+        backup_client, backup_processor_id, backup_version_id = self, processor_id, version_id
+        if self.config.hedge_target == "alternate" and self.alternate is not None:
+            backup_client = self.alternate
+            backup_processor_id = self.alternate.config.CUSTOM_EXTRACTOR_ID
+            backup_version_id = self.alternate.config.CUSTOM_EXTRACTOR_VERSION_ID
+
+        return await self.hedger.run(
+            lambda: self._process_document_once(
+                file_content, processor_id, version_id, mime_type, field_mask, pages, timeout
+            ),
+            # A backup only goes out if the quota has a token to spare right now
+            lambda: backup_client._process_document_once(
+                file_content,
+                backup_processor_id,
+                backup_version_id,
+                mime_type,
+                field_mask,
+                pages,
+                timeout,
+                wait_for_admission=False,
+            ),
+        )
+
+    async def _process_document_once(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None,
+        mime_type: str,
+        field_mask: str | None,
+        pages: list[int] | None,
+        timeout: float,
+        wait_for_admission: bool = True,
+    ) -> Document:
+        """One ProcessDocument attempt, traced as a ``document_ai.call`` span."""
+        attributes = {
+            "docai.location": self.location,
+            "docai.processor": processor_id,
+            "docai.hedge": not wait_for_admission,
+        }
+        with tracing.span("document_ai.call", **attributes):
+            return await self._guarded_call(
+                file_content, processor_id, version_id, mime_type, field_mask, pages, timeout,
+                wait_for_admission,
+            )
+
+    async def _guarded_call(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None,
+        mime_type: str,
+        field_mask: str | None,
+        pages: list[int] | None,
+        timeout: float,
+        wait_for_admission: bool,
+    ) -> Document:
+        """Take an admission token and call ProcessDocument through the circuit breaker."""
+        breaker = None
+        if self.breakers is not None:
+            breaker = self.breakers.breaker(f"{self.location}/{processor_id}")
+            permit = breaker.before_call()
+
+        try:
+            await self._admit(processor_id, version_id, wait_for_admission)
+        except BaseException:
+            if breaker is not None:
+                breaker.release(permit)
+            raise
+
+        call = self._call_transport(
+            file_content, processor_id, version_id, mime_type, field_mask, pages, timeout
+        )
+        if breaker is None:
+            return await call
+
+        start = time.monotonic()
+        try:
+            document = await call
+        except BREAKER_ERRORS:
+            breaker.record_failure(permit)
+            raise
+        except BaseException:
+            # Cancelled, or rejected as a bad request: says nothing about the backend
+            breaker.release(permit)
+            raise
+        breaker.record_success(permit, time.monotonic() - start)
+        return document
+
+    async def _admit(self, processor_id: str, version_id: str | None, wait: bool) -> None:
+        """Take a token from the processor version's admission bucket."""
+        if self.admission is None:
+            return
+        bucket = f"{processor_id}:{version_id or 'default'}"
+        if wait:
+            with tracing.span("admission_wait"):
+                await self.admission.acquire(bucket)
+        elif not self.admission.try_acquire(bucket):
+            raise AdmissionRejectedError(bucket, self.admission.bucket(bucket).time_until_available())
+
+    async def _call_transport(
+        self,
+        file_content: bytes,
+        processor_id: str,
+        version_id: str | None,
+        mime_type: str,
+        field_mask: str | None,
+        pages: list[int] | None,
+        timeout: float,
+    ) -> Document:
+        """Call ProcessDocument on the configured transport."""
+        if self.config.transport == "async":
+            if self.async_client is None:
+                raise RuntimeError(
+                    "DocumentAI client not initialized. Call initialize() first."
+                )
+            return await self._process_document_async(
+                file_content, processor_id, version_id, mime_type, field_mask, pages, timeout
+            )
+
         if self._executor is None:
             raise RuntimeError(
                 "DocumentAI client not initialized. Call initialize() first."
             )
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
+        # Run in a copy of the current context so spans recorded in the thread join the trace
+        context = contextvars.copy_context()
         return await loop.run_in_executor(
             self._executor,
-            self._process_document_sync,
+            context.run,
+            self._run_queued,
+            time.perf_counter(),
             file_content,
             processor_id,
             version_id,
             mime_type,
             field_mask,
             pages,
+            timeout,
         )
 
+    def _run_queued(self, queued_at: float, *args: Any) -> Document:
+        """Executor entry point: record the time spent queued, then call."""
+        self.metrics.observe("queue_wait", time.perf_counter() - queued_at)
+        return self._process_document_sync(*args)
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for an executor thread or an in-flight slot."""
+        if self._executor is not None:
+            return self._executor._work_queue.qsize()
+        return self._slot_waiters
+
     async def extract_kyc_information(
         self,
         file_content: bytes,
         mime_type: str = "application/pdf",
+        pages: list[int] | None = None,
+        report: CallReport | None = None,
+        content_sha256: str | None = None,
     ) -> Document:
         """
         Extract KYC information using the custom NCB extractor.
 
+        In replay mode the recorded response for the document is returned
+        instead; with a recorder configured, every response is recorded.
+
         Args:
             file_content: Document content as bytes
             mime_type: MIME type of the document
+            pages: Optional list of specific pages to process (0-based)
+            report: Filled in with the attempts made and time spent retrying
+            content_sha256: SHA-256 hex digest of the content, if already known
 
         Returns:
             Document: Processed document result with extracted fields
+
+        Raises:
+            RecordingNotFoundError: In replay mode, if the document was never recorded
         """
+        if self.replay is not None:
+            content_sha256 = content_sha256 or hash_document(file_content)
+            return await asyncio.to_thread(self.replay.load, content_sha256)
+
         logger.info("Extracting KYC information with custom NCB extractor")
 
         try:
             # Try with specific version first if available
             if self.config.CUSTOM_EXTRACTOR_VERSION_ID:
-                return await self.process_document(
+                document = await self.process_document(
                     file_content=file_content,
                     processor_id=self.config.CUSTOM_EXTRACTOR_ID,
                     version_id=self.config.CUSTOM_EXTRACTOR_VERSION_ID,
                     mime_type=mime_type,
+                    field_mask=self.config.RESPONSE_FIELD_MASK,
+                    pages=pages,
+                    report=report,
                 )
             else:
                 # Use default deployed version
-                return await self.process_document(
+                document = await self.process_document(
                     file_content=file_content,
                     processor_id=self.config.CUSTOM_EXTRACTOR_ID,
                     version_id=None,
                     mime_type=mime_type,
+                    field_mask=self.config.RESPONSE_FIELD_MASK,
+                    pages=pages,
+                    report=report,
                 )
         except Exception as e:
             logger.error(f"Failed to extract with custom NCB extractor: {e}")
             raise
 
-    def parse_extracted_fields(self, document: Document) -> Dict[str, Any]:
+        if self.recorder is not None:
+            await self._record(content_sha256 or hash_document(file_content), document, pages)
+        return document
+
+    async def _record(
+        self, content_sha256: str, document: Document, pages: list[int] | None
+    ) -> None:
+        """Save a scrubbed copy of a response; failing to record never fails the request."""
+        metadata = {
+            # Insecure channels only ever point at local stand-ins
+            "source": "local" if self.config.insecure_channel else "document_ai",
+            "api_endpoint": self.api_endpoint,
+            "processor": self._build_processor_name(
+                self.config.CUSTOM_EXTRACTOR_ID, self.config.CUSTOM_EXTRACTOR_VERSION_ID
+            ),
+            "field_mask": self.config.RESPONSE_FIELD_MASK,
+            "pages": pages,
+        }
+        try:
+            path = await asyncio.to_thread(self.recorder.save, content_sha256, document, metadata)
+        except OSError as e:
+            logger.warning(f"Failed to record Document AI response: {e}")
+        else:
+            logger.info(f"Recorded Document AI response to {path}")
+
+    def parse_extracted_fields(self, document: Document) -> dict[str, Any]:
         """
         Parse the extracted fields from Document AI response.
 
+        Reads the raw protobuf message behind the proto-plus wrapper in a
+        single pass, avoiding proto-plus marshalling on every attribute
+        access. ``benchmarks/reference_parser.py`` keeps the proto-plus
+        version to check the output against.
+
+        ``bounding_box`` is the box of the entity's first page ref;
+        ``regions`` lists the boxes of all its page refs, with pixel
+        coordinates when ``pixel_bounding_boxes`` is enabled.
+
         Args:
-            document: Processed Document AI document
+            document: Processed Document AI document, proto-plus or raw protobuf
 
         Returns:
             Dictionary containing parsed field information
         """
-        extracted_fields = {
-            "page_one": {},
-            "page_two": {}
-        }
-
-        # Get entities from the document
-        entities = document.entities if hasattr(document, 'entities') else []
-
-        # Define field mappings for page 1
-        page_one_fields = [
-            "Date", "CIF", "FirstName", "MiddleName", "LastName", "DateOfBirth",
-            "CityOfBirth", "MaritalStatus", "Gender", "PassportNumber", "EmiratesIDNumber",
-            "Residency", "NumberOfYears", "CountryOfResidence", "StreetName", "Area",
-            "MakaniNumber", "BuildingNumber", "FlatVillaNumber", "CityEmirate", "POBox",
-            "Country", "MobileNumber", "AlternativeNumber", "EmailAddress"
-        ]
-
-        # Define field mappings for page 2
-        page_two_fields = [
-            "Employer", "Department", "Designation", "GrossMonthlyIncome",
-            "NatureOfBusiness", "PercentageOfOwnership"
-        ]
-
-        # Process entities and map them to pages
-        for entity in entities:
-            field_name = entity.type_
-            confidence = entity.confidence if hasattr(entity, 'confidence') else 0.0
-            value = entity.mention_text if hasattr(entity, 'mention_text') else ""
-            
-            # Determine which page this field belongs to
-            if field_name in page_one_fields:
-                page_num = 0
-                page_key = "page_one"
-            elif field_name in page_two_fields:
-                page_num = 1
-                page_key = "page_two"
-            else:
-                continue  # Skip unknown fields
-
-            # Extract bounding box information if available
-            bounding_box = None
-            if hasattr(entity, 'page_anchor') and entity.page_anchor:
-                page_anchor = entity.page_anchor.page_refs[0] if entity.page_anchor.page_refs else None
-                if page_anchor and hasattr(page_anchor, 'bounding_poly'):
-                    # Convert bounding poly to simple bounding box
-                    vertices = page_anchor.bounding_poly.normalized_vertices
-                    if vertices:
-                        x_coords = [v.x for v in vertices]
-                        y_coords = [v.y for v in vertices]
-                        bounding_box = {
-                            "x": min(x_coords),
-                            "y": min(y_coords),
-                            "width": max(x_coords) - min(x_coords),
-                            "height": max(y_coords) - min(y_coords)
-                        }
-
-            extracted_fields[page_key][field_name] = {
-                "value": value,
-                "confidence": confidence,
-                "page": page_num,
-                "bounding_box": bounding_box
+        document_pb = Document.pb(document) if isinstance(document, Document) else document
+        extracted_fields = {page_key: {} for page_key in NCB_KYC_FORM.page_keys}
+        field_lookup = NCB_KYC_FORM.lookup
+
+        matched = []
+        for entity in document_pb.entities:
+            slot = field_lookup.get(entity.type_)
+            if slot is not None:  # Skip unknown fields
+                matched.append((entity, slot))
+
+        # Boxes for every page ref of every matched entity, computed together in one call
+        dimensions = page_dimensions(document_pb) if self.config.pixel_bounding_boxes else None
+        geometry = entity_geometry([entity for entity, _ in matched], dimensions)
+
+        for (entity, slot), entity_boxes in zip(matched, geometry, strict=True):
+            extracted_fields[slot.page_key][entity.type_] = {
+                "value": entity.mention_text,
+                "confidence": entity.confidence,
+                "page": slot.page,
+                "bounding_box": entity_boxes.bounding_box,
+                "regions": entity_boxes.regions,
             }
 
         return extracted_fields
 
-    def get_processor_info(self) -> Dict[str, Any]:
+    def get_processor_info(self) -> dict[str, Any]:
         """Get information about the custom NCB processor."""
         return {
             "custom_extractor": {
                 "id": self.config.CUSTOM_EXTRACTOR_ID,
                 "version": self.config.CUSTOM_EXTRACTOR_VERSION_ID,
-                "name": "custom-ncb-extractor",
+                "name": NCB_KYC_FORM.extractor,
                 "description": "Custom NCB Bank KYC Form Extractor",
-                "supported_fields": {
-                    "page_one": [
-                        "Date", "CIF", "FirstName", "MiddleName", "LastName", "DateOfBirth",
-                        "CityOfBirth", "MaritalStatus", "Gender", "PassportNumber", "EmiratesIDNumber",
-                        "Residency", "NumberOfYears", "CountryOfResidence", "StreetName", "Area",
-                        "MakaniNumber", "BuildingNumber", "FlatVillaNumber", "CityEmirate", "POBox",
-                        "Country", "MobileNumber", "AlternativeNumber", "EmailAddress"
-                    ],
-                    "page_two": [
-                        "Employer", "Department", "Designation", "GrossMonthlyIncome",
-                        "NatureOfBusiness", "PercentageOfOwnership"
-                    ]
-                }
+                "supported_fields": NCB_KYC_FORM.supported_fields(),
             }
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,125 @@
+"""
+Extraction front end combining the Document AI client, result cache and
+request coalescing.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from src.services import tracing
+from src.services.document_ai_client import CallReport, DocumentAIClient
+from src.services.page_selection import select_kyc_pages
+from src.services.result_cache import ResultCache, document_cache_key, hash_document
+from src.services.single_flight import SingleFlight
+
+
+@dataclass
+class ExtractionResult:
+    """Parsed fields for one document and how they were obtained."""
+
+    fields: dict[str, Any]
+    served_from_cache: bool = False
+    coalesced: bool = False
+    # Document AI retries behind this result; zero when served from cache
+    retries: int = 0
+    retry_seconds: float = 0.0
+
+    @property
+    def pages_in_file(self) -> int | None:
+        return self.fields.get("page_selection", {}).get("pages_in_file")
+
+    @property
+    def pages_submitted(self) -> int | None:
+        return self.fields.get("page_selection", {}).get("pages_submitted")
+
+
+class ExtractionService:
+    """Cache-aware, coalescing entry point for KYC extraction.
+
+    Identical documents sent to the same processor version are answered from
+    the result cache when possible; concurrent duplicates that miss the
+    cache share a single Document AI call.
+    """
+
+    def __init__(
+        self,
+        client: DocumentAIClient,
+        cache: ResultCache | None = None,
+        select_pages: bool = True,
+    ):
+        self.client = client
+        self.metrics = client.metrics
+        self.cache = cache
+        self.select_pages = select_pages
+        self.single_flight = SingleFlight()
+
+    def cache_key(self, content_sha256: str) -> str:
+        """Key identifying a document for the configured extractor version."""
+        return document_cache_key(
+            content_sha256,
+            self.client.config.CUSTOM_EXTRACTOR_ID,
+            self.client.config.CUSTOM_EXTRACTOR_VERSION_ID,
+        )
+
+    async def extract(
+        self, file_content: bytes, content_sha256: str | None = None
+    ) -> ExtractionResult:
+        """
+        Extract and parse KYC fields for a document.
+
+        Args:
+            file_content: Document content as bytes
+            content_sha256: SHA-256 hex digest of the content, if already known
+
+        Returns:
+            ExtractionResult: Parsed fields with cache/coalescing flags
+        """
+        content_sha256 = content_sha256 or hash_document(file_content)
+        key = self.cache_key(content_sha256)
+
+        if self.cache is not None:
+            with self.metrics.stage("cache_lookup"):
+                cached = await self.cache.get(key)
+            if cached is not None:
+                logger.info("Serving extraction result from cache")
+                return ExtractionResult(cached, served_from_cache=True)
+
+        (fields, report), coalesced = await self.single_flight.do(
+            key, lambda: self._extract_and_store(key, file_content, content_sha256)
+        )
+        if coalesced:
+            logger.info("Joined in-flight extraction of an identical document")
+        return ExtractionResult(
+            fields,
+            coalesced=coalesced,
+            retries=report.retries,
+            retry_seconds=report.retry_seconds,
+        )
+
+    async def _extract_and_store(
+        self, key: str, file_content: bytes, content_sha256: str
+    ) -> tuple[dict[str, Any], CallReport]:
+        pages = None
+        if self.select_pages:
+            # PDF inspection is CPU-bound, keep it off the event loop
+            with tracing.span("page_selection"):
+                selection = await asyncio.to_thread(select_kyc_pages, file_content)
+            pages = selection.pages
+
+        report = CallReport()
+        document = await self.client.extract_kyc_information(
+            file_content, pages=pages, report=report, content_sha256=content_sha256
+        )
+        with self.metrics.stage("parse"):
+            fields = self.client.parse_extracted_fields(document)
+        if self.select_pages:
+            fields["page_selection"] = {
+                "pages_in_file": selection.total_pages,
+                "pages_submitted": selection.pages_submitted,
+            }
+        if self.cache is not None:
+            await self.cache.set(key, fields)
+        return fields, report
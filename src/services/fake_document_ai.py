@@ -0,0 +1,420 @@
+"""
+Local fake of the Document AI ``DocumentProcessorService``.
+
+Serves ``ProcessDocument`` with a canned ``Document`` and ``GetProcessor``
+with an enabled processor, so the API can be run, load tested and broken
+on purpose without credentials or network access. Latency follows a
+configurable distribution, with optional stalls; a configurable fraction
+of calls fails with a gRPC status instead. The request's field mask is
+applied like the real service does.
+
+Point the client at it through its endpoint override::
+
+    python -m src.services.fake_document_ai --port 50051 --latency lognormal:0.8,0.4
+    API_ENDPOINT=127.0.0.1:50051 INSECURE_CHANNEL=true uvicorn src.api.main:app
+"""
+
+import argparse
+import asyncio
+import contextlib
+import math
+import multiprocessing
+import random
+import socket
+from collections import Counter
+from dataclasses import dataclass, field
+
+import grpc
+from google.cloud.documentai_v1.types import (
+    Document,
+    GetProcessorRequest,
+    Processor,
+    ProcessRequest,
+    ProcessResponse,
+)
+from loguru import logger
+
+from src.core.schema import NCB_KYC_FORM
+
+SERVICE_NAME = "google.cloud.documentai.v1.DocumentProcessorService"
+
+# Page index of every field on the KYC form, in form order
+FIELD_PAGES = {field.name: page.index for page in NCB_KYC_FORM.pages for field in page.fields}
+KYC_FIELD_NAMES = tuple(FIELD_PAGES)
+
+# Values for the fields a filled-in form always has; others get placeholders
+FIELD_VALUES = {
+    "FirstName": "John",
+    "LastName": "Doe",
+    "DateOfBirth": "01/01/1990",
+    "PassportNumber": "N1234567",
+    "EmiratesIDNumber": "784-1990-1234567-1",
+    "MobileNumber": "+971 50 123 4567",
+    "EmailAddress": "john.doe@example.com",
+    "Employer": "ABC Company",
+    "Designation": "Engineer",
+    "GrossMonthlyIncome": "25000",
+}
+
+LATENCY_KINDS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """Seconds each call takes before it is answered.
+
+    ``fixed`` takes one parameter (seconds), ``uniform`` a low and high
+    bound, ``normal`` a mean and standard deviation (clamped at zero) and
+    ``lognormal`` a median and the sigma of the underlying normal, which
+    gives the long right tail real RPC latencies have.
+    """
+
+    kind: str = "fixed"
+    params: tuple[float, ...] = (0.1,)
+
+    def __post_init__(self):
+        expected = 1 if self.kind == "fixed" else 2
+        if self.kind not in LATENCY_KINDS:
+            raise ValueError(f"Unknown latency distribution {self.kind!r}, expected one of {LATENCY_KINDS}")
+        if len(self.params) != expected:
+            raise ValueError(f"{self.kind} latency takes {expected} parameter(s), got {len(self.params)}")
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "LatencyDistribution":
+        return cls("fixed", (seconds,))
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse ``"0.1"``, ``"fixed:0.1"``, ``"uniform:0.05,0.2"`` and the like."""
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        return cls(kind, tuple(float(value) for value in params.split(",")))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        median, sigma = self.params
+        return rng.lognormvariate(math.log(median), sigma)
+
+
+def parse_error_rates(spec: str) -> dict[str, float]:
+    """Parse ``"unavailable=0.05,resource_exhausted=0.01"`` into status code rates."""
+    rates: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip().lower()] = float(rate)
+    return rates
+
+
+@dataclass
+class FakeServerConfig:
+    """Behaviour of the fake server.
+
+    ``error_rates`` maps lower-case gRPC status code names (``unavailable``,
+    ``resource_exhausted``, ``deadline_exceeded``, ``internal``, ...) to the
+    fraction of calls failing with that code. Errors are returned after
+    the sampled latency, as a backend failing mid-call would.
+    """
+
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    # A fraction of calls stalls for ``stall_seconds`` instead of the sampled latency
+    stall_probability: float = 0.0
+    stall_seconds: float = 0.0
+    error_rates: dict[str, float] = field(default_factory=dict)
+    # Entities in the canned Document, cycling through the KYC form fields;
+    # the default fills in every field once
+    entity_count: int = len(KYC_FIELD_NAMES)
+    # Size of the parts of the Document a field mask normally drops
+    tokens_per_page: int = 600
+    image_bytes: int = 400_000
+    seed: int = 0
+
+    def __post_init__(self):
+        unknown = [name for name in self.error_rates if name.upper() not in grpc.StatusCode.__members__]
+        if unknown:
+            raise ValueError(f"Unknown gRPC status codes in error_rates: {unknown}")
+        if sum(self.error_rates.values()) > 1:
+            raise ValueError("error_rates add up to more than 1")
+
+
+@dataclass
+class FakeServerStats:
+    """Calls served, stalls and injected errors by status code."""
+
+    calls: int = 0
+    stalls: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+
+def _box(x: float, y: float) -> dict:
+    return {
+        "normalized_vertices": [
+            {"x": x, "y": y},
+            {"x": x + 0.2, "y": y},
+            {"x": x + 0.2, "y": y + 0.02},
+            {"x": x, "y": y + 0.02},
+        ]
+    }
+
+
+def build_document(
+    entity_count: int = len(KYC_FIELD_NAMES),
+    tokens_per_page: int = 600,
+    image_bytes: int = 400_000,
+    seed: int = 0,
+) -> Document:
+    """A two-page Document shaped like a real extractor response."""
+    rng = random.Random(seed)
+    text = " ".join(f"word{i}" for i in range(tokens_per_page * 2))
+    pages = []
+    for page_number in (1, 2):
+        tokens = [
+            {
+                "layout": {
+                    "text_anchor": {"text_segments": [{"start_index": i * 6, "end_index": i * 6 + 5}]},
+                    "confidence": 0.99,
+                    "bounding_poly": _box(rng.random() * 0.8, rng.random() * 0.9),
+                }
+            }
+            for i in range(tokens_per_page)
+        ]
+        pages.append(
+            {
+                "page_number": page_number,
+                "dimension": {"width": 1654, "height": 2339, "unit": "pixels"},
+                "image": {"content": rng.randbytes(image_bytes), "mime_type": "image/png"},
+                "layout": {"bounding_poly": _box(0, 0)},
+                "tokens": tokens,
+            }
+        )
+
+    entities = []
+    for i in range(entity_count):
+        name = KYC_FIELD_NAMES[i % len(KYC_FIELD_NAMES)]
+        entities.append(
+            {
+                "type_": name,
+                "mention_text": FIELD_VALUES.get(name, f"value {i}"),
+                "confidence": 0.9,
+                "page_anchor": {
+                    "page_refs": [
+                        {"page": FIELD_PAGES[name],
+                         "bounding_poly": _box(0.1, 0.05 * (i % 18))}
+                    ]
+                },
+            }
+        )
+    return Document(text=text, pages=pages, entities=entities, mime_type="application/pdf")
+
+
+def apply_field_mask(document: Document, paths: list[str]) -> Document:
+    """Keep only the masked top-level fields and ``pages.<field>`` subfields."""
+    if not paths:
+        return document
+
+    source = Document.pb(document)
+    masked = type(source)()
+    page_fields = [path.split(".", 1)[1] for path in paths if path.startswith("pages.")]
+    for path in paths:
+        if "." not in path:
+            masked_field = getattr(masked, path)
+            if hasattr(masked_field, "MergeFrom"):
+                masked_field.MergeFrom(getattr(source, path))
+            else:
+                setattr(masked, path, getattr(source, path))
+    if page_fields and "pages" not in paths:
+        for page in source.pages:
+            masked_page = masked.pages.add()
+            for name in page_fields:
+                value = getattr(page, name)
+                if hasattr(value, "CopyFrom"):
+                    getattr(masked_page, name).CopyFrom(value)
+                else:
+                    setattr(masked_page, name, value)
+    return Document.wrap(masked)
+
+
+class FakeDocumentAIServer:
+    """In-process fake server on a ``grpc.aio`` server.
+
+    ``config`` is read on every call, so a test can change error rates or
+    latency while load is running.
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None):
+        self.config = config or FakeServerConfig()
+        self.stats = FakeServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._document = build_document(
+            self.config.entity_count,
+            self.config.tokens_per_page,
+            self.config.image_bytes,
+            self.config.seed,
+        )
+        # Masked responses are the same for every call with the same mask
+        self._responses: dict[tuple[str, ...], bytes] = {}
+        self._server: grpc.aio.Server | None = None
+
+    def _response(self, paths: tuple[str, ...]) -> bytes:
+        response = self._responses.get(paths)
+        if response is None:
+            document = apply_field_mask(self._document, list(paths))
+            response = ProcessResponse.serialize(ProcessResponse(document=document))
+            self._responses[paths] = response
+        return response
+
+    def _draw_error(self) -> grpc.StatusCode | None:
+        draw = self._rng.random()
+        for name, rate in self.config.error_rates.items():
+            if draw < rate:
+                return grpc.StatusCode[name.upper()]
+            draw -= rate
+        return None
+
+    async def _process_document(self, request: ProcessRequest, context: grpc.aio.ServicerContext) -> bytes:
+        config = self.config
+        self.stats.calls += 1
+        if self._rng.random() < config.stall_probability:
+            self.stats.stalls += 1
+            delay = config.stall_seconds
+        else:
+            delay = config.latency.sample(self._rng)
+        error = self._draw_error()
+        await asyncio.sleep(delay)
+        if error is not None:
+            self.stats.errors[error.name.lower()] += 1
+            await context.abort(error, f"Injected {error.name} from the fake Document AI server")
+        return self._response(tuple(request.field_mask.paths))
+
+    async def _get_processor(self, request: GetProcessorRequest, context: grpc.aio.ServicerContext) -> Processor:
+        return Processor(
+            name=request.name,
+            type_="CUSTOM_EXTRACTION_PROCESSOR",
+            display_name="fake-document-ai",
+            state=Processor.State.ENABLED,
+        )
+
+    def _handler(self) -> grpc.GenericRpcHandler:
+        return grpc.method_handlers_generic_handler(
+            SERVICE_NAME,
+            {
+                "ProcessDocument": grpc.unary_unary_rpc_method_handler(
+                    self._process_document,
+                    request_deserializer=ProcessRequest.deserialize,
+                    # Responses are serialized once per field mask
+                    response_serializer=lambda response: response,
+                ),
+                "GetProcessor": grpc.unary_unary_rpc_method_handler(
+                    self._get_processor,
+                    request_deserializer=GetProcessorRequest.deserialize,
+                    response_serializer=Processor.serialize,
+                ),
+            },
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the ``host:port`` address; port 0 picks a free one."""
+        self._server = grpc.aio.server(options=[("grpc.max_concurrent_streams", 1024)])
+        self._server.add_generic_rpc_handlers((self._handler(),))
+        port = self._server.add_insecure_port(f"{host}:{port}")
+        await self._server.start()
+        return f"{host}:{port}"
+
+    async def wait_for_termination(self) -> None:
+        if self._server is not None:
+            await self._server.wait_for_termination()
+
+    async def stop(self, grace: float | None = None) -> None:
+        if self._server is not None:
+            await self._server.stop(grace)
+            self._server = None
+
+
+def _run(config: FakeServerConfig, host: str, port: int) -> None:
+    async def serve() -> None:
+        server = FakeDocumentAIServer(config)
+        await server.start(host, port)
+        await server.wait_for_termination()
+
+    asyncio.run(serve())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_server(config: FakeServerConfig | None = None) -> tuple[multiprocessing.Process, str]:
+    """
+    Start the fake server in a child process and return it with its address.
+
+    Start it before using gRPC in the calling process: a forked child
+    cannot use gRPC state inherited from its parent.
+    """
+    port = free_port()
+    process = multiprocessing.Process(
+        target=_run, args=(config or FakeServerConfig(), "127.0.0.1", port), daemon=True
+    )
+    process.start()
+
+    address = f"127.0.0.1:{port}"
+    channel = grpc.insecure_channel(address)
+    grpc.channel_ready_future(channel).result(timeout=10)
+    channel.close()
+    return process, address
+
+
+async def _serve_forever(config: FakeServerConfig, host: str, port: int) -> None:
+    server = FakeDocumentAIServer(config)
+    address = await server.start(host, port)
+    logger.info(f"Fake Document AI server listening on {address}")
+    try:
+        await server.wait_for_termination()
+    finally:
+        stats = server.stats
+        logger.info(f"Served {stats.calls} calls, {stats.stalls} stalls, errors {dict(stats.errors)}")
+        await server.stop(grace=1)
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Local fake of the Document AI ProcessDocument RPC")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument(
+        "--latency", type=LatencyDistribution.parse, default=LatencyDistribution(),
+        help='seconds per call: "0.1", "uniform:0.05,0.2", "normal:0.5,0.1", "lognormal:0.8,0.4"',
+    )
+    parser.add_argument("--stall-probability", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=0.0)
+    parser.add_argument(
+        "--errors", type=parse_error_rates, default={},
+        help='fraction of calls failing per status code, e.g. "unavailable=0.05,resource_exhausted=0.01"',
+    )
+    parser.add_argument("--entities", type=int, default=len(KYC_FIELD_NAMES))
+    parser.add_argument("--tokens-per-page", type=int, default=600)
+    parser.add_argument("--image-bytes", type=int, default=400_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency=args.latency,
+        stall_probability=args.stall_probability,
+        stall_seconds=args.stall_seconds,
+        error_rates=args.errors,
+        entity_count=args.entities,
+        tokens_per_page=args.tokens_per_page,
+        image_bytes=args.image_bytes,
+        seed=args.seed,
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve_forever(config, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Bounding-box geometry for Document AI entities.
+
+Boxes are computed for every page ref of every entity in one loop over the
+raw protobuf messages, and can be scaled to pixel coordinates using each
+page's ``dimension``. Reading vertex attributes and building the output
+dicts dominate the cost; a NumPy reduction over packed vertices measured
+slower than this loop (see ``benchmarks/bench_geometry.py``).
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+PageSize = tuple[float, float]
+
+
+@dataclass
+class EntityGeometry:
+    """Boxes of one entity: the first page ref's box and every region."""
+
+    bounding_box: dict[str, float] | None = None
+    regions: list[dict[str, Any]] = field(default_factory=list)
+
+
+def page_dimensions(document: Any) -> list[PageSize]:
+    """
+    Return the width and height of every page.
+
+    Pages without a dimension get zeros, which disables pixel conversion for
+    boxes on them.
+    """
+    return [(page.dimension.width, page.dimension.height) for page in document.pages]
+
+
+def entity_geometry(
+    entities: Sequence[Any], dimensions: Sequence[PageSize] | None = None
+) -> list[EntityGeometry]:
+    """
+    Compute bounding boxes for every page ref of every entity.
+
+    Args:
+        entities: Raw protobuf ``Document.Entity`` messages
+        dimensions: Page sizes from ``page_dimensions``; when given, regions
+            on pages with a known size also carry a ``pixels`` box
+
+    Returns:
+        One ``EntityGeometry`` per entity, in the same order
+    """
+    page_count = len(dimensions) if dimensions is not None else 0
+    geometry = []
+    for entity in entities:
+        entry = EntityGeometry()
+        for ref_index, page_ref in enumerate(entity.page_anchor.page_refs):
+            vertices = page_ref.bounding_poly.normalized_vertices
+            if not vertices:
+                continue
+            # One pass reading each vertex once; attribute reads are the main cost
+            first = vertices[0]
+            min_x = max_x = first.x
+            min_y = max_y = first.y
+            for vertex in vertices[1:]:
+                x = vertex.x
+                y = vertex.y
+                if x < min_x:
+                    min_x = x
+                elif x > max_x:
+                    max_x = x
+                if y < min_y:
+                    min_y = y
+                elif y > max_y:
+                    max_y = y
+            width = max_x - min_x
+            height = max_y - min_y
+
+            page = page_ref.page
+            pixels = None
+            if 0 <= page < page_count:
+                page_width, page_height = dimensions[page]
+                if page_width > 0 and page_height > 0:
+                    pixels = {
+                        "x": min_x * page_width,
+                        "y": min_y * page_height,
+                        "width": width * page_width,
+                        "height": height * page_height,
+                    }
+
+            if ref_index == 0:
+                entry.bounding_box = {"x": min_x, "y": min_y, "width": width, "height": height}
+            entry.regions.append(
+                {
+                    "page": page,
+                    "x": min_x,
+                    "y": min_y,
+                    "width": width,
+                    "height": height,
+                    "pixels": pixels,
+                }
+            )
+        geometry.append(entry)
+    return geometry
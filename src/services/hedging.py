@@ -0,0 +1,159 @@
+"""
+Hedged Document AI calls.
+
+When a call has not returned by a high percentile of recent latency, an
+identical backup call is started; whichever succeeds first is used and the
+other is cancelled. A budget keeps backup calls to a small fraction of all
+calls so hedging cannot double the load on a struggling backend.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    """Counters for hedged calls."""
+
+    calls: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    budget_denied: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.calls if self.calls else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.hedge_wins / self.hedges if self.hedges else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {**asdict(self), "hedge_rate": self.hedge_rate, "win_rate": self.win_rate}
+
+
+class LatencyWindow:
+    """The latencies of the most recent successful calls."""
+
+    def __init__(self, size: int = 500):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> float:
+        """Nearest-rank percentile of the window; the window must not be empty."""
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class Hedger:
+    """Race a backup call against a slow primary call.
+
+    The backup starts once the primary has run for the ``percentile`` of
+    recent latency (never sooner than ``min_delay_seconds``, and not at all
+    until ``min_samples`` latencies are known). Each call earns
+    ``budget_ratio`` of a backup call, up to ``max_budget``, and each backup
+    spends one, so no more than ``budget_ratio`` of calls are hedged over
+    time.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget_ratio: float = 0.05,
+        min_samples: int = 20,
+        min_delay_seconds: float = 0.05,
+        window_size: int = 500,
+        max_budget: float = 10,
+    ):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay_seconds = min_delay_seconds
+        self.max_budget = max_budget
+        self.latencies = LatencyWindow(window_size)
+        self.stats = HedgeStats()
+        self._budget = 0.0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while latency is unknown."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay_seconds, self.latencies.percentile(self.percentile))
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[T]],
+        backup: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Run ``primary``, hedging with ``backup`` if it is slow.
+
+        Returns:
+            The result of whichever call succeeded first
+
+        Raises:
+            Exception: The primary's error when no call succeeds
+        """
+        self.stats.calls += 1
+        self._budget = min(self.max_budget, self._budget + self.budget_ratio)
+        delay = self.hedge_delay()
+
+        start = time.monotonic()
+        primary_task = asyncio.ensure_future(primary())
+        tasks = [primary_task]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if delay is None or primary_task.done():
+                return await self._finish(primary_task, start)
+            if self._budget < 1:
+                self.stats.budget_denied += 1
+                return await self._finish(primary_task, start)
+
+            self._budget -= 1
+            self.stats.hedges += 1
+            logger.info(f"Hedging Document AI call after {delay:.2f}s")
+            backup_start = time.monotonic()
+            backup_task = asyncio.ensure_future(backup())
+            tasks.append(backup_task)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup_task:
+                            self.stats.hedge_wins += 1
+                            self.latencies.record(time.monotonic() - backup_start)
+                        else:
+                            self.latencies.record(time.monotonic() - start)
+                        return task.result()
+            # Both failed; the primary's error is the one to report
+            raise primary_task.exception()
+        finally:
+            # Cancel the loser, or both calls if we were cancelled ourselves
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    async def _finish(self, task: "asyncio.Future[T]", start: float) -> T:
+        result = await task
+        self.latencies.record(time.monotonic() - start)
+        return result
@@ -0,0 +1,244 @@
+"""
+In-process queue of asynchronous document processing jobs.
+"""
+
+import asyncio
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from loguru import logger
+
+
+class JobStatus(StrEnum):
+    """Lifecycle states of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A submitted document and, once processed, its outcome."""
+
+    job_id: str
+    filename: str
+    extractor_mode: str
+    content: bytes | None
+    content_sha256: str | None = None
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: dict[str, Any] | None = None
+    # Runs of the handler so far, including those that were put back in the queue
+    attempts: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its depth or size limit."""
+
+
+JobHandler = Callable[[Job], Awaitable[Any]]
+
+
+class JobQueue:
+    """Bounded job queue drained by a pool of asyncio workers.
+
+    The queue holds at most ``max_depth`` waiting jobs, and at most
+    ``max_bytes`` of uploads across jobs that have not run yet, counting
+    jobs waiting to retry. An upload is released once its job has run.
+
+    Jobs live in memory for the lifetime of the process, or until they are
+    older than ``max_job_age_seconds``. A job that waits in the queue longer
+    than that fails as expired instead of being processed.
+
+    A handler failing with one of ``retry_on`` (the backend is at capacity)
+    puts the job back in the queue after an exponential backoff with full
+    jitter, and never sooner than the error's ``retry_after_seconds``. Jobs
+    are retried like this until the next attempt would start past their
+    maximum age.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        max_depth: int = 100,
+        max_bytes: int = 256 * 1024 * 1024,
+        workers: int = 4,
+        max_job_age_seconds: float = 3600,
+        retry_on: tuple[type[Exception], ...] = (),
+        retry_initial_backoff_seconds: float = 1.0,
+        retry_max_backoff_seconds: float = 60.0,
+    ):
+        self.handler = handler
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.max_job_age_seconds = max_job_age_seconds
+        self.retry_on = retry_on
+        self.retry_initial_backoff_seconds = retry_initial_backoff_seconds
+        self.retry_max_backoff_seconds = retry_max_backoff_seconds
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_depth)
+        self._jobs: dict[str, Job] = {}
+        # Upload bytes held by jobs that have not run yet
+        self._held_bytes = 0
+        self._worker_tasks: list[asyncio.Task] = []
+        # Jobs sleeping off a backoff before going back in the queue
+        self._retry_tasks: set[asyncio.Task] = set()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def held_bytes(self) -> int:
+        return self._held_bytes
+
+    def start(self) -> None:
+        """Start the worker tasks on the running loop."""
+        for i in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(), name=f"job-worker-{i}"))
+        logger.info(
+            f"Started {self.workers} job workers "
+            f"(max queue depth {self.max_depth}, max {self.max_bytes} bytes of uploads)"
+        )
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued jobs and jobs waiting to retry are abandoned."""
+        tasks = [*self._worker_tasks, *self._retry_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+        self._retry_tasks.clear()
+        logger.info("Stopped job workers")
+
+    def submit(
+        self,
+        filename: str,
+        extractor_mode: str,
+        content: bytes,
+        content_sha256: str | None = None,
+    ) -> Job:
+        """
+        Enqueue a document for processing.
+
+        Raises:
+            QueueFullError: If the queue is at its depth limit, or the upload
+                would take the held uploads past ``max_bytes``
+        """
+        self._purge_expired()
+        if self._held_bytes + len(content) > self.max_bytes:
+            raise QueueFullError(f"Job queue is full ({self.max_bytes} bytes of uploads held)")
+        job = Job(
+            job_id=str(uuid.uuid4()),
+            filename=filename,
+            extractor_mode=extractor_mode,
+            content=content,
+            content_sha256=content_sha256,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Job queue is full ({self.max_depth} jobs)") from None
+        self._jobs[job.job_id] = job
+        self._held_bytes += len(content)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a job by ID, or None if unknown or expired."""
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def _is_expired(self, job: Job, now: float) -> bool:
+        return now - job.created_at > self.max_job_age_seconds
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.done and self._is_expired(job, now)
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.started_at = time.time()
+        if self._is_expired(job, job.started_at):
+            job.status = JobStatus.FAILED
+            job.error = {
+                "code": "JOB_EXPIRED",
+                "message": "Job waited in the queue longer than the maximum job age",
+            }
+        else:
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            try:
+                job.result = await self.handler(job)
+                job.status = JobStatus.SUCCEEDED
+            except self.retry_on as e:
+                delay = self._retry_delay(job, e)
+                if not self._is_expired(job, time.time() + delay):
+                    logger.info(f"Job {job.job_id} deferred for {delay:.1f}s: {e}")
+                    self._retry_later(job, delay)
+                    return
+                job.status = JobStatus.FAILED
+                job.error = {
+                    "code": "JOB_EXPIRED",
+                    "message": "Document AI stayed at capacity for the maximum job age",
+                    "details": {"error_type": type(e).__name__, "error_message": str(e)},
+                }
+            except Exception as e:
+                logger.exception(f"Job {job.job_id} failed")
+                job.status = JobStatus.FAILED
+                job.error = {
+                    "code": "PROCESSING_ERROR",
+                    "message": "Failed to process document",
+                    "details": {"error_type": type(e).__name__, "error_message": str(e)},
+                }
+
+        job.finished_at = time.time()
+        # The upload is no longer needed once the job has run
+        if job.content is not None:
+            self._held_bytes -= len(job.content)
+        job.content = None
+
+    def _retry_delay(self, job: Job, error: Exception) -> float:
+        """Full-jitter exponential backoff, at least the error's own retry-after."""
+        ceiling = min(
+            self.retry_max_backoff_seconds,
+            self.retry_initial_backoff_seconds * 2 ** (job.attempts - 1),
+        )
+        return max(getattr(error, "retry_after_seconds", 0.0), random.uniform(0, ceiling))
+
+    def _retry_later(self, job: Job, delay: float) -> None:
+        job.status = JobStatus.QUEUED
+        task = asyncio.create_task(self._requeue(job, delay), name=f"job-retry-{job.job_id}")
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue(self, job: Job, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Already accepted, so it waits for room rather than being refused
+        await self._queue.put(job)
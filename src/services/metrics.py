@@ -0,0 +1,210 @@
+"""
+Prometheus metrics for the API.
+
+Components keep plain counters on their hot paths; collectors here read
+them when ``/metrics`` is scraped, so an unscraped metric costs nothing.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from src.services.admission import AdmissionController
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers
+from src.services.document_ai_client import DocumentAIClient
+from src.services.extraction import ExtractionService
+from src.services.hedging import Hedger
+from src.services.result_cache import ResultCache
+from src.services.single_flight import SingleFlight
+
+
+class AdmissionCollector(Collector):
+    """Bucket state, queue depth and decisions of ``AdmissionController``s."""
+
+    def __init__(self, controllers: Iterable[AdmissionController]):
+        self.controllers = list(controllers)
+
+    def collect(self) -> Iterator[Metric]:
+        tokens = GaugeMetricFamily(
+            "kyc_admission_tokens",
+            "Tokens available in the bucket; negative while calls are queued",
+            labels=["bucket"],
+        )
+        queue_depth = GaugeMetricFamily(
+            "kyc_admission_queue_depth", "Calls waiting for a token", labels=["bucket"]
+        )
+        rate = GaugeMetricFamily(
+            "kyc_admission_rate_per_second", "Configured token refill rate", labels=["bucket"]
+        )
+        requests = CounterMetricFamily(
+            "kyc_admission_requests", "Admission decisions", labels=["bucket", "outcome"]
+        )
+        queued = CounterMetricFamily(
+            "kyc_admission_queued", "Admitted calls that had to wait for a token", labels=["bucket"]
+        )
+        wait_seconds = CounterMetricFamily(
+            "kyc_admission_wait_seconds", "Time admitted calls spent queued", labels=["bucket"]
+        )
+
+        buckets = [item for controller in self.controllers for item in controller.buckets.items()]
+        for name, bucket in buckets:
+            stats = bucket.stats
+            tokens.add_metric([name], bucket.tokens)
+            queue_depth.add_metric([name], bucket.waiting)
+            rate.add_metric([name], bucket.rate_per_second)
+            requests.add_metric([name, "admitted"], stats.admitted)
+            requests.add_metric([name, "rejected"], stats.rejected)
+            queued.add_metric([name], stats.queued)
+            wait_seconds.add_metric([name], stats.wait_seconds_total)
+
+        yield from (tokens, queue_depth, rate, requests, queued, wait_seconds)
+
+
+class HedgeCollector(Collector):
+    """Hedged call counts and the derived hedge and win rates."""
+
+    def __init__(self, hedger: Hedger):
+        self.hedger = hedger
+
+    def collect(self) -> Iterator[Metric]:
+        stats = self.hedger.stats
+        calls = CounterMetricFamily("kyc_hedge_calls", "Calls eligible for hedging")
+        calls.add_metric([], stats.calls)
+        hedges = CounterMetricFamily("kyc_hedge_hedges", "Backup calls fired")
+        hedges.add_metric([], stats.hedges)
+        wins = CounterMetricFamily("kyc_hedge_wins", "Backup calls that finished first")
+        wins.add_metric([], stats.hedge_wins)
+        denied = CounterMetricFamily("kyc_hedge_budget_denied", "Hedges skipped for lack of budget")
+        denied.add_metric([], stats.budget_denied)
+        hedge_rate = GaugeMetricFamily("kyc_hedge_rate", "Backup calls per call", value=stats.hedge_rate)
+        win_rate = GaugeMetricFamily("kyc_hedge_win_rate", "Backup wins per backup call", value=stats.win_rate)
+        delay = GaugeMetricFamily(
+            "kyc_hedge_delay_seconds",
+            "Current hedge delay; NaN until enough latencies are known",
+            value=self.hedger.hedge_delay() or float("nan"),
+        )
+        yield from (calls, hedges, wins, denied, hedge_rate, win_rate, delay)
+
+
+class CircuitBreakerCollector(Collector):
+    """State and call outcomes of every circuit breaker."""
+
+    def __init__(self, registries: Iterable[CircuitBreakers]):
+        self.registries = list(registries)
+
+    def collect(self) -> Iterator[Metric]:
+        state = GaugeMetricFamily(
+            "kyc_circuit_state", "1 for the breaker's current state", labels=["breaker", "state"]
+        )
+        calls = CounterMetricFamily(
+            "kyc_circuit_calls", "Calls through the breaker", labels=["breaker", "outcome"]
+        )
+        slow = CounterMetricFamily(
+            "kyc_circuit_slow_calls", "Successful calls slower than the slow-call limit", labels=["breaker"]
+        )
+        rejected = CounterMetricFamily(
+            "kyc_circuit_rejected", "Calls failed fast while open", labels=["breaker"]
+        )
+        opened = CounterMetricFamily("kyc_circuit_opened", "Times the breaker opened", labels=["breaker"])
+
+        breakers = [item for registry in self.registries for item in registry.breakers.items()]
+        for name, breaker in breakers:
+            stats = breaker.stats
+            current = breaker.state
+            for candidate in (CLOSED, OPEN, HALF_OPEN):
+                state.add_metric([name, candidate], float(current == candidate))
+            calls.add_metric([name, "success"], stats.successes)
+            calls.add_metric([name, "failure"], stats.failures)
+            slow.add_metric([name], stats.slow_calls)
+            rejected.add_metric([name], stats.rejected)
+            opened.add_metric([name], stats.opened)
+
+        yield from (state, calls, slow, rejected, opened)
+
+
+class QueueDepthCollector(Collector):
+    """Document AI calls waiting for an executor thread or in-flight slot."""
+
+    def __init__(self, client: DocumentAIClient):
+        self.client = client
+
+    def collect(self) -> Iterator[Metric]:
+        yield GaugeMetricFamily(
+            "kyc_executor_queue_depth",
+            "Document AI calls waiting for an executor thread or in-flight slot",
+            value=self.client.queue_depth,
+        )
+
+
+class SingleFlightCollector(Collector):
+    """Extractions that ran versus those that joined an identical one in flight."""
+
+    def __init__(self, single_flight: SingleFlight):
+        self.single_flight = single_flight
+
+    def collect(self) -> Iterator[Metric]:
+        stats = self.single_flight.stats
+        calls = CounterMetricFamily(
+            "kyc_single_flight_calls", "Extractions by whether they ran or joined one", labels=["role"]
+        )
+        calls.add_metric(["leader"], stats.leaders)
+        calls.add_metric(["coalesced"], stats.coalesced)
+        in_flight = GaugeMetricFamily(
+            "kyc_single_flight_in_flight",
+            "Distinct extractions in flight",
+            value=self.single_flight.in_flight(),
+        )
+        yield from (calls, in_flight)
+
+
+class ResultCacheCollector(Collector):
+    """Lookups, evictions and errors of the extraction result cache."""
+
+    def __init__(self, cache: ResultCache):
+        self.cache = cache
+
+    def collect(self) -> Iterator[Metric]:
+        stats = self.cache.stats
+        backend = self.cache.backend
+        lookups = CounterMetricFamily(
+            "kyc_result_cache_lookups", "Cache lookups by result", labels=["backend", "result"]
+        )
+        lookups.add_metric([backend, "hit"], stats.hits)
+        lookups.add_metric([backend, "miss"], stats.misses)
+        evictions = CounterMetricFamily(
+            "kyc_result_cache_evictions", "Entries dropped to stay within the size limits", labels=["backend"]
+        )
+        evictions.add_metric([backend], stats.evictions)
+        expirations = CounterMetricFamily(
+            "kyc_result_cache_expirations", "Entries found past their TTL", labels=["backend"]
+        )
+        expirations.add_metric([backend], stats.expirations)
+        errors = CounterMetricFamily(
+            "kyc_result_cache_errors", "Backend failures and unreadable entries", labels=["backend"]
+        )
+        errors.add_metric([backend], stats.errors)
+        yield from (lookups, evictions, expirations, errors)
+
+
+def create_metrics_registry(
+    client: DocumentAIClient, extraction: ExtractionService | None = None
+) -> CollectorRegistry:
+    """Build the registry served by ``/metrics`` for one application."""
+    registry = CollectorRegistry()
+    registry.register(client.metrics)
+    registry.register(QueueDepthCollector(client))
+    controllers = [c.admission for c in (client, client.alternate) if c is not None and c.admission]
+    if controllers:
+        registry.register(AdmissionCollector(controllers))
+    breakers = [c.breakers for c in (client, client.alternate) if c is not None and c.breakers]
+    if breakers:
+        registry.register(CircuitBreakerCollector(breakers))
+    if client.hedger is not None:
+        registry.register(HedgeCollector(client.hedger))
+    if extraction is not None:
+        registry.register(SingleFlightCollector(extraction.single_flight))
+        if extraction.cache is not None:
+            registry.register(ResultCacheCollector(extraction.cache))
+    return registry
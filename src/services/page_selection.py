@@ -0,0 +1,140 @@
+"""
+Local selection of the pages of a PDF that hold the KYC form.
+
+Onboarding packets often contain many pages besides the two KYC form pages.
+Sending only those pages to Document AI cuts latency and cost, which both
+scale with page count.
+"""
+
+import io
+from dataclasses import dataclass
+
+from loguru import logger
+from pypdf import PdfReader
+
+from src.core.validation import validate_pages
+
+# Labels printed on each page of the NCB KYC form, matched case-insensitively
+PAGE_ONE_MARKERS = (
+    "cif",
+    "date of birth",
+    "city of birth",
+    "marital status",
+    "passport",
+    "emirates id",
+    "makani",
+    "country of residence",
+    "mobile",
+    "p.o. box",
+)
+PAGE_TWO_MARKERS = (
+    "employer",
+    "department",
+    "designation",
+    "gross monthly income",
+    "nature of business",
+    "percentage of ownership",
+)
+
+# Share of a page's labels that must be found for it to count as that form page;
+# other documents in a packet (salary certificates, statements) share a few labels
+MIN_MARKER_SHARE = 0.5
+
+
+@dataclass
+class PageSelection:
+    """Pages chosen for submission and how they were chosen."""
+
+    total_pages: int | None
+    pages: list[int] | None  # 0-based; None submits the whole document
+    strategy: str
+
+    @property
+    def pages_submitted(self) -> int | None:
+        return len(self.pages) if self.pages is not None else self.total_pages
+
+
+def _marker_hits(text: str, markers: tuple[str, ...]) -> int:
+    return sum(1 for marker in markers if marker in text)
+
+
+def _is_match(hits: int, markers: tuple[str, ...]) -> bool:
+    return hits >= MIN_MARKER_SHARE * len(markers)
+
+
+def _form_start(texts: list[str]) -> int | None:
+    """
+    Index of the form's page one, where page two follows right after.
+
+    Among several candidates the one with the most labels on both pages
+    wins, the earliest on a tie.
+    """
+    page_one = [_marker_hits(text, PAGE_ONE_MARKERS) for text in texts]
+    page_two = [_marker_hits(text, PAGE_TWO_MARKERS) for text in texts]
+    candidates = [
+        index
+        for index in range(len(texts) - 1)
+        if _is_match(page_one[index], PAGE_ONE_MARKERS)
+        and _is_match(page_two[index + 1], PAGE_TWO_MARKERS)
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda index: page_one[index] + page_two[index + 1])
+
+
+def select_kyc_pages(
+    file_content: bytes, mime_type: str = "application/pdf", max_form_pages: int = 2
+) -> PageSelection:
+    """
+    Pick the pages of a document to send to Document AI.
+
+    Documents with at most ``max_form_pages`` pages are sent whole. Longer
+    PDFs are searched for the form's printed labels in their text layer,
+    and only a page one followed by a page two, each carrying at least
+    ``MIN_MARKER_SHARE`` of its labels, is sent. Scanned PDFs without a
+    text layer, or PDFs where the two form pages are not both found, are
+    sent whole, so no form page is ever left out.
+
+    Args:
+        file_content: Document content as bytes
+        mime_type: MIME type of the document
+        max_form_pages: Number of pages in the KYC form
+
+    Returns:
+        PageSelection: The pages to submit
+
+    Raises:
+        HTTPException: If the selected pages fail ``validate_pages``
+    """
+    if mime_type != "application/pdf":
+        return PageSelection(total_pages=None, pages=None, strategy="not-pdf")
+
+    try:
+        reader = PdfReader(io.BytesIO(file_content))
+        total_pages = len(reader.pages)
+    except Exception as e:
+        logger.warning(f"Could not inspect PDF locally, sending whole document: {e}")
+        return PageSelection(total_pages=None, pages=None, strategy="unreadable")
+
+    if total_pages <= max_form_pages:
+        return PageSelection(total_pages=total_pages, pages=None, strategy="all")
+
+    texts = []
+    for page in reader.pages:
+        try:
+            texts.append((page.extract_text() or "").lower())
+        except Exception:
+            texts.append("")
+
+    if not any(texts):
+        logger.info(f"No text layer in {total_pages}-page PDF, sending whole document")
+        return PageSelection(total_pages=total_pages, pages=None, strategy="no-text")
+
+    start = _form_start(texts)
+    if start is None:
+        logger.info(f"KYC form pages not found in {total_pages}-page PDF, sending whole document")
+        return PageSelection(total_pages=total_pages, pages=None, strategy="no-match")
+
+    pages = validate_pages([start, start + 1], total_pages)
+    logger.info(f"Selected pages {pages} of {total_pages} for extraction")
+    return PageSelection(total_pages=total_pages, pages=pages, strategy="markers")
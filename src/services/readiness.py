@@ -0,0 +1,115 @@
+"""
+Background probing of the services the API depends on.
+
+Readiness requests are answered from the result of the last probe round
+instead of calling Document AI or Redis on every orchestrator poll.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+
+DependencyCheck = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class ProbeCheck:
+    """A dependency check; only required checks gate readiness."""
+
+    name: str
+    check: DependencyCheck
+    required: bool = True
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of the most recent run of one check."""
+
+    ok: bool
+    required: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+
+class ReadinessMonitor:
+    """Run dependency checks every ``interval_seconds`` and keep the results.
+
+    The first round starts with the monitor; until it completes the service
+    reports not ready.
+    """
+
+    def __init__(
+        self,
+        checks: list[ProbeCheck],
+        interval_seconds: float = 15,
+        timeout_seconds: float = 5,
+    ):
+        self.checks = checks
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.results: dict[str, ProbeResult] = {}
+        self.last_probe_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        if self.last_probe_at is None:
+            return False
+        return all(result.ok for result in self.results.values() if result.required)
+
+    def start(self) -> None:
+        """Start probing in the background on the running loop."""
+        self._task = asyncio.create_task(self._run(), name="readiness-probe")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def probe(self) -> None:
+        """Run every check once, concurrently, and record the results."""
+        results = await asyncio.gather(*(self._probe_one(check) for check in self.checks))
+        self.results = {check.name: result for check, result in zip(self.checks, results, strict=True)}
+        self.last_probe_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """The cached readiness report served by the readiness endpoint."""
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "checked_at": self.last_probe_at,
+            "checks": {name: asdict(result) for name, result in self.results.items()},
+        }
+
+    async def _probe_one(self, check: ProbeCheck) -> ProbeResult:
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(check.check(), timeout=self.timeout_seconds)
+        except TimeoutError:
+            error = f"Timed out after {self.timeout_seconds}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is not None:
+            logger.warning(f"Readiness check {check.name} failed: {error}")
+        return ProbeResult(
+            ok=error is None,
+            required=check.required,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            checked_at=time.time(),
+            error=error,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception:
+                logger.exception("Readiness probe round failed")
+            await asyncio.sleep(self.interval_seconds)
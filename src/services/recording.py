@@ -0,0 +1,170 @@
+"""
+Recorded Document AI responses for offline replay.
+
+A recording is the serialized ``Document`` of one response, gzip-compressed
+and with personal data scrubbed, stored as ``<sha256 of the input>.pb.gz``
+with a ``<sha256>.json`` sidecar describing where it came from. Recordings
+keep the shape of real responses (entity counts, lengths, confidences,
+geometry) for parser and response benchmarks without keeping the data.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from google.cloud.documentai_v1.types import Document
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message
+
+RECORDING_SUFFIX = ".pb.gz"
+
+
+class RecordingNotFoundError(LookupError):
+    """No recording exists for a document."""
+
+
+def scrub_text(text: str) -> str:
+    """Replace letters with ``x``/``X`` and digits with ``0``, keeping length and layout."""
+    return "".join(
+        "0" if char.isdigit() else ("X" if char.isupper() else "x") if char.isalpha() else char
+        for char in text
+    )
+
+
+_DOCUMENT = "google.cloud.documentai.v1.Document"
+_NORMALIZED_VALUE = f"{_DOCUMENT}.Entity.NormalizedValue"
+
+# String fields that only name types, units, fonts and IDs, never document
+# content. Every other string is scrubbed and every bytes field dropped, so
+# fields added to Document later are scrubbed until they are listed here.
+SAFE_TEXT_FIELDS = frozenset(
+    f"{_DOCUMENT}.{name}"
+    for name in (
+        "mime_type",
+        "Entity.type_",
+        "Entity.id",
+        "Entity.mention_id",
+        "EntityRelation.subject_id",
+        "EntityRelation.object_id",
+        "EntityRelation.relation",
+        "PageAnchor.PageRef.layout_id",
+        "Page.Image.mime_type",
+        "Page.Dimension.unit",
+        "Page.DetectedLanguage.language_code",
+        "Page.Token.StyleInfo.font_type",
+        "Page.VisualElement.type_",
+        "Page.FormField.value_type",
+        "Page.ImageQualityScores.DetectedDefect.type_",
+        "Style.font_weight",
+        "Style.text_style",
+        "Style.text_decoration",
+        "Style.FontSize.unit",
+        "Style.font_family",
+    )
+)
+
+
+def _scrub_message(message) -> None:
+    """Scrub a raw protobuf message in place, recursing into sub-messages."""
+    if message.DESCRIPTOR.full_name == _NORMALIZED_VALUE:
+        # Structured values (dates, money, addresses) are dropped; the text stays scrubbed
+        text = message.text
+        message.Clear()
+        message.text = scrub_text(text)
+        return
+    for field, value in message.ListFields():
+        if field.type == FieldDescriptor.TYPE_MESSAGE:
+            for item in [value] if isinstance(value, Message) else value:
+                _scrub_message(item)
+        elif field.type == FieldDescriptor.TYPE_BYTES:
+            message.ClearField(field.name)
+        elif field.type == FieldDescriptor.TYPE_STRING and field.full_name not in SAFE_TEXT_FIELDS:
+            if isinstance(value, str):
+                setattr(message, field.name, scrub_text(value))
+            else:
+                value[:] = [scrub_text(item) for item in value]
+
+
+def scrub_document(document: Document) -> Document:
+    """
+    A copy of ``document`` without personal data.
+
+    Every string field outside ``SAFE_TEXT_FIELDS`` (the document text, text
+    anchor contents, entity and form field values, corrections, revisions)
+    is scrubbed in place of each character, so text anchors and value
+    lengths stay valid. Bytes fields such as page images and inline content
+    are dropped, as are the structured parts of normalized values; numbers,
+    enums and geometry are kept.
+    """
+    scrubbed = type(Document.pb(document))()
+    scrubbed.CopyFrom(Document.pb(document))
+    _scrub_message(scrubbed)
+    return Document.wrap(scrubbed)
+
+
+class ResponseRecorder:
+    """Stores and loads recordings in one directory."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+
+    def path(self, content_sha256: str) -> Path:
+        return self.directory / f"{content_sha256}{RECORDING_SUFFIX}"
+
+    def save(
+        self, content_sha256: str, document: Document, metadata: dict[str, Any] | None = None
+    ) -> Path:
+        """Scrub, compress and write ``document`` with its metadata sidecar."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = gzip.compress(Document.serialize(scrub_document(document)), mtime=0)
+        sidecar = {
+            "content_sha256": content_sha256,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "scrubbed": True,
+            **(metadata or {}),
+        }
+        path = self.path(content_sha256)
+        self._write(path, payload)
+        self._write(path.with_name(f"{content_sha256}.json"), (json.dumps(sidecar, indent=2) + "\n").encode())
+        return path
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Readers never see a partly written file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".recording-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # mkstemp creates owner-only files; recordings are shared like any fixture
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self, content_sha256: str) -> Document:
+        """
+        The recorded Document for an input.
+
+        Raises:
+            RecordingNotFoundError: If the input was never recorded
+        """
+        path = self.path(content_sha256)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise RecordingNotFoundError(f"No recorded response for document {content_sha256}") from None
+        return Document.deserialize(gzip.decompress(data))
+
+    def metadata(self, content_sha256: str) -> dict[str, Any]:
+        path = self.directory / f"{content_sha256}.json"
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def recordings(self) -> Iterator[str]:
+        """Input hashes of all recordings, in name order."""
+        for path in sorted(self.directory.glob(f"*{RECORDING_SUFFIX}")):
+            yield path.name[: -len(RECORDING_SUFFIX)]
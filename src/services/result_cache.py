@@ -0,0 +1,302 @@
+"""
+Caches of parsed Document AI extraction results.
+
+Two backends share one async interface: an in-process LRU/TTL cache and a
+Redis cache that lets several API replicas reuse each other's results.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+
+from src.core.config import Settings
+from src.core.schema import NCB_KYC_FORM
+
+
+def document_cache_key(
+    content_sha256: str, processor_id: str, version_id: str | None = None
+) -> str:
+    """Build a cache key from the document hash and the processor that parses it."""
+    return f"{content_sha256}:{processor_id}:{version_id or 'default'}"
+
+
+def hash_document(file_content: bytes) -> str:
+    """Return the SHA-256 hex digest of a document."""
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def serialize_result(value: dict[str, Any]) -> bytes:
+    """Encode a parsed result as compressed compact JSON."""
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_result(payload: bytes) -> dict[str, Any]:
+    """
+    Decode a value produced by ``serialize_result``.
+
+    Raises:
+        ValueError: If the payload is corrupt or not a parsed result of the
+            current form schema
+    """
+    try:
+        value = json.loads(zlib.decompress(payload))
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Corrupt cached result: {e}") from e
+    if not isinstance(value, dict) or not all(
+        isinstance(value.get(page_key), dict) for page_key in NCB_KYC_FORM.page_keys
+    ):
+        raise ValueError("Cached result does not match the form schema")
+    return value
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ResultCache(ABC):
+    """Interface shared by the result cache backends.
+
+    Values are the dictionaries returned by
+    ``DocumentAIClient.parse_extracted_fields``. Backends never raise on
+    lookup or store failures; a broken cache behaves like an empty one.
+    """
+
+    backend: str
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        return (await self.get_many([key]))[key]
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store ``value`` under ``key``."""
+        await self.set_many({key: value})
+
+    @abstractmethod
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """Look up several keys at once; missing keys map to None."""
+
+    @abstractmethod
+    async def set_many(self, items: dict[str, dict[str, Any]]) -> None:
+        """Store several values at once."""
+
+    async def ping(self) -> None:
+        """Raise if the backend is unreachable; in-process backends always answer."""
+        return None
+
+    async def aclose(self) -> None:
+        """Release any connections held by the backend; in-process backends hold none."""
+        return None
+
+
+@dataclass
+class _CacheEntry:
+    value: dict[str, Any]
+    size_bytes: int
+    expires_at: float
+
+
+class InMemoryResultCache(ResultCache):
+    """Bounded LRU cache with a per-entry TTL and a total byte-size limit.
+
+    Entry size is the length of the compact JSON encoding of the value. The
+    cache is used from the event loop only and is not thread-safe.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        return {key: self._get(key) for key in keys}
+
+    async def set_many(self, items: dict[str, dict[str, Any]]) -> None:
+        for key, value in items.items():
+            self._set(key, value)
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    def _get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def _set(self, key: str, value: dict[str, Any]) -> None:
+        size_bytes = len(json.dumps(value, separators=(",", ":")))
+        if size_bytes > self.max_bytes:
+            logger.debug(f"Result of {size_bytes} bytes exceeds cache limit, not caching")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _CacheEntry(value, size_bytes, self._clock() + self.ttl_seconds)
+        self._size_bytes += size_bytes
+
+        while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size_bytes
+
+
+class RedisResultCache(ResultCache):
+    """Result cache shared between replicas through Redis.
+
+    Values are stored as compressed compact JSON under ``namespace`` with a
+    TTL; multi-key reads and writes go through a single pipeline. Eviction
+    is left to the Redis server's ``maxmemory`` policy.
+    """
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        ttl_seconds: int = 3600,
+        namespace: str = "kyc:result:v2",
+        client: Any = None,
+    ):
+        super().__init__()
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:  # pragma: no cover
+                raise RuntimeError("The redis package is required for the Redis cache") from e
+            client = redis_asyncio.Redis.from_url(redis_url)
+        self._redis = client
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        keys = list(keys)
+        results: dict[str, dict[str, Any] | None] = dict.fromkeys(keys)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.get(self._redis_key(key))
+                payloads = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis cache lookup failed: {e}")
+            self.stats.errors += 1
+            self.stats.misses += len(keys)
+            return results
+
+        corrupt = []
+        for key, payload in zip(keys, payloads, strict=True):
+            if payload is None:
+                self.stats.misses += 1
+                continue
+            try:
+                results[key] = deserialize_result(payload)
+            except ValueError as e:
+                # Truncated or written by an incompatible version: a miss, and gone
+                logger.warning(f"Dropping unreadable Redis cache entry {key}: {e}")
+                corrupt.append(self._redis_key(key))
+                self.stats.errors += 1
+                self.stats.misses += 1
+                continue
+            self.stats.hits += 1
+        if corrupt:
+            try:
+                await self._redis.delete(*corrupt)
+            except Exception as e:
+                logger.warning(f"Redis cache delete failed: {e}")
+        return results
+
+    async def set_many(self, items: dict[str, dict[str, Any]]) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(self._redis_key(key), serialize_result(value), ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis cache store failed: {e}")
+            self.stats.errors += 1
+
+    async def ping(self) -> None:
+        await self._redis.ping()
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+def create_result_cache(settings: Settings) -> ResultCache | None:
+    """Build the cache backend selected by ``settings``, or None when disabled."""
+    if not settings.enable_cache:
+        return None
+
+    if settings.redis_url:
+        logger.info("Using Redis extraction result cache")
+        return RedisResultCache(
+            redis_url=settings.redis_url,
+            ttl_seconds=settings.cache_ttl_seconds,
+            namespace=settings.cache_namespace,
+        )
+
+    logger.info("Using in-memory extraction result cache")
+    return InMemoryResultCache(
+        max_entries=settings.cache_max_entries,
+        max_bytes=settings.cache_max_bytes,
+        ttl_seconds=settings.cache_ttl_seconds,
+    )
@@ -0,0 +1,78 @@
+"""
+Coalescing of identical concurrent calls.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for calls that ran versus calls that joined one in flight."""
+
+    leaders: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+# Not PEP 695 syntax: runtime.txt deploys Python 3.11
+class _Call(Generic[T]):  # noqa: UP046
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome.
+
+    The first caller for a key starts ``fn`` as a task; callers arriving
+    while it runs await the same task. Results and exceptions reach every
+    waiter. A cancelled waiter only stops waiting; the shared call is
+    cancelled once no waiter is left.
+    """
+
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._calls: dict[str, _Call[Any]] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run ``fn`` for ``key`` or join the call already in flight.
+
+        Args:
+            key: Identity of the call; equal keys must mean equal results
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            The call's result and whether it was shared with an earlier caller
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.stats.leaders += 1
+        else:
+            self.stats.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,450 @@
+"""
+Lightweight request tracing with OpenTelemetry-compatible export.
+
+A trace is started per HTTP request (and per background job). Code on the
+request path opens child spans with ``span()`` or records measured
+intervals with ``record_span()``; both are no-ops when no trace is active,
+so services can be used outside a request without any setup. The current
+span is kept in a context variable, so spans nest across ``await``s and
+tasks, and across executor threads when the context is copied.
+
+Finished traces are handed to an exporter: the console, or an OTLP/HTTP
+collector (JSON encoding, e.g. ``http://localhost:4318/v1/traces``). Each
+trace also carries the request ID the service generated for it, recorded
+on the root span as ``request.id``. It is kept apart from the trace ID,
+which a caller can choose through ``traceparent``, so a client can never
+pick the ``request_id`` of its own or anyone else's request.
+"""
+
+import asyncio
+import secrets
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+from loguru import logger
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "_token",
+        "attributes",
+        "end_ns",
+        "error",
+        "kind",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_ns",
+        "trace",
+    )
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        parent_id: str | None,
+        kind: int = SPAN_KIND_INTERNAL,
+        start_ns: int | None = None,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes or {}
+        self.error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, end_ns: int | None = None) -> None:
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and self.error is None:
+            self.error = f"{type(exc).__name__}: {exc}"
+        self.end()
+        _current_span.reset(self._token)
+
+
+class Trace:
+    """All spans of one request, under a single root span."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str | None = None,
+        parent_span_id: str | None = None,
+        attributes: dict[str, Any] | None = None,
+        request_id: str | None = None,
+    ):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        # The API's request_id: always generated here (or by the job queue),
+        # never taken from the caller's traceparent
+        self.request_id = request_id or str(uuid.uuid4())
+        self.spans: list[Span] = []
+        self.root = self.add_span(
+            name,
+            parent_span_id,
+            SPAN_KIND_SERVER,
+            attributes={**(attributes or {}), "request.id": self.request_id},
+        )
+
+    def add_span(
+        self,
+        name: str,
+        parent_id: str | None,
+        kind: int = SPAN_KIND_INTERNAL,
+        start_ns: int | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> Span:
+        span = Span(self, name, parent_id, kind, start_ns, attributes)
+        self.spans.append(span)
+        return span
+
+    def server_timing(self) -> str:
+        """
+        A ``Server-Timing`` header value: total duration of each span name.
+
+        Spans of the same name (e.g. one per retry or batch file) are summed,
+        in order of first appearance; the root span is reported as ``total``.
+        """
+        totals: dict[str, float] = {}
+        for span in self.spans[1:]:
+            if span.end_ns is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        entries = [f"{name};dur={duration:.2f}" for name, duration in totals.items()]
+        entries.append(f"total;dur={self.root.duration_ms:.2f}")
+        return ", ".join(entries)
+
+    def to_otlp(self) -> list[dict[str, Any]]:
+        """The finished spans as OTLP/JSON span objects."""
+        return [
+            {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+                "status": (
+                    {"code": STATUS_ERROR, "message": span.error}
+                    if span.error
+                    else {"code": STATUS_OK}
+                ),
+            }
+            for span in self.spans
+            if span.end_ns is not None
+        ]
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class _NoSpan:
+    """Stand-in returned by ``span()`` outside a trace."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def current_trace() -> Trace | None:
+    span = _current_span.get()
+    return span.trace if span is not None else None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoSpan:
+    """
+    A child span of the current span, for use as a context manager.
+
+    Outside a trace this returns a shared no-op object.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return _NO_SPAN
+    return parent.trace.add_span(name, parent.span_id, attributes=attributes)
+
+
+def record_span(name: str, start_ns: int, end_ns: int | None = None, **attributes: Any) -> None:
+    """Record an already measured interval as a child of the current span."""
+    parent = _current_span.get()
+    if parent is not None:
+        parent.trace.add_span(name, parent.span_id, start_ns=start_ns, attributes=attributes).end(end_ns)
+
+
+def current_request_id() -> str:
+    """The current trace's request ID, or a fresh one outside a trace."""
+    trace = current_trace()
+    return trace.request_id if trace is not None else str(uuid.uuid4())
+
+
+def record_since_trace_start(name: str) -> None:
+    """Record a span from the start of the current trace until now."""
+    trace = current_trace()
+    if trace is not None:
+        record_span(name, trace.root.start_ns)
+
+
+def parse_traceparent(header: str | None) -> tuple[str | None, str | None]:
+    """
+    Trace ID and parent span ID from a W3C ``traceparent`` header.
+
+    Returns:
+        ``(None, None)`` when the header is absent or malformed
+    """
+    if not header:
+        return None, None
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+    except ValueError:
+        return None, None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None, None
+    return trace_id, parent_id
+
+
+class SpanExporter:
+    """Receives finished traces; the base class drops them."""
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def export(self, trace: Trace) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Log one line per trace with the duration of every span."""
+
+    def export(self, trace: Trace) -> None:
+        stages = " ".join(f"{span.name}={span.duration_ms:.1f}ms" for span in trace.spans[1:])
+        logger.info(
+            f"trace {trace.trace_id} request {trace.request_id} {trace.root.name} "
+            f"{trace.root.duration_ms:.1f}ms {stages}"
+        )
+
+
+class OTLPSpanExporter(SpanExporter):
+    """Send traces to an OTLP/HTTP collector in batches, off the request path.
+
+    Finished traces are queued; a background task posts them every
+    ``interval_seconds`` or once ``batch_size`` spans are waiting. When the
+    queue is full new traces are dropped and counted rather than slowing
+    requests down.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        batch_size: int = 512,
+        interval_seconds: float = 5,
+        max_queued_traces: int = 2048,
+        timeout_seconds: float = 10,
+    ):
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.resource = {
+            "attributes": [_otlp_attribute("service.name", service_name)]
+        }
+        self.dropped = 0
+        self.exported = 0
+        self._queue: asyncio.Queue[Trace] = asyncio.Queue(maxsize=max_queued_traces)
+        self._batch: list[Trace] = []
+        self._task: asyncio.Task | None = None
+        self._http: httpx.AsyncClient | None = None
+
+    def start(self) -> None:
+        self._http = httpx.AsyncClient(timeout=self.timeout_seconds)
+        self._task = asyncio.create_task(self._run(), name="otlp-exporter")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Flush whatever is still queued
+        await self._send(self._drain())
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = time.monotonic() + self.interval_seconds
+            spans = len(self._batch[0].spans)
+            while spans < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    trace = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                self._batch.append(trace)
+                spans += len(trace.spans)
+            traces, self._batch = self._batch, []
+            await self._send(traces)
+
+    def _drain(self) -> list[Trace]:
+        """The batch being collected plus everything still queued."""
+        traces, self._batch = self._batch, []
+        while not self._queue.empty():
+            traces.append(self._queue.get_nowait())
+        return traces
+
+    def payload(self, traces: list[Trace]) -> dict[str, Any]:
+        """The OTLP/JSON ``ExportTraceServiceRequest`` for ``traces``."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "kyc-api"},
+                            "spans": [span for trace in traces for span in trace.to_otlp()],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    async def _send(self, traces: list[Trace]) -> None:
+        if not traces or self._http is None:
+            return
+        try:
+            response = await self._http.post(self.endpoint, json=self.payload(traces))
+            response.raise_for_status()
+            self.exported += len(traces)
+        except Exception as e:
+            # Tracing must never take the API down with it
+            self.dropped += len(traces)
+            logger.warning(f"Failed to export {len(traces)} traces to {self.endpoint}: {e}")
+
+
+class Tracer:
+    """Starts request traces and hands finished ones to the exporter."""
+
+    def __init__(self, exporter: SpanExporter | None = None):
+        self.exporter = exporter or SpanExporter()
+
+    def start_trace(
+        self,
+        name: str,
+        trace_id: str | None = None,
+        parent_span_id: str | None = None,
+        request_id: str | None = None,
+        **attributes: Any,
+    ) -> Trace:
+        return Trace(name, trace_id, parent_span_id, attributes, request_id)
+
+    def trace(
+        self,
+        name: str,
+        trace_id: str | None = None,
+        parent_span_id: str | None = None,
+        request_id: str | None = None,
+        **attributes: Any,
+    ) -> "_ActiveTrace":
+        """Context manager running its body as the root span of a new trace."""
+        return _ActiveTrace(
+            self, self.start_trace(name, trace_id, parent_span_id, request_id, **attributes)
+        )
+
+    def finish(self, trace: Trace) -> None:
+        self.exporter.export(trace)
+
+
+class _ActiveTrace:
+    def __init__(self, tracer: Tracer, trace: Trace):
+        self.tracer = tracer
+        self.trace = trace
+
+    def __enter__(self) -> Trace:
+        self.trace.root.__enter__()
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.trace.root.__exit__(exc_type, exc, tb)
+        self.tracer.finish(self.trace)
+
+
+def create_tracer(settings: Any) -> Tracer:
+    """Build the tracer and exporter selected by ``trace_exporter``."""
+    if settings.trace_exporter == "console":
+        return Tracer(ConsoleSpanExporter())
+    if settings.trace_exporter == "otlp":
+        return Tracer(
+            OTLPSpanExporter(
+                settings.otlp_traces_endpoint,
+                service_name=settings.trace_service_name,
+                interval_seconds=settings.trace_export_interval_seconds,
+            )
+        )
+    return Tracer()
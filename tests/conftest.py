@@ -0,0 +1,87 @@
+"""
+Shared fixtures: the API app driven in-process against a fake Document AI client.
+"""
+
+import threading
+import time
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from google.cloud.documentai_v1.types import Document
+
+from src.api.main import create_app
+from src.core.config import DocumentAIConfig, settings
+from src.services.document_ai_client import DocumentAIClient
+from src.services.fake_document_ai import apply_field_mask, build_document
+
+PDF_BYTES = b"%PDF-1.4\n%test\n"
+
+
+class FakeDocumentAIClient(DocumentAIClient):
+    """DocumentAIClient whose RPC answers with a canned Document after ``latency``.
+
+    The blocking call still runs on the client's executor, and admission,
+    the circuit breaker, retries and parsing run as usual; only the RPC is
+    replaced. Counts calls and the most calls seen in flight.
+    """
+
+    def __init__(self, latency: float = 0.05, config: DocumentAIConfig | None = None):
+        super().__init__(
+            config=config
+            or DocumentAIConfig(
+                # Never dialled: _process_document_sync below replaces the RPC
+                api_endpoint="127.0.0.1:9",
+                insecure_channel=True,
+                quota_requests_per_minute=0,
+            )
+        )
+        self.latency = latency
+        self.document = apply_field_mask(build_document(tokens_per_page=0, image_bytes=0), ["entities"])
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    async def check_ready(self, timeout: float = 5.0) -> None:
+        pass
+
+    def _process_document_sync(self, *args, **kwargs) -> Document:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return self.document
+
+
+def unique_pdf(i: int) -> bytes:
+    """A distinct upload per ``i``, so no request is a cache hit or coalesced."""
+    return PDF_BYTES + f"%{i}\n".encode()
+
+
+@pytest.fixture
+def fake_client() -> FakeDocumentAIClient:
+    return FakeDocumentAIClient()
+
+
+@pytest.fixture(autouse=True)
+def _test_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The test PDFs are not real forms, and results must not leak between tests
+    monkeypatch.setattr(settings, "enable_page_selection", False)
+    monkeypatch.setattr(settings, "redis_url", None)
+    monkeypatch.setattr(settings, "trace_exporter", "none")
+
+
+@pytest.fixture
+async def api(fake_client: FakeDocumentAIClient) -> AsyncIterator[httpx.AsyncClient]:
+    """An HTTP client for a started app using ``fake_client``."""
+    app = create_app(fake_client)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=30
+    ) as http:
+        yield http
@@ -0,0 +1,88 @@
+"""
+Admission control: token buckets refill at the quota rate, queue briefly, then shed with 429.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import DocumentAIConfig
+from src.services.admission import AdmissionController, AdmissionRejectedError, TokenBucket
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_refills_at_the_rate_up_to_the_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=2, burst=3, clock=clock)
+
+    assert [bucket.reserve(max_wait_seconds=0) for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve(max_wait_seconds=0) is None
+    assert bucket.time_until_available() == 0.5
+
+    clock.now += 0.5
+    assert bucket.tokens == 1
+    clock.now += 60
+    assert bucket.tokens == 3
+
+
+async def test_calls_queue_up_to_the_wait_limit_then_are_rejected():
+    # 10 calls a second: the second call waits 0.1s, the third would wait 0.2s
+    admission = AdmissionController(requests_per_minute=600, burst=1, max_wait_seconds=0.15)
+
+    first, second, third = await asyncio.gather(
+        *(admission.acquire("p") for _ in range(3)), return_exceptions=True
+    )
+
+    assert first == 0
+    assert second == pytest.approx(0.1, abs=0.01)
+    assert isinstance(third, AdmissionRejectedError)
+    # A retry fits within the wait limit once the backlog has drained that far
+    assert third.retry_after_seconds == pytest.approx(0.05, abs=0.01)
+    stats = admission.bucket("p").stats
+    assert (stats.admitted, stats.queued, stats.rejected) == (2, 1, 1)
+
+
+def test_try_acquire_never_queues():
+    admission = AdmissionController(requests_per_minute=60, burst=1, clock=FakeClock())
+
+    assert admission.try_acquire("p")
+    assert not admission.try_acquire("p")
+    assert admission.bucket("p").stats.rejected == 1
+
+
+@pytest.fixture
+def fake_client() -> FakeDocumentAIClient:
+    return FakeDocumentAIClient(
+        config=DocumentAIConfig(
+            api_endpoint="127.0.0.1:9",
+            insecure_channel=True,
+            quota_requests_per_minute=6,
+            quota_burst=1,
+            admission_max_wait_seconds=1,
+        )
+    )
+
+
+async def test_requests_past_the_quota_are_shed_with_retry_after(api, fake_client):
+    responses = [
+        await api.post(PROCESS, files={"file": ("form.pdf", unique_pdf(i), "application/pdf")})
+        for i in range(2)
+    ]
+
+    assert [response.status_code for response in responses] == [200, 429]
+    assert fake_client.calls == 1
+    # The next token is 10s away, 9s past the wait limit
+    assert responses[1].headers["Retry-After"] == "9"
+    error = responses[1].json()["detail"]["error"]
+    assert error["code"] == "RATE_LIMITED"
+    assert error["details"] == {"retry_after_seconds": 9}
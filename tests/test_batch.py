@@ -0,0 +1,69 @@
+"""
+Batch processing: files run side by side, each inside its own traced span.
+"""
+
+import httpx
+
+from src.api.main import create_app
+from src.core.config import settings
+from src.services.circuit_breaker import CircuitOpenError
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+BATCH = "/api/v1/documents/process/batch"
+PROCESS = "/api/v1/documents/process"
+
+
+def _files(count: int) -> list[tuple[str, tuple[str, bytes, str]]]:
+    return [("files", (f"form-{i}.pdf", unique_pdf(i), "application/pdf")) for i in range(count)]
+
+
+async def test_batch_processes_every_file(api, fake_client: FakeDocumentAIClient):
+    response = await api.post(BATCH, files=_files(4))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total_files"], body["succeeded"], body["failed"]) == (4, 4, 0)
+    assert [item["filename"] for item in body["results"]] == [f"form-{i}.pdf" for i in range(4)]
+    assert fake_client.calls == 4
+    assert "batch_item" in response.headers["Server-Timing"]
+
+
+async def test_batch_failure_is_reported_per_file(api):
+    files = [*_files(1), ("files", ("notes.txt", b"plain text", "text/plain"))]
+
+    response = await api.post(BATCH, files=files)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][1]["success"] is False
+
+
+async def test_batch_respects_max_concurrency(api, fake_client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_concurrency", 2)
+
+    response = await api.post(BATCH, files=_files(6))
+
+    assert response.json()["succeeded"] == 6
+    assert fake_client.max_in_flight <= 2
+
+
+class CircuitOpenClient(FakeDocumentAIClient):
+    async def process_document(self, *args, **kwargs):
+        raise CircuitOpenError("us/processor", retry_after_seconds=12.5)
+
+
+async def test_batch_item_reports_the_same_error_as_a_single_request():
+    app = create_app(CircuitOpenClient())
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http,
+    ):
+        single = await http.post(PROCESS, files={"file": _files(1)[0][1]})
+        batch = await http.post(BATCH, files=_files(1))
+
+    single_error = single.json()["detail"]["error"]
+    item_error = batch.json()["results"][0]["error"]
+    assert single.status_code == 503
+    assert item_error == single_error
+    assert item_error["details"] == {"circuit": "us/processor", "retry_after_seconds": 13}
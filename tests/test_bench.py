@@ -0,0 +1,61 @@
+"""
+kyc-bench fails when a metric regresses past the threshold against its baseline.
+"""
+
+import json
+
+from src.bench import cli
+from src.bench.baseline import Comparison, Metric, load_baseline, save_results
+
+QUICK = ["parse", "--rounds", "1", "--iterations", "5"]
+PARSE_METRICS = ("parse.entities_31.us_per_doc", "parse.entities_310.us_per_doc")
+
+
+def _baseline(path, value: float) -> None:
+    save_results(path, {name: Metric(value, "us") for name in PARSE_METRICS})
+
+
+def test_regression_depends_on_direction_and_tolerance():
+    def regressed(current: Metric, baseline: float) -> bool:
+        return Comparison("m", current, Metric(baseline, current.unit), threshold=0.2).regressed
+
+    assert regressed(Metric(130, "ms"), 100)
+    assert not regressed(Metric(115, "ms"), 100)
+    assert regressed(Metric(70, "req/s", better="higher"), 100)
+    assert not regressed(Metric(130, "req/s", better="higher"), 100)
+    assert not regressed(Metric(130, "ms", tolerance=0.5), 100)
+    assert not Comparison("m", Metric(1, "ms"), None, threshold=0.2).regressed
+
+
+def test_fails_on_a_regression_against_the_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    # No real parse takes a nanosecond
+    _baseline(baseline, 0.001)
+
+    assert cli.main([*QUICK, "--baseline", str(baseline)]) == 1
+    assert "2 metric(s) regressed" in capsys.readouterr().out
+
+
+def test_passes_within_the_threshold(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    _baseline(baseline, 1e9)
+
+    assert cli.main([*QUICK, "--baseline", str(baseline)]) == 0
+    assert "No regressions beyond 20%" in capsys.readouterr().out
+
+
+def test_update_records_the_run_and_keeps_other_metrics(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    save_results(baseline, {"process.p50_ms": Metric(12.0, "ms")})
+
+    assert cli.main([*QUICK, "--baseline", str(baseline), "--update"]) == 0
+
+    stored = load_baseline(baseline)
+    assert set(stored) == {"process.p50_ms", *PARSE_METRICS}
+    assert stored["process.p50_ms"].value == 12.0
+    assert "cpu_count" in json.loads(baseline.read_text())["environment"]
+
+
+def test_missing_baseline_does_not_fail(tmp_path, capsys):
+    assert cli.main([*QUICK, "--baseline", str(tmp_path / "none.json")]) == 0
+    assert "record one with --update" in capsys.readouterr().out
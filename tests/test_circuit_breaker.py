@@ -0,0 +1,161 @@
+"""
+Circuit breaker: opens on failures or slow calls, probes when half-open, and fails over.
+"""
+
+import pytest
+
+from src.core.config import DocumentAIConfig
+from src.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from src.services.document_ai_client import CallReport
+from tests.conftest import PDF_BYTES, FakeDocumentAIClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    options = {
+        "failure_rate_threshold": 0.5,
+        "slow_call_seconds": 1,
+        "slow_call_rate_threshold": 0.8,
+        "window_size": 10,
+        "min_calls": 4,
+        "open_seconds": 30,
+        **kwargs,
+    }
+    return CircuitBreaker("us/processor", clock=clock, **options)
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_calls):
+        breaker.record_failure(breaker.before_call())
+    assert breaker.state == OPEN
+
+
+def test_opens_on_failure_rate():
+    breaker = _breaker(FakeClock())
+
+    for _ in range(2):
+        breaker.record_success(breaker.before_call(), 0.1)
+    breaker.record_failure(breaker.before_call())
+    # Not judged until min_calls are known
+    assert breaker.state == CLOSED
+    breaker.record_failure(breaker.before_call())
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert raised.value.retry_after_seconds == 30
+    assert breaker.stats.rejected == 1
+
+
+def test_opens_on_slow_call_rate():
+    breaker = _breaker(FakeClock())
+
+    breaker.record_success(breaker.before_call(), 0.1)
+    for _ in range(3):
+        breaker.record_success(breaker.before_call(), 2.0)
+    assert breaker.state == CLOSED
+    breaker.record_success(breaker.before_call(), 2.0)
+
+    assert breaker.state == OPEN
+    assert breaker.stats.failures == 0
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _open(breaker)
+
+    clock.now += 29
+    assert breaker.retry_after_seconds() == 1
+    clock.now += 1
+    assert breaker.state == HALF_OPEN
+    probe = breaker.before_call()
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success(probe, 0.1)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_calls"] == 0
+
+
+def test_failed_or_slow_probe_opens_again():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    _open(breaker)
+
+    clock.now += 30
+    breaker.record_failure(breaker.before_call())
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    breaker.record_success(breaker.before_call(), 5.0)
+    assert breaker.state == OPEN
+    assert breaker.stats.opened == 3
+
+
+def test_outcomes_from_before_a_transition_are_ignored():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    stale = breaker.before_call()
+    _open(breaker)
+
+    clock.now += 30
+    probe = breaker.before_call()
+    breaker.record_failure(stale)
+
+    assert breaker.state == HALF_OPEN
+    breaker.record_success(probe, 0.1)
+    assert breaker.state == CLOSED
+
+
+def _client_with_alternate() -> FakeDocumentAIClient:
+    client = FakeDocumentAIClient(
+        latency=0,
+        config=DocumentAIConfig(
+            api_endpoint="127.0.0.1:9",
+            insecure_channel=True,
+            quota_requests_per_minute=0,
+            alternate_location="eu",
+            alternate_processor_id="alternate-processor",
+        ),
+    )
+    # Answer from the fake RPC in the alternate location too
+    client.alternate = FakeDocumentAIClient(latency=0, config=client.alternate.config)
+    return client
+
+
+async def test_open_circuit_fails_over_to_the_alternate():
+    client = _client_with_alternate()
+    _open(client.breakers.breaker(f"{client.location}/processor"))
+    client.initialize()
+    report = CallReport()
+    try:
+        await client.process_document(PDF_BYTES, "processor", report=report)
+    finally:
+        await client.aclose()
+
+    assert (client.calls, client.alternate.calls) == (0, 1)
+    assert report.failed_over
+    assert "eu/alternate-processor" in client.alternate.breakers.snapshot()
+
+
+async def test_open_circuit_without_failover_fails_fast():
+    client = _client_with_alternate()
+    client.config.circuit_failover = False
+    _open(client.breakers.breaker(f"{client.location}/processor"))
+    client.initialize()
+    try:
+        with pytest.raises(CircuitOpenError):
+            await client.process_document(PDF_BYTES, "processor")
+    finally:
+        await client.aclose()
+
+    assert (client.calls, client.alternate.calls) == (0, 0)
@@ -0,0 +1,24 @@
+"""
+Identical uploads in flight together share one Document AI call, and /metrics counts them.
+"""
+
+import asyncio
+
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+
+
+async def test_coalesced_and_cache_counters_are_exported(api, fake_client: FakeDocumentAIClient):
+    files = {"file": ("form.pdf", unique_pdf(0), "application/pdf")}
+
+    # Identical uploads in flight together share one call; a later repeat hits the cache
+    await asyncio.gather(*(api.post(PROCESS, files=files) for _ in range(5)))
+    await api.post(PROCESS, files=files)
+    metrics = (await api.get("/metrics")).text
+
+    assert fake_client.calls == 1
+    assert 'kyc_single_flight_calls_total{role="leader"} 1.0' in metrics
+    assert 'kyc_single_flight_calls_total{role="coalesced"} 4.0' in metrics
+    assert 'kyc_result_cache_lookups_total{backend="memory",result="hit"} 1.0' in metrics
+    assert 'kyc_result_cache_lookups_total{backend="memory",result="miss"} 5.0' in metrics
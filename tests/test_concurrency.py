@@ -0,0 +1,46 @@
+"""
+Concurrent /process requests share one client and overlap their Document AI calls.
+"""
+
+import asyncio
+
+from src.api.main import create_app
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+PARALLEL_REQUESTS = 100
+
+
+async def test_parallel_requests_share_one_client(api, fake_client: FakeDocumentAIClient):
+    async def post(i: int):
+        return await api.post(
+            PROCESS, files={"file": (f"form-{i}.pdf", unique_pdf(i), "application/pdf")}
+        )
+
+    responses = await asyncio.gather(*(post(i) for i in range(PARALLEL_REQUESTS)))
+
+    assert [response.status_code for response in responses] == [200] * PARALLEL_REQUESTS
+    request_ids = {response.json()["request_id"] for response in responses}
+    assert len(request_ids) == PARALLEL_REQUESTS
+    assert fake_client.calls == PARALLEL_REQUESTS
+    # The shared executor runs the calls side by side instead of one at a time
+    assert fake_client.max_in_flight > 1
+    assert fake_client._executor is not None
+
+
+async def test_parallel_requests_stay_within_executor(api, fake_client: FakeDocumentAIClient):
+    files = [{"file": ("form.pdf", unique_pdf(i), "application/pdf")} for i in range(20)]
+
+    responses = await asyncio.gather(*(api.post(PROCESS, files=f) for f in files))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert fake_client.max_in_flight <= fake_client.config.executor_max_workers
+
+
+async def test_shutdown_drains_the_shared_executor(fake_client: FakeDocumentAIClient):
+    app = create_app(fake_client)
+    async with app.router.lifespan_context(app):
+        executor = fake_client._executor
+        assert executor is not None
+    assert fake_client._executor is None
+    assert executor._shutdown
@@ -0,0 +1,96 @@
+"""
+The fake Document AI server answers real gRPC calls from the client, on both transports.
+"""
+
+from collections.abc import AsyncIterator
+
+import pytest
+from google.api_core import exceptions as core_exceptions
+
+from src.core.config import DocumentAIConfig
+from src.core.schema import NCB_KYC_FORM
+from src.services.document_ai_client import CallReport, DocumentAIClient
+from src.services.fake_document_ai import (
+    FakeDocumentAIServer,
+    FakeServerConfig,
+    LatencyDistribution,
+    parse_error_rates,
+)
+from tests.conftest import PDF_BYTES
+
+
+@pytest.fixture
+def server() -> FakeDocumentAIServer:
+    return FakeDocumentAIServer(
+        FakeServerConfig(
+            latency=LatencyDistribution.fixed(0.01), tokens_per_page=10, image_bytes=64
+        )
+    )
+
+
+@pytest.fixture
+async def address(server: FakeDocumentAIServer) -> AsyncIterator[str]:
+    """Address of ``server``, started on a free port."""
+    address = await server.start()
+    yield address
+    await server.stop()
+
+
+def _client(address: str, **config) -> DocumentAIClient:
+    client = DocumentAIClient(
+        config=DocumentAIConfig(
+            api_endpoint=address,
+            insecure_channel=True,
+            quota_requests_per_minute=0,
+            retry_initial_backoff_seconds=0.01,
+            **config,
+        )
+    )
+    client.initialize()
+    return client
+
+
+@pytest.mark.parametrize("transport", ["thread", "async"])
+async def test_process_document_returns_the_masked_document(server, address, transport):
+    client = _client(address, transport=transport, pixel_bounding_boxes=True)
+    try:
+        await client.check_ready()
+        document = await client.extract_kyc_information(PDF_BYTES)
+    finally:
+        await client.aclose()
+
+    assert server.stats.calls == 1
+    assert len(document.entities) == len(NCB_KYC_FORM.field_names)
+    # Only entities and page sizes come back
+    assert not document.text
+    assert [page.dimension.width for page in document.pages] == [1654, 1654]
+    assert not document.pages[0].tokens
+    fields = client.parse_extracted_fields(document)
+    assert fields["page_one"]["FirstName"]["regions"][0]["pixels"]["width"] > 0
+
+
+async def test_injected_errors_reach_the_client(server, address):
+    server.config.error_rates = {"unavailable": 1.0}
+    client = _client(address, transport="async", retry_max_attempts=2)
+    report = CallReport()
+    try:
+        with pytest.raises(core_exceptions.ServiceUnavailable, match="Injected UNAVAILABLE"):
+            await client.process_document(PDF_BYTES, "processor", report=report)
+    finally:
+        await client.aclose()
+
+    assert report.attempts == 2
+    assert server.stats.errors == {"unavailable": 2}
+
+
+def test_latency_and_error_specs_parse():
+    assert LatencyDistribution.parse("0.2") == LatencyDistribution.fixed(0.2)
+    assert LatencyDistribution.parse("uniform:0.05,0.2").params == (0.05, 0.2)
+    assert parse_error_rates("unavailable=0.05, resource_exhausted=0.01") == {
+        "unavailable": 0.05,
+        "resource_exhausted": 0.01,
+    }
+    with pytest.raises(ValueError, match="takes 2 parameter"):
+        LatencyDistribution.parse("lognormal:0.1")
+    with pytest.raises(ValueError, match="Unknown gRPC status"):
+        FakeServerConfig(error_rates={"flaky": 0.1})
@@ -0,0 +1,58 @@
+"""
+ProcessDocument asks only for entities by default, plus page sizes for pixel boxes.
+"""
+
+import pytest
+from google.cloud.documentai_v1.types import Document
+
+from src.core.config import DocumentAIConfig
+from tests.conftest import PDF_BYTES, FakeDocumentAIClient
+
+
+class MaskRecordingClient(FakeDocumentAIClient):
+    def __init__(self, **config):
+        super().__init__(
+            latency=0,
+            config=DocumentAIConfig(
+                api_endpoint="127.0.0.1:9",
+                insecure_channel=True,
+                quota_requests_per_minute=0,
+                **config,
+            ),
+        )
+        self.field_masks: list[str | None] = []
+
+    def _process_document_sync(self, *args) -> Document:
+        # file_content, processor_id, version_id, mime_type, field_mask, ...
+        self.field_masks.append(args[4])
+        return super()._process_document_sync()
+
+
+@pytest.mark.parametrize(
+    ("config", "mask", "paths"),
+    [
+        ({}, "entities", ["entities"]),
+        (
+            {"pixel_bounding_boxes": True},
+            "entities,pages.dimension",
+            ["entities", "pages.dimension"],
+        ),
+        (
+            {"pixel_bounding_boxes": True, "response_field_mask": "entities,pages"},
+            "entities,pages",
+            ["entities", "pages"],
+        ),
+        ({"full_document": True, "pixel_bounding_boxes": True}, None, []),
+    ],
+)
+async def test_requested_fields(config, mask, paths):
+    client = MaskRecordingClient(**config)
+    client.initialize()
+    try:
+        await client.extract_kyc_information(PDF_BYTES)
+    finally:
+        await client.aclose()
+
+    assert client.field_masks == [mask]
+    request = client._build_process_request(PDF_BYTES, "processor", field_mask=mask)
+    assert list(request.field_mask.paths) == paths
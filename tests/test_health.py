@@ -0,0 +1,62 @@
+"""
+Health and info endpoints: /info is served with an ETag, /ready from the last probe.
+"""
+
+import asyncio
+
+import httpx
+
+from src.api.main import create_app
+from tests.conftest import FakeDocumentAIClient
+
+INFO = "/api/v1/documents/info"
+READY = "/api/v1/health/ready"
+
+
+class UnreachableClient(FakeDocumentAIClient):
+    async def check_ready(self, timeout: float = 5.0) -> None:
+        raise ConnectionError("Document AI unreachable")
+
+
+async def _probed(http: httpx.AsyncClient) -> httpx.Response:
+    """The readiness response once the first background probe has run."""
+    async with asyncio.timeout(5):
+        while (response := await http.get(READY)).json()["checked_at"] is None:
+            await asyncio.sleep(0.01)
+    return response
+
+
+async def test_info_answers_a_matching_etag_with_304(api):
+    response = await api.get(INFO)
+    etag = response.headers["ETag"]
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        cached = await api.get(INFO, headers={"If-None-Match": if_none_match})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+    assert (await api.get(INFO, headers={"If-None-Match": '"other"'})).status_code == 200
+
+
+async def test_ready_once_the_backend_check_passes(api):
+    response = await _probed(api)
+
+    assert response.status_code == 200
+    assert response.json()["checks"]["document_ai"]["ok"] is True
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+async def test_not_ready_when_the_backend_check_fails():
+    app = create_app(UnreachableClient())
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http,
+    ):
+        response = await _probed(http)
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert body["checks"]["document_ai"]["error"] == "ConnectionError: Document AI unreachable"
@@ -0,0 +1,95 @@
+"""
+Hedged calls: a backup goes out after the latency percentile, and the first success wins.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+from src.services.hedging import Hedger
+
+
+def _hedger(**kwargs) -> Hedger:
+    hedger = Hedger(percentile=95, budget_ratio=1, min_samples=20, min_delay_seconds=0.01, **kwargs)
+    for i in range(20):
+        hedger.latencies.record(0.001 * (i + 1))
+    return hedger
+
+
+def test_hedge_delay_waits_for_samples_and_uses_the_percentile():
+    hedger = Hedger(percentile=95, min_samples=20, min_delay_seconds=0.05)
+    assert hedger.hedge_delay() is None
+
+    for i in range(20):
+        hedger.latencies.record(0.01 * (i + 1))
+    # The 19th of 20 sorted latencies
+    assert hedger.hedge_delay() == pytest.approx(0.19)
+
+    # Never sooner than the minimum delay
+    hedger.min_delay_seconds = 0.5
+    assert hedger.hedge_delay() == 0.5
+
+
+async def test_backup_wins_and_the_slow_primary_is_cancelled():
+    hedger = _hedger()
+    cancelled = asyncio.Event()
+
+    async def primary() -> str:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "primary"
+
+    async def backup() -> str:
+        return "backup"
+
+    assert await hedger.run(primary, backup) == "backup"
+    assert cancelled.is_set()
+    assert (hedger.stats.hedges, hedger.stats.hedge_wins) == (1, 1)
+
+
+async def test_fast_primary_is_not_hedged():
+    hedger = _hedger()
+    backups = 0
+
+    async def primary() -> str:
+        return "primary"
+
+    async def backup() -> str:
+        nonlocal backups
+        backups += 1
+        return "backup"
+
+    assert await hedger.run(primary, backup) == "primary"
+    assert backups == 0
+    assert hedger.stats.hedges == 0
+
+
+async def test_failed_backup_leaves_the_primary_to_finish():
+    hedger = _hedger()
+
+    async def primary() -> str:
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    async def backup() -> str:
+        raise RuntimeError("no admission token")
+
+    assert await hedger.run(primary, backup) == "primary"
+    assert (hedger.stats.hedges, hedger.stats.hedge_wins) == (1, 0)
+
+
+def test_hedging_requires_the_async_transport():
+    with pytest.raises(ValueError, match="TRANSPORT=async"):
+        DocumentAIClient(
+            config=DocumentAIConfig(
+                api_endpoint="127.0.0.1:9",
+                insecure_channel=True,
+                hedge_enabled=True,
+                transport="thread",
+            )
+        )
@@ -0,0 +1,128 @@
+"""
+Background job queue: jobs refused for capacity are retried, other failures are final.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.admission import AdmissionRejectedError
+from src.services.job_queue import Job, JobQueue, JobStatus, QueueFullError
+
+
+async def _wait_done(job: Job, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not job.done:
+            await asyncio.sleep(0.005)
+
+
+def _queue(handler, **kwargs) -> JobQueue:
+    return JobQueue(
+        handler,
+        workers=1,
+        retry_on=(AdmissionRejectedError,),
+        retry_initial_backoff_seconds=0.01,
+        retry_max_backoff_seconds=0.02,
+        **kwargs,
+    )
+
+
+async def test_rate_limited_job_is_requeued_until_it_runs():
+    async def handler(job: Job) -> str:
+        if job.attempts < 3:
+            raise AdmissionRejectedError("bucket", retry_after_seconds=0.01)
+        return "done"
+
+    queue = _queue(handler)
+    queue.start()
+    try:
+        job = queue.submit("form.pdf", "custom", b"%PDF")
+        await _wait_done(job)
+    finally:
+        await queue.stop()
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == "done"
+    assert job.attempts == 3
+
+
+async def test_requeued_job_waits_for_retry_after():
+    statuses = []
+
+    async def handler(job: Job) -> str:
+        if job.attempts == 1:
+            raise AdmissionRejectedError("bucket", retry_after_seconds=0.2)
+        return "done"
+
+    queue = _queue(handler)
+    queue.start()
+    try:
+        job = queue.submit("form.pdf", "custom", b"%PDF")
+        await asyncio.sleep(0.1)
+        statuses.append(job.status)
+        await _wait_done(job)
+    finally:
+        await queue.stop()
+
+    assert statuses == [JobStatus.QUEUED]
+    assert job.finished_at - job.created_at >= 0.2
+
+
+async def test_job_fails_once_retries_would_pass_max_age():
+    async def handler(job: Job) -> str:
+        raise AdmissionRejectedError("bucket", retry_after_seconds=10)
+
+    queue = _queue(handler, max_job_age_seconds=1)
+    queue.start()
+    try:
+        job = queue.submit("form.pdf", "custom", b"%PDF")
+        await _wait_done(job)
+    finally:
+        await queue.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error["code"] == "JOB_EXPIRED"
+    assert job.content is None
+
+
+async def test_other_errors_fail_without_retry():
+    async def handler(job: Job) -> str:
+        raise RuntimeError("bad document")
+
+    queue = _queue(handler)
+    queue.start()
+    try:
+        job = queue.submit("form.pdf", "custom", b"%PDF")
+        await _wait_done(job)
+    finally:
+        await queue.stop()
+
+    assert job.status == JobStatus.FAILED
+    assert job.error["code"] == "PROCESSING_ERROR"
+    assert job.attempts == 1
+
+
+async def test_uploads_held_by_waiting_jobs_are_bounded():
+    release = asyncio.Event()
+
+    async def handler(job: Job) -> str:
+        await release.wait()
+        return "done"
+
+    queue = _queue(handler, max_bytes=10)
+    queue.start()
+    try:
+        first = queue.submit("a.pdf", "custom", b"%PDF-1")
+        with pytest.raises(QueueFullError, match="10 bytes"):
+            queue.submit("b.pdf", "custom", b"%PDF-2")
+        assert queue.held_bytes == 6
+
+        release.set()
+        await _wait_done(first)
+        # Room again once the first upload is released
+        second = queue.submit("b.pdf", "custom", b"%PDF-2")
+        await _wait_done(second)
+    finally:
+        await queue.stop()
+
+    assert queue.held_bytes == 0
@@ -0,0 +1,96 @@
+"""
+/api/v1/jobs: submit a document, poll its status, then fetch the result.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.config import settings
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+JOBS = "/api/v1/jobs"
+
+
+def _upload(i: int) -> dict:
+    return {"file": (f"form-{i}.pdf", unique_pdf(i), "application/pdf")}
+
+
+async def _finished(api: httpx.AsyncClient, job_id: str) -> dict:
+    """The job's status once it has succeeded or failed."""
+    async with asyncio.timeout(5):
+        while True:
+            status = (await api.get(f"{JOBS}/{job_id}")).json()
+            if status["status"] in ("succeeded", "failed"):
+                return status
+            await asyncio.sleep(0.01)
+
+
+async def test_job_runs_and_returns_the_process_response(api, fake_client: FakeDocumentAIClient):
+    submitted = await api.post(JOBS, files=_upload(0))
+
+    assert submitted.status_code == 202
+    job = submitted.json()
+    assert job["status"] == "queued"
+    assert job["result_url"].endswith(f"/api/v1/jobs/{job['job_id']}/result")
+
+    status = await _finished(api, job["job_id"])
+    result = await api.get(f"{JOBS}/{job['job_id']}/result")
+
+    assert status["status"] == "succeeded"
+    assert status["finished_at"] is not None
+    assert result.status_code == 200
+    assert result.json()["request_id"] == job["job_id"]
+    assert result.json()["filename"] == "form-0.pdf"
+    assert fake_client.calls == 1
+
+
+async def test_pending_job_result_answers_202(api, fake_client: FakeDocumentAIClient):
+    fake_client.latency = 0.3
+    job_id = (await api.post(JOBS, files=_upload(0))).json()["job_id"]
+
+    pending = await api.get(f"{JOBS}/{job_id}/result")
+
+    assert pending.status_code == 202
+    assert pending.json()["status"] in ("queued", "running")
+
+
+async def test_failed_job_result_answers_500(api, fake_client: FakeDocumentAIClient):
+    def fail(*args):
+        raise RuntimeError("backend exploded")
+
+    fake_client._process_document_sync = fail
+    job_id = (await api.post(JOBS, files=_upload(0))).json()["job_id"]
+
+    status = await _finished(api, job_id)
+    result = await api.get(f"{JOBS}/{job_id}/result")
+
+    assert status["status"] == "failed"
+    assert status["error"]["code"] == "PROCESSING_ERROR"
+    assert result.status_code == 500
+    assert result.json()["detail"]["error"]["details"]["error_message"] == "backend exploded"
+
+
+async def test_unknown_job_answers_404(api):
+    for path in ("/unknown", "/unknown/result"):
+        response = await api.get(f"{JOBS}{path}")
+        assert response.status_code == 404
+        assert response.json()["detail"]["error"]["code"] == "JOB_NOT_FOUND"
+
+
+@pytest.fixture
+def _small_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "job_workers", 0)
+    monkeypatch.setattr(settings, "job_queue_max_depth", 1)
+
+
+@pytest.mark.usefixtures("_small_queue")
+async def test_full_queue_answers_503(api):
+    accepted = await api.post(JOBS, files=_upload(0))
+    refused = await api.post(JOBS, files=_upload(1))
+
+    assert accepted.status_code == 202
+    assert refused.status_code == 503
+    error = refused.json()["detail"]["error"]
+    assert (error["code"], error["max_depth"]) == ("QUEUE_FULL", 1)
@@ -0,0 +1,42 @@
+"""
+Collectors export admission buckets and hedging counters in the Prometheus format.
+"""
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from src.services.admission import AdmissionController
+from src.services.hedging import Hedger
+from src.services.metrics import AdmissionCollector, HedgeCollector
+
+
+def _exposition(collector) -> str:
+    registry = CollectorRegistry()
+    registry.register(collector)
+    return generate_latest(registry).decode()
+
+
+def test_admission_buckets_are_exported():
+    admission = AdmissionController(requests_per_minute=60, burst=1)
+    admission.try_acquire("processor:v1")
+    admission.try_acquire("processor:v1")
+
+    metrics = _exposition(AdmissionCollector([admission]))
+
+    assert 'kyc_admission_rate_per_second{bucket="processor:v1"} 1.0' in metrics
+    assert 'kyc_admission_requests_total{bucket="processor:v1",outcome="admitted"} 1.0' in metrics
+    assert 'kyc_admission_requests_total{bucket="processor:v1",outcome="rejected"} 1.0' in metrics
+    assert 'kyc_admission_queue_depth{bucket="processor:v1"} 0.0' in metrics
+
+
+def test_hedge_counters_and_rates_are_exported():
+    hedger = Hedger(min_samples=1, min_delay_seconds=0.25)
+    hedger.stats.calls, hedger.stats.hedges, hedger.stats.hedge_wins = 20, 2, 1
+
+    assert "kyc_hedge_delay_seconds NaN" in _exposition(HedgeCollector(hedger))
+
+    hedger.latencies.record(0.1)
+    metrics = _exposition(HedgeCollector(hedger))
+    assert "kyc_hedge_calls_total 20.0" in metrics
+    assert "kyc_hedge_rate 0.1" in metrics
+    assert "kyc_hedge_win_rate 0.5" in metrics
+    assert "kyc_hedge_delay_seconds 0.25" in metrics
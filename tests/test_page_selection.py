@@ -0,0 +1,82 @@
+"""
+Local selection of the KYC form pages, on synthetic PDFs with a text layer.
+"""
+
+import io
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+)
+
+from src.services.page_selection import select_kyc_pages
+
+FORM_PAGE_ONE = "CIF No. Date of Birth City of Birth Marital Status Passport No. Emirates ID Mobile"
+FORM_PAGE_TWO = "Employer Department Designation Gross Monthly Income Nature of Business"
+SALARY_CERTIFICATE = "Salary certificate. Employer: ACME. Designation: Clerk. Department: Sales"
+COVER_LETTER = "Dear Sir or Madam, please find the onboarding documents enclosed"
+
+
+def _pdf(*page_texts: str) -> bytes:
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    for text in page_texts:
+        page = writer.add_blank_page(width=595, height=842)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})
+        })
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 10 Tf 20 800 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_both_form_pages_are_selected():
+    selection = select_kyc_pages(_pdf(COVER_LETTER, FORM_PAGE_ONE, FORM_PAGE_TWO, COVER_LETTER))
+
+    assert selection.pages == [1, 2]
+    assert (selection.total_pages, selection.pages_submitted) == (4, 2)
+
+
+def test_one_form_page_found_sends_whole_document():
+    selection = select_kyc_pages(_pdf(COVER_LETTER, FORM_PAGE_ONE, COVER_LETTER, COVER_LETTER))
+
+    assert selection.pages is None
+    assert selection.pages_submitted == 4
+    assert selection.strategy == "no-match"
+
+
+def test_salary_certificate_does_not_outrank_page_two():
+    selection = select_kyc_pages(
+        _pdf(FORM_PAGE_ONE, FORM_PAGE_TWO, SALARY_CERTIFICATE + " Gross Monthly Income", COVER_LETTER)
+    )
+
+    assert selection.pages == [0, 1]
+
+
+def test_page_two_away_from_page_one_sends_whole_document():
+    selection = select_kyc_pages(_pdf(FORM_PAGE_ONE, COVER_LETTER, FORM_PAGE_TWO))
+
+    assert selection.pages is None
+
+
+def test_labels_below_minimum_do_not_count():
+    # Two labels of each page are not enough to call it the form
+    selection = select_kyc_pages(_pdf(COVER_LETTER, "Mobile Passport", "Employer Designation"))
+
+    assert selection.pages is None
+
+
+def test_short_documents_are_sent_whole():
+    selection = select_kyc_pages(_pdf(FORM_PAGE_ONE, FORM_PAGE_TWO))
+
+    assert selection.pages is None
+    assert selection.strategy == "all"
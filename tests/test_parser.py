@@ -0,0 +1,50 @@
+"""
+The raw-protobuf parser returns exactly what the proto-plus reference parser did.
+"""
+
+import pytest
+from google.cloud.documentai_v1.types import Document
+
+from benchmarks.documents import synthetic_document
+from benchmarks.reference_parser import parse_extracted_fields_proto_plus
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import DocumentAIClient
+from src.services.fake_document_ai import apply_field_mask, build_document
+
+DOCUMENTS = {
+    "fake_server": lambda: build_document(tokens_per_page=5, image_bytes=0),
+    "fake_server_masked": lambda: apply_field_mask(
+        build_document(tokens_per_page=5, image_bytes=0), ["entities", "pages.dimension"]
+    ),
+    "unknown_types": lambda: synthetic_document(
+        200, unknown_ratio=0.2, seed=1, with_dimensions=True
+    ),
+    "many_regions": lambda: synthetic_document(
+        50, seed=2, regions_per_entity=4, with_dimensions=True
+    ),
+    "no_dimensions": lambda: synthetic_document(20, seed=3),
+    "empty": lambda: Document(),
+}
+
+
+def _client(pixel_bounding_boxes: bool) -> DocumentAIClient:
+    return DocumentAIClient(
+        config=DocumentAIConfig(
+            api_endpoint="127.0.0.1:9",
+            insecure_channel=True,
+            pixel_bounding_boxes=pixel_bounding_boxes,
+        )
+    )
+
+
+@pytest.mark.parametrize("pixel_bounding_boxes", [False, True])
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_matches_the_proto_plus_reference(name, pixel_bounding_boxes):
+    document = DOCUMENTS[name]()
+    client = _client(pixel_bounding_boxes)
+
+    expected = parse_extracted_fields_proto_plus(document, pixel_bounding_boxes)
+
+    assert client.parse_extracted_fields(document) == expected
+    # The raw protobuf message parses the same as its proto-plus wrapper
+    assert client.parse_extracted_fields(Document.pb(document)) == expected
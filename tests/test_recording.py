@@ -0,0 +1,85 @@
+"""
+Recordings keep the shape of a response and none of its text.
+"""
+
+import gzip
+
+from google.cloud.documentai_v1.types import Document
+
+from src.services.fake_document_ai import build_document
+from src.services.recording import ResponseRecorder, scrub_document
+
+# Every value below is written into a different text-bearing field
+SECRETS = {
+    "text": "Somchai Jaidee 1103700012345",
+    "entity": "Somchai",
+    "anchor": "Jaidee",
+    "normalized": "1985-04-12",
+    "property": "Bangkok10110",
+    "form_name": "Citizen ID",
+    "form_value": "1103700012345",
+    "corrected_key": "IdentityNo",
+    "corrected_value": "1103700012399",
+    "uri": "gs://kyc-uploads/somchai.pdf",
+    "revision": "reviewer-note",
+    "image": "PNGIMAGEBYTES",
+}
+
+
+def _document() -> Document:
+    document = build_document(tokens_per_page=5, image_bytes=16)
+    document.text = SECRETS["text"]
+    document.uri = SECRETS["uri"]
+    document.pages[0].image.content = SECRETS["image"].encode()
+
+    entity = document.entities[0]
+    entity.mention_text = SECRETS["entity"]
+    entity.text_anchor.content = SECRETS["anchor"]
+    entity.normalized_value.text = SECRETS["normalized"]
+    entity.normalized_value.date_value.year = 1985
+    entity.properties.append(Document.Entity(type_="address", mention_text=SECRETS["property"]))
+
+    form_field = Document.Page.FormField(
+        field_name=Document.Page.Layout(text_anchor=Document.TextAnchor(content=SECRETS["form_name"])),
+        field_value=Document.Page.Layout(
+            text_anchor=Document.TextAnchor(content=SECRETS["form_value"])
+        ),
+        corrected_key_text=SECRETS["corrected_key"],
+        corrected_value_text=SECRETS["corrected_value"],
+    )
+    document.pages[0].form_fields.append(form_field)
+    document.revisions.append(
+        Document.Revision(
+            human_review=Document.Revision.HumanReview(state_message=SECRETS["revision"])
+        )
+    )
+    return document
+
+
+def test_no_original_value_survives_scrubbing(tmp_path):
+    document = _document()
+
+    ResponseRecorder(tmp_path).save("abc", document)
+    recorded = gzip.decompress((tmp_path / "abc.pb.gz").read_bytes())
+
+    for name, value in SECRETS.items():
+        # No six-character run of any value, e.g. part of an ID number, is left
+        for start in range(len(value) - 5):
+            assert value[start : start + 6].encode() not in recorded, name
+
+
+def test_scrubbing_keeps_shape_and_types():
+    document = _document()
+
+    scrubbed = scrub_document(document)
+
+    assert scrubbed.text == "Xxxxxxx Xxxxxx 0000000000000"
+    assert [e.type_ for e in scrubbed.entities] == [e.type_ for e in document.entities]
+    assert scrubbed.entities[0].normalized_value.text == "0000-00-00"
+    assert "date_value" not in scrubbed.entities[0].normalized_value
+    assert scrubbed.pages[0].form_fields[0].corrected_value_text == "0" * 13
+    assert scrubbed.pages[0].dimension == document.pages[0].dimension
+    assert scrubbed.mime_type == document.mime_type
+    assert not scrubbed.pages[0].image.content
+    # The original is left alone
+    assert document.text == SECRETS["text"]
@@ -0,0 +1,39 @@
+"""
+PydanticJSONResponse renders models exactly as FastAPI would through the response_model.
+"""
+
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from src.api.responses import PydanticJSONResponse
+from src.models.response import ProcessResponse
+from tests.conftest import unique_pdf
+
+
+async def test_process_response_matches_the_response_model(api):
+    response = await api.post(
+        "/api/v1/documents/process",
+        files={"file": ("form.pdf", unique_pdf(0), "application/pdf")},
+    )
+
+    body = response.json()
+    model = ProcessResponse.model_validate(body)
+    assert response.headers["content-type"] == "application/json"
+    assert body == jsonable_encoder(model)
+    rendered = PydanticJSONResponse(model)
+    assert json.loads(rendered.body) == body
+    assert rendered.body == model.model_dump_json().encode()
+
+
+async def test_openapi_still_documents_the_response_model(api):
+    schema = (await api.get("/openapi.json")).json()
+
+    ok = schema["paths"]["/api/v1/documents/process"]["post"]["responses"]["200"]
+    assert ok["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/ProcessResponse"
+    }
+
+
+def test_other_content_renders_as_plain_json():
+    assert PydanticJSONResponse({"status": "ok"}).body == b'{"status":"ok"}'
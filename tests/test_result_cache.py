@@ -0,0 +1,115 @@
+"""
+Result cache backends, with Redis played by fakeredis.
+"""
+
+import zlib
+
+import fakeredis
+import pytest
+
+from src.core.config import Settings
+from src.core.schema import NCB_KYC_FORM
+from src.services.result_cache import (
+    InMemoryResultCache,
+    RedisResultCache,
+    create_result_cache,
+    document_cache_key,
+    serialize_result,
+)
+
+RESULT = {page_key: {} for page_key in NCB_KYC_FORM.page_keys}
+RESULT[NCB_KYC_FORM.page_keys[0]]["full_name"] = {"value": "x", "confidence": 0.9}
+
+
+@pytest.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+async def test_redis_round_trip_with_ttl(redis):
+    cache = RedisResultCache(client=redis, ttl_seconds=120, namespace="test:ns")
+
+    await cache.set("doc:proc:v1", RESULT)
+
+    assert await cache.get("doc:proc:v1") == RESULT
+    assert 0 < await redis.ttl("test:ns:doc:proc:v1") <= 120
+    assert cache.stats.hits == 1
+
+
+async def test_redis_keys_are_namespaced(redis):
+    first = RedisResultCache(client=redis, namespace="replica:a")
+    second = RedisResultCache(client=redis, namespace="replica:b")
+
+    await first.set("key", RESULT)
+
+    assert await redis.keys("*") == [b"replica:a:key"]
+    assert await second.get("key") is None
+
+
+async def test_processor_versions_do_not_share_entries(redis):
+    cache = RedisResultCache(client=redis)
+    v1 = document_cache_key("abc", "processor", "v1")
+    v2 = document_cache_key("abc", "processor", "v2")
+
+    await cache.set(v1, RESULT)
+
+    assert v1 != v2
+    assert await cache.get(v2) is None
+    assert document_cache_key("abc", "processor") == "abc:processor:default"
+
+
+async def test_get_many_reads_in_one_pipeline(redis):
+    cache = RedisResultCache(client=redis)
+    await cache.set_many({"a": RESULT, "b": RESULT})
+
+    assert await cache.get_many(["a", "b", "c"]) == {"a": RESULT, "b": RESULT, "c": None}
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"not zlib",
+        zlib.compress(b"{truncated"),
+        serialize_result({"old_layout": []}),
+    ],
+    ids=["corrupt", "bad-json", "old-schema"],
+)
+async def test_unreadable_entry_is_a_miss_and_deleted(redis, payload):
+    cache = RedisResultCache(client=redis, namespace="ns")
+    await redis.set("ns:key", payload)
+
+    assert await cache.get("key") is None
+    assert await redis.exists("ns:key") == 0
+    assert (cache.stats.misses, cache.stats.errors) == (1, 1)
+
+
+async def test_unreachable_redis_behaves_like_empty_cache():
+    cache = RedisResultCache(redis_url="redis://127.0.0.1:9/0")
+
+    await cache.set("key", RESULT)
+
+    assert await cache.get("key") is None
+    assert cache.stats.errors == 2
+    await cache.aclose()
+
+
+def test_memory_backend_without_redis_url():
+    cache = create_result_cache(Settings(redis_url=None, enable_cache=True))
+    assert isinstance(cache, InMemoryResultCache)
+    assert isinstance(create_result_cache(Settings(redis_url="redis://cache:6379/0")), RedisResultCache)
+    assert create_result_cache(Settings(enable_cache=False)) is None
+
+
+async def test_memory_entries_expire_after_ttl():
+    now = [0.0]
+    cache = InMemoryResultCache(ttl_seconds=10, clock=lambda: now[0])
+    await cache.set("key", RESULT)
+
+    now[0] = 9.9
+    assert await cache.get("key") == RESULT
+    now[0] = 10.0
+    assert await cache.get("key") is None
+    assert cache.stats.expirations == 1
@@ -0,0 +1,92 @@
+"""
+Transient Document AI errors are retried within one deadline; bad requests are not.
+"""
+
+import pytest
+from google.api_core import exceptions as core_exceptions
+from google.cloud.documentai_v1.types import Document
+
+from src.core.config import DocumentAIConfig
+from src.services.document_ai_client import CallReport
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+DEADLINE_SECONDS = 5
+
+
+class FlakyClient(FakeDocumentAIClient):
+    """Fails with the queued errors first, and records each attempt's RPC timeout."""
+
+    def __init__(self, errors: list[Exception]):
+        super().__init__(
+            latency=0.01,
+            config=DocumentAIConfig(
+                api_endpoint="127.0.0.1:9",
+                insecure_channel=True,
+                quota_requests_per_minute=0,
+                timeout_seconds=DEADLINE_SECONDS,
+                retry_initial_backoff_seconds=0.05,
+                retry_max_backoff_seconds=0.05,
+            ),
+        )
+        self.errors = list(errors)
+        self.timeouts: list[float] = []
+
+    def _process_document_sync(self, *args) -> Document:
+        # The executor passes the RPC timeout as the last argument
+        self.timeouts.append(args[-1])
+        document = super()._process_document_sync()
+        if self.errors:
+            raise self.errors.pop(0)
+        return document
+
+
+@pytest.fixture
+def fake_client() -> FlakyClient:
+    return FlakyClient(
+        [core_exceptions.ServiceUnavailable("down"), core_exceptions.DeadlineExceeded("slow")]
+    )
+
+
+async def test_retryable_errors_are_retried_and_reported(api, fake_client: FlakyClient):
+    response = await api.post(
+        PROCESS, files={"file": ("form.pdf", unique_pdf(0), "application/pdf")}
+    )
+
+    assert response.status_code == 200
+    assert fake_client.calls == 3
+    summary = response.json()["summary"]
+    assert summary["retries"] == 2
+    # Two failed attempts and two backoffs of up to 50 ms each
+    assert 0.02 <= summary["retry_seconds"] < DEADLINE_SECONDS
+
+
+async def test_each_attempt_gets_the_time_left_of_one_deadline():
+    client = FlakyClient([core_exceptions.ServiceUnavailable("down")] * 2)
+    client.initialize()
+    report = CallReport()
+    try:
+        await client.process_document(unique_pdf(0), "processor", report=report)
+    finally:
+        await client.aclose()
+
+    first, *later = client.timeouts
+    assert DEADLINE_SECONDS - 0.5 < first <= DEADLINE_SECONDS
+    # Each attempt's timeout is what the earlier attempts and backoffs left over
+    assert later[0] < first and later[1] < later[0]
+    assert report.attempts == 3
+    assert first - later[-1] == pytest.approx(report.retry_seconds, abs=0.05)
+
+
+async def test_invalid_argument_is_not_retried():
+    client = FlakyClient([core_exceptions.InvalidArgument("bad page range")])
+    client.initialize()
+    report = CallReport()
+    try:
+        with pytest.raises(core_exceptions.InvalidArgument):
+            await client.process_document(unique_pdf(0), "processor", report=report)
+    finally:
+        await client.aclose()
+
+    assert client.calls == 1
+    assert (report.attempts, report.retries) == (1, 0)
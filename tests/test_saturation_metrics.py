@@ -0,0 +1,47 @@
+"""
+/metrics shows requests in flight and calls queued for an executor thread while they wait.
+"""
+
+import asyncio
+import re
+
+import pytest
+
+from tests.conftest import FakeDocumentAIClient, unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+REQUESTS = 10
+
+
+def _gauge(metrics: str, name: str) -> float:
+    return float(re.search(rf"^{name} (\S+)$", metrics, re.MULTILINE).group(1))
+
+
+@pytest.fixture
+def fake_client() -> FakeDocumentAIClient:
+    return FakeDocumentAIClient(latency=0.5)
+
+
+async def test_gauges_follow_requests_in_flight_and_queued(api, fake_client):
+    executor_threads = fake_client.config.executor_max_workers
+    posts = [
+        asyncio.create_task(
+            api.post(PROCESS, files={"file": ("form.pdf", unique_pdf(i), "application/pdf")})
+        )
+        for i in range(REQUESTS)
+    ]
+    # Until every request has reached the executor, well before the first call returns
+    async with asyncio.timeout(0.4):
+        while True:
+            busy = (await api.get("/metrics")).text
+            if _gauge(busy, "kyc_executor_queue_depth") == REQUESTS - executor_threads:
+                break
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*posts)
+    idle = (await api.get("/metrics")).text
+
+    # The scrape itself is in flight too
+    assert _gauge(busy, "kyc_http_requests_in_flight") == REQUESTS + 1
+    assert _gauge(busy, "kyc_executor_queue_depth") == REQUESTS - executor_threads
+    assert _gauge(idle, "kyc_http_requests_in_flight") == 1
+    assert _gauge(idle, "kyc_executor_queue_depth") == 0
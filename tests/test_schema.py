@@ -0,0 +1,48 @@
+"""
+The form schema registry is the one source for /info, DOCUMENT_TYPES and the page models.
+"""
+
+import pytest
+
+from src.core.config import DocumentAIConfig
+from src.core.schema import FORM_SCHEMAS, NCB_KYC_FORM, FieldSlot, FieldSpec, FormSchema, PageSpec
+from src.models.response import PAGE_MODELS, ExtractedInformation
+
+
+async def test_info_lists_the_schema_fields(api):
+    info = (await api.get("/api/v1/documents/info")).json()
+
+    assert info["supported_fields"] == NCB_KYC_FORM.supported_fields()
+    assert info["processor_info"]["custom_extractor"]["name"] == NCB_KYC_FORM.extractor
+    assert info["supported_fields"]["page_two"] == [
+        "Employer",
+        "Department",
+        "Designation",
+        "GrossMonthlyIncome",
+        "NatureOfBusiness",
+        "PercentageOfOwnership",
+    ]
+
+
+def test_document_types_are_generated_from_the_registry():
+    document_types = DocumentAIConfig.DOCUMENT_TYPES
+
+    assert list(document_types) == list(FORM_SCHEMAS)
+    entry = document_types[NCB_KYC_FORM.name]
+    assert entry["supported_entities"] == list(NCB_KYC_FORM.field_names)
+    assert (entry["extractor"], entry["alias"]) == (NCB_KYC_FORM.extractor, NCB_KYC_FORM.alias)
+
+
+def test_page_models_and_lookup_follow_the_schema():
+    for page in NCB_KYC_FORM.pages:
+        assert list(PAGE_MODELS[page.key].model_fields) == list(page.field_names)
+        for name in page.field_names:
+            assert NCB_KYC_FORM.lookup[name] == FieldSlot(page=page.index, page_key=page.key)
+    assert list(ExtractedInformation.model_fields) == list(NCB_KYC_FORM.page_keys)
+
+
+def test_a_field_on_two_pages_is_rejected():
+    page = PageSpec("page_one", 0, "PageOne", "page 1", (FieldSpec("Date", "Date field"),))
+
+    with pytest.raises(ValueError, match="Date defined twice"):
+        FormSchema("form", "Form", "extractor", "form", (page, page))
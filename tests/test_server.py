@@ -0,0 +1,58 @@
+"""
+Production server configuration: one worker per CPU, and no job queue across workers.
+"""
+
+import os
+
+import httpx
+import pytest
+
+from src.api import server
+from src.api.main import create_app
+from src.core.config import Settings, settings
+from tests.conftest import FakeDocumentAIClient
+
+
+class _NoSupervisor:
+    def run(self) -> None:
+        pass
+
+
+def test_defaults_to_one_worker_per_cpu(monkeypatch):
+    monkeypatch.setattr(server, "cpu_count", lambda: 6)
+
+    assert server.server_config(Settings()).workers == 6
+    assert server.server_config(Settings(workers=3)).workers == 3
+    assert server.server_config(Settings(workers=3), workers=2).workers == 2
+
+
+def test_refuses_several_workers_with_the_job_queue_enabled():
+    with pytest.raises(ValueError, match="WORKERS=1"):
+        server.server_config(Settings(workers=2, job_queue_enabled=True))
+
+    assert server.server_config(Settings(workers=1, job_queue_enabled=True)).workers == 1
+
+
+def test_serve_turns_the_job_queue_off_for_several_workers(monkeypatch):
+    monkeypatch.delenv("JOB_QUEUE_ENABLED", raising=False)
+    monkeypatch.delenv("QUOTA_WORKER_PROCESSES", raising=False)
+    monkeypatch.setattr(server, "Multiprocess", lambda config, sockets: _NoSupervisor())
+    config = server.server_config(Settings(workers=2))
+    monkeypatch.setattr(config, "bind_socket", lambda: None)
+
+    server.serve(config)
+
+    assert os.environ["JOB_QUEUE_ENABLED"] == "false"
+    assert os.environ["QUOTA_WORKER_PROCESSES"] == "2"
+
+
+async def test_jobs_answer_503_when_the_queue_is_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "job_queue_enabled", False)
+    app = create_app(FakeDocumentAIClient())
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http:
+        response = await http.get("/api/v1/jobs/unknown")
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["error"]["code"] == "JOBS_DISABLED"
@@ -0,0 +1,73 @@
+"""
+Single flight: one call per key, its outcome shared, cancelled only when nobody waits.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+async def test_one_call_and_its_exception_reach_every_waiter():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fail() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+    outcomes = await asyncio.gather(
+        *(flight.do("doc", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert (flight.stats.leaders, flight.stats.coalesced) == (1, 2)
+    assert flight.in_flight() == 0
+
+
+async def test_cancelling_one_waiter_leaves_the_call_running_for_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> str:
+        await release.wait()
+        return "result"
+
+    leader = asyncio.create_task(flight.do("doc", call))
+    follower = asyncio.create_task(flight.do("doc", call))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == ("result", True)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_cancelling_every_waiter_cancels_the_shared_call():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def call() -> str:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "result"
+
+    waiters = [asyncio.create_task(flight.do("doc", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert cancelled.is_set()
+    assert flight.in_flight() == 0
@@ -0,0 +1,56 @@
+"""
+Request IDs are generated per request and kept apart from the W3C trace ID.
+"""
+
+import uuid
+
+from src.services.tracing import SpanExporter, Trace, Tracer
+from tests.conftest import unique_pdf
+
+PROCESS = "/api/v1/documents/process"
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        self.traces: list[Trace] = []
+
+    def export(self, trace: Trace) -> None:
+        self.traces.append(trace)
+
+
+async def test_traceparent_does_not_choose_the_request_id(api):
+    responses = [
+        await api.post(
+            PROCESS,
+            files={"file": ("form.pdf", unique_pdf(i), "application/pdf")},
+            headers={"traceparent": TRACEPARENT},
+        )
+        for i in range(2)
+    ]
+
+    request_ids = [response.json()["request_id"] for response in responses]
+    assert request_ids[0] != request_ids[1]
+    assert str(uuid.UUID(TRACE_ID)) not in request_ids
+    assert [response.headers["X-Request-ID"] for response in responses] == request_ids
+
+
+def test_trace_continues_the_incoming_trace_id():
+    exporter = RecordingExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.trace("GET /", trace_id=TRACE_ID, parent_span_id="00f067aa0ba902b7") as trace:
+        pass
+
+    assert trace.trace_id == TRACE_ID
+    assert trace.request_id != str(uuid.UUID(TRACE_ID))
+    assert trace.root.attributes["request.id"] == trace.request_id
+    assert exporter.traces == [trace]
+
+
+def test_job_trace_uses_the_given_request_id():
+    trace = Tracer().start_trace("job", request_id="job-1")
+
+    assert trace.request_id == "job-1"
+    assert trace.trace_id != "job-1"
@@ -0,0 +1,68 @@
+"""
+Upload size limits: per file while it is read, per request body while it streams in.
+"""
+
+import json
+
+import pytest
+
+from src.api.middleware import RequestSizeLimitMiddleware
+from src.core.config import settings
+from tests.conftest import PDF_BYTES, FakeDocumentAIClient
+
+PROCESS = "/api/v1/documents/process"
+MB = 1024 * 1024
+
+
+def _pdf(size: int) -> dict:
+    return {"file": ("form.pdf", PDF_BYTES + b"x" * size, "application/pdf")}
+
+
+async def test_file_over_the_limit_is_refused(api, fake_client: FakeDocumentAIClient, monkeypatch):
+    monkeypatch.setattr(settings, "max_file_size_mb", 1)
+
+    response = await api.post(PROCESS, files=_pdf(2 * MB))
+
+    assert response.status_code == 413
+    error = response.json()["detail"]["error"]
+    assert (error["code"], error["max_size_mb"]) == ("FILE_TOO_LARGE", 1)
+    assert fake_client.calls == 0
+
+
+@pytest.fixture
+def _small_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "max_request_size_mb", 1)
+
+
+@pytest.mark.usefixtures("_small_requests")
+async def test_declared_body_over_the_limit_is_refused(api, fake_client: FakeDocumentAIClient):
+    response = await api.post(PROCESS, files=_pdf(2 * MB))
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["error"]["code"] == "REQUEST_TOO_LARGE"
+    assert fake_client.calls == 0
+
+
+async def test_streamed_body_is_cut_off_at_the_limit():
+    chunks = [b"x" * 400, b"x" * 400, b"x" * 400, b""]
+    received = []
+    sent = []
+
+    async def receive():
+        body = chunks.pop(0)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        while (message := await receive())["more_body"]:
+            received.append(message["body"])
+
+    middleware = RequestSizeLimitMiddleware(app, max_body_bytes=1000)
+    await middleware({"type": "http", "headers": []}, receive, send)
+
+    # The third chunk crosses the limit and is never handed to the app
+    assert len(received) == 2
+    assert sent[0]["status"] == 413
+    assert json.loads(sent[1]["body"])["detail"]["error"]["max_size_bytes"] == 1000